@@ -0,0 +1,237 @@
+"""Throughput, latency and memory of the solvers over the graded corpora,
+and start-up time of short-lived solving processes
+
+Usage (from project's root):
+    python -m benchmarks.benchmark [--solvers ...] [--corpora ...]
+        [--limit N] [--save baseline.json] [--compare baseline.json]
+        [--skip-startup]
+"""
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+import numpy as np
+from argparse import ArgumentParser
+from datetime import datetime, timezone
+from typing import Callable, Dict, List
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.choices import StaticSudokuChoices, BitmaskSudokuChoices
+from sudoku.direct_solver import GroupBasedDirectSolver, IncrementalDirectSolver
+from sudoku.vectorized_solver import VectorizedDirectSolver
+from sudoku.search_solver import SearchSolver
+from sudoku.rules import RuleBasedDirectSolver
+from sudoku.dlx_solver import DancingLinksSolver
+from sudoku.batch_solver import solve_batch, BoardStatus
+from sudoku.line_io import read_grids
+
+from benchmarks.make_corpora import CORPORA_DIRECTORY, GRADES
+
+
+MEMORY_SAMPLE = 10  # Number of sudokus solved under tracemalloc
+STARTUP_REPEATS = 5  # Number of interpreters started per statement
+
+
+def _direct(choices_class, solver_class) -> Callable[[np.ndarray], bool]:
+    def solve(grid: np.ndarray) -> bool:
+        choices = choices_class(IOSudoku(grid))
+        return solver_class(choices).solve()[0]
+    return solve
+
+
+def _dlx(grid: np.ndarray) -> bool:
+    return DancingLinksSolver.from_IOSudoku(IOSudoku(grid)).solve()[0]
+
+
+def _search(direct_solver) -> Callable[[np.ndarray], bool]:
+    def solve(grid: np.ndarray) -> bool:
+        choices = BitmaskSudokuChoices(IOSudoku(grid))
+        return SearchSolver(choices, direct_solver=direct_solver).solve()[0]
+    return solve
+
+
+# Solvers called on one (9, 9) grid at a time, returning whether it is solved
+SOLVERS: Dict[str, Callable[[np.ndarray], bool]] = {
+    "direct-static": _direct(StaticSudokuChoices, GroupBasedDirectSolver),
+    "direct-bitmask": _direct(BitmaskSudokuChoices, GroupBasedDirectSolver),
+    "incremental": _direct(BitmaskSudokuChoices, IncrementalDirectSolver),
+    "vectorized": _direct(BitmaskSudokuChoices, VectorizedDirectSolver),
+    "rules": _direct(BitmaskSudokuChoices, RuleBasedDirectSolver),
+    "search": _search(VectorizedDirectSolver),
+    "search-rules": _search(RuleBasedDirectSolver),
+    "dlx": _dlx,
+}
+
+# Solvers called on a whole (N, 9, 9) corpus, returning the solved mask
+BATCH_SOLVERS: Dict[str, Callable[[np.ndarray], np.ndarray]] = {
+    "batch": lambda grids: solve_batch(grids)[0] == BoardStatus.SOLVED,
+    "batch-search": lambda grids:
+        solve_batch(grids, search=True)[0] == BoardStatus.SOLVED,
+}
+
+
+def _startup_statements() -> Dict[str, str]:
+    """Statements timed in a new interpreter, from the bare interpreter
+    to solving the first hard sudoku without numpy"""
+    with open(os.path.join(CORPORA_DIRECTORY, "hard.txt"), "r") as reader:
+        line = next(line.strip() for line in reader if line.strip())
+    return {
+        "python": "pass",
+        "import sudoku": "import sudoku",
+        "quick solve": f"import sudoku; sudoku.solve({line!r})",
+        "import numpy": "import numpy",
+        "import batch": "import sudoku.batch_solver",
+    }
+
+
+def measure_startup(statement: str, repeats: int = STARTUP_REPEATS) -> float:
+    """Best wall-clock time (in seconds) of running the statement
+    in a new interpreter, from the project's root"""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", statement], cwd=root, check=True)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def load_corpus(grade: str, limit: int = None) -> np.ndarray:
+    path = os.path.join(CORPORA_DIRECTORY, f"{grade}.txt")
+    grids = np.stack(list(read_grids(path)))
+    return grids[:limit]
+
+
+def _peak_memory(function, *args) -> int:
+    tracemalloc.start()
+    try:
+        function(*args)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_solver(name: str, grids: np.ndarray) -> Dict[str, float]:
+    """Solves the grids and returns the statistics of the run"""
+    if name in BATCH_SOLVERS:
+        solve = BATCH_SOLVERS[name]
+        start = time.perf_counter()
+        solved = int(np.sum(solve(grids)))
+        elapsed = time.perf_counter() - start
+        latencies = None
+        peak = _peak_memory(solve, grids[:MEMORY_SAMPLE])
+    else:
+        solve = SOLVERS[name]
+        latencies = np.zeros(len(grids))
+        solved = 0
+        for n, grid in enumerate(grids):
+            start = time.perf_counter()
+            solved += bool(solve(grid))
+            latencies[n] = time.perf_counter() - start
+        elapsed = latencies.sum()
+        peak = max(_peak_memory(solve, grid) for grid in grids[:MEMORY_SAMPLE])
+
+    stats = {
+        "sudokus": len(grids),
+        "solved": solved,
+        "seconds": elapsed,
+        "sudokus_per_second": len(grids) / elapsed if elapsed else float("inf"),
+        "peak_memory_bytes": peak,
+    }
+    if latencies is not None:
+        for percentile in (50, 90, 99):
+            stats[f"p{percentile}_ms"] = 1000 * np.percentile(latencies, percentile)
+    return stats
+
+
+def run_benchmarks(solvers: List[str], grades: List[str], limit: int = None,
+                   startup: bool = True) -> dict:
+    results = dict()
+    for grade in grades:
+        grids = load_corpus(grade, limit)
+        for name in solvers:
+            results.setdefault(name, dict())[grade] = run_solver(name, grids)
+    startup_results = dict()
+    if startup:
+        for name, statement in _startup_statements().items():
+            startup_results[name] = {"seconds": measure_startup(statement)}
+    return {
+        "meta": {
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "machine": platform.machine(),
+        },
+        "results": results,
+        "startup": startup_results,
+    }
+
+
+def format_report(report: dict, baseline: dict = None) -> str:
+    lines = [
+        f"{'solver':<16}{'corpus':<9}{'solved':>10}{'sudokus/s':>12}"
+        f"{'p50 ms':>9}{'p90 ms':>9}{'p99 ms':>9}{'peak KiB':>10}"
+        + ("  vs baseline" if baseline else "")
+    ]
+    for name, by_grade in report["results"].items():
+        for grade, stats in by_grade.items():
+            percentiles = "".join(
+                f"{stats[key]:>9.2f}" if key in stats else f"{'-':>9}"
+                for key in ("p50_ms", "p90_ms", "p99_ms"))
+            line = (
+                f"{name:<16}{grade:<9}"
+                f"{stats['solved']:>5}/{stats['sudokus']:<4}"
+                f"{stats['sudokus_per_second']:>12.1f}{percentiles}"
+                f"{stats['peak_memory_bytes'] / 1024:>10.1f}"
+            )
+            reference = (baseline or dict()).get("results", dict()) \
+                .get(name, dict()).get(grade)
+            if reference:
+                ratio = stats["sudokus_per_second"] / reference["sudokus_per_second"]
+                line += f"  x{ratio:.2f}"
+            lines.append(line)
+
+    if report.get("startup"):
+        lines.append("")
+        lines.append(f"{'start-up':<25}{'ms':>10}"
+                     + ("  vs baseline" if baseline else ""))
+        for name, stats in report["startup"].items():
+            line = f"{name:<25}{1000 * stats['seconds']:>10.1f}"
+            reference = (baseline or dict()).get("startup", dict()).get(name)
+            if reference:
+                line += f"  x{reference['seconds'] / stats['seconds']:.2f}"
+            lines.append(line)
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    all_solvers = list(SOLVERS) + list(BATCH_SOLVERS)
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--solvers", nargs="+", default=all_solvers,
+                        choices=all_solvers)
+    parser.add_argument("--corpora", nargs="+", default=list(GRADES),
+                        choices=GRADES)
+    parser.add_argument("--limit", type=int, default=None,
+                        help="number of sudokus per corpus")
+    parser.add_argument("--save", help="writes the results as a JSON baseline")
+    parser.add_argument("--compare", help="JSON baseline to compare with")
+    parser.add_argument("--skip-startup", action="store_true",
+                        help="does not measure the start-up times")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, "r") as reader:
+            baseline = json.load(reader)
+
+    report = run_benchmarks(args.solvers, args.corpora, args.limit,
+                            startup=not args.skip_startup)
+    print(format_report(report, baseline))
+
+    if args.save:
+        with open(args.save, "w") as writer:
+            json.dump(report, writer, indent=2)
+        print(f"Results saved to {args.save}", file=sys.stderr)
@@ -0,0 +1,54 @@
+"""Generates the graded corpora of the benchmarks
+
+Each sudoku is generated by ``sudoku.generator``, from a random full grid
+whose clues are removed in a random order:
+    - trivial: TRIVIAL_HOLES clues removed, solvable by singles,
+    - easy: down to EASY_CLUES clues, solvable by singles,
+    - medium: as few clues as possible, the additional rules of
+      ``sudoku.rules`` are needed (Difficulty.MEDIUM),
+    - hard: as few clues as possible, search is needed (Difficulty.HARD).
+
+All of them have a unique solution.
+
+Usage (from project's root): python -m benchmarks.make_corpora [--size 50]
+"""
+import os
+import numpy as np
+from argparse import ArgumentParser
+
+from sudoku.generator import Difficulty, generate_sudoku, random_full_grid, \
+    remove_clues
+from sudoku.line_io import write_grids
+
+
+CORPORA_DIRECTORY = os.path.join(os.path.dirname(__file__), "corpora")
+GRADES = ("trivial", "easy", "medium", "hard")
+TRIVIAL_HOLES = 6
+EASY_CLUES = 40
+MIN_CLUES = {"trivial": 81 - TRIVIAL_HOLES, "easy": EASY_CLUES}
+DIFFICULTIES = {"medium": Difficulty.MEDIUM, "hard": Difficulty.HARD}
+
+
+def make_sudoku(grade: str, rng: np.random.Generator) -> np.ndarray:
+    if grade in DIFFICULTIES:
+        return generate_sudoku(rng, DIFFICULTIES[grade])[0]
+    return remove_clues(random_full_grid(rng), rng, Difficulty.EASY,
+                        MIN_CLUES[grade])
+
+
+def make_corpora(size: int, seed: int = 0):
+    rng = np.random.default_rng(seed)
+    for grade in GRADES:
+        grids = [make_sudoku(grade, rng) for _ in range(size)]
+        path = os.path.join(CORPORA_DIRECTORY, f"{grade}.txt")
+        with open(path, "w") as writer:
+            write_grids(writer, grids)
+        print(f"{size} {grade} sudokus written to {path}")
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    make_corpora(args.size, args.seed)
@@ -0,0 +1,61 @@
+import sys
+import time
+from argparse import Namespace
+from collections import Counter
+
+import numpy as np
+
+from sudoku.bulk import solve_bulk
+from sudoku.jobs import solve_job, read_results, export_results, results_path
+from sudoku.batch_solver import BoardStatus
+from sudoku.parsers import get_bulk_arguments
+from sudoku.line_io import open_or_std
+
+
+def bulk_solve(args: Namespace):
+    if args.job:
+        return bulk_solve_job(args)
+
+    counter = Counter()
+    start = time.perf_counter()
+    with open_or_std(args.puzzle_file, "r") as reader, \
+            open_or_std(args.output, "w") as writer:
+        for index, status, solution in solve_bulk(
+                reader, workers=args.workers, chunk_size=args.chunk_size,
+                ordered=not args.unordered, max_nodes=args.max_nodes):
+            if args.unordered:
+                writer.write(f"{index}\t")
+            writer.write(solution + "\n")
+            counter[BoardStatus(status).name] += 1
+    elapsed = time.perf_counter() - start
+    report(counter, sum(counter.values()), elapsed)
+
+
+def bulk_solve_job(args: Namespace):
+    results = args.results or results_path(args.puzzle_file)
+    start = time.perf_counter()
+    progress = solve_job(
+        args.puzzle_file, results, workers=args.workers,
+        chunk_size=args.chunk_size, max_nodes=args.max_nodes)
+    elapsed = time.perf_counter() - start
+
+    _, status, _ = read_results(results)
+    counter = Counter({
+        BoardStatus(value).name: int(nb)
+        for value, nb in enumerate(np.bincount(status)) if nb})
+    if progress.resumed:
+        print(f"Resumed after {progress.resumed} sudokus", file=sys.stderr)
+    report(counter, progress.solved, elapsed)
+    with open_or_std(args.output, "w") as writer:
+        export_results(results, writer)
+
+
+def report(counter: Counter, solved: int, elapsed: float):
+    details = ", ".join(f"{name.lower()}: {nb}" for name, nb in sorted(counter.items()))
+    print(f"{solved} sudokus in {elapsed:.2f}s "
+          f"({solved / max(elapsed, 1e-9):.1f} sudokus/s) - {details}",
+          file=sys.stderr)
+
+
+if __name__ == "__main__":
+    bulk_solve(get_bulk_arguments())
@@ -0,0 +1,8 @@
+from sudoku.binary_store import convert_to_store
+from sudoku.parsers import get_conversion_arguments
+
+
+if __name__ == "__main__":
+    args = get_conversion_arguments()
+    count = convert_to_store(args.source, args.store, packed=args.packed)
+    print(f"{count} sudokus written to {args.store}")
@@ -0,0 +1,28 @@
+import sys
+import time
+from collections import Counter
+
+from sudoku.generator import Difficulty, generate_sudokus
+from sudoku.line_io import format_grid, open_or_std
+from sudoku.parsers import get_generation_arguments
+
+
+if __name__ == "__main__":
+    args = get_generation_arguments()
+    difficulty = None if args.difficulty is None \
+        else Difficulty[args.difficulty.upper()]
+
+    counter = Counter()
+    start = time.perf_counter()
+    with open_or_std(args.output, "w") as writer:
+        for grid, grade in generate_sudokus(
+                args.count, seed=args.seed, difficulty=difficulty,
+                workers=args.workers, chunk_size=args.chunk_size):
+            writer.write(format_grid(grid) + "\n")
+            counter[grade.difficulty.name.lower()] += 1
+    elapsed = time.perf_counter() - start
+
+    details = ", ".join(f"{name}: {nb}" for name, nb in sorted(counter.items()))
+    print(f"{args.count} sudokus in {elapsed:.2f}s "
+          f"({args.count / max(elapsed, 1e-9):.1f} sudokus/s) - {details}",
+          file=sys.stderr)
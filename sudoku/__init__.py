@@ -0,0 +1,56 @@
+"""Makes computers solve sudokus
+
+The names below are imported from their submodule on first use (PEP 562),
+so that ``import sudoku`` costs nothing, and that numpy is only imported
+by the features which need it. ``sudoku.solve`` (see ``sudoku.quick``)
+solves a single sudoku without importing numpy.
+"""
+import importlib
+
+
+_EXPORTS = {
+    "IOSudoku": "io_sudoku",
+    "SudokuChoices": "choices",
+    "StaticSudokuChoices": "choices",
+    "BitmaskSudokuChoices": "choices",
+    "DirectOutcome": "choices",
+    "GroupBasedDirectSolver": "direct_solver",
+    "IncrementalDirectSolver": "direct_solver",
+    "VectorizedDirectSolver": "vectorized_solver",
+    "RuleBasedDirectSolver": "rules",
+    "SearchSolver": "search_solver",
+    "count_solutions": "search_solver",
+    "has_unique_solution": "search_solver",
+    "DancingLinksSolver": "dlx_solver",
+    "BoardStatus": "batch_solver",
+    "solve_batch": "batch_solver",
+    "solve_bulk": "bulk",
+    "solve_job": "jobs",
+    "read_grids": "line_io",
+    "write_grids": "line_io",
+    "PuzzleStore": "binary_store",
+    "SolverStats": "stats",
+    "canonical_form": "canonical",
+    "CachedSolver": "solution_cache",
+    "generate_sudoku": "generator",
+    "grade": "generator",
+    "solve": "quick",
+    "AsyncSolver": "service",
+    "check_givens": "validation",
+    "check_solutions": "validation",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+    value = getattr(module, name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_EXPORTS))
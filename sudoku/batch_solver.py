@@ -0,0 +1,75 @@
+"""Solving many sudokus at once on a stacked candidate tensor"""
+import numpy as np
+from enum import IntEnum
+from typing import Tuple, Optional
+
+from .io_sudoku import IOSudoku
+from .choices import BitmaskSudokuChoices
+from .search_solver import SearchSolver
+from .exceptions import MaxIterReachedException
+from .vectorized_solver import candidates_from_grid, grid_from_candidates, \
+    propagation_step, VectorizedDirectSolver
+
+
+class BoardStatus(IntEnum):
+
+    INCONSISTENT = 0  # A contradiction was met, the board has no solution
+    SOLVED = 1  # All the cells are final
+    STALLED = 2  # The direct rules (and search, if enabled) were insufficient
+
+
+def solve_batch(grids: np.ndarray, search: bool = False,
+                max_nodes: Optional[int] = None) \
+        -> Tuple[np.ndarray, np.ndarray]:
+    """Propagates all the boards together in a (N, 81, 9) candidate tensor.
+
+    Boards leave the active set as soon as they are inconsistent or
+    have reached their fixed point, so that the remaining iterations
+    only work on the boards which still change.
+
+    :@param grids: (N, 9, 9) array, empty cells are IOSudoku.EMPTY_CELL
+    :@param search: Finishes the stalled boards with a SearchSolver
+    :@param max_nodes: Search budget per board, boards exceeding it
+        are left STALLED
+
+    Returns:
+        - (N,) array of BoardStatus values,
+        - (N, 9, 9) array of (partial) solutions, where the cells which
+          are not final are left empty.
+    """
+    grids = np.asarray(grids)
+    if grids.ndim != 3 or grids.shape[1:] != (9, 9):
+        raise ValueError(f"Expected (N, 9, 9) grids, got {grids.shape}")
+
+    candidates = candidates_from_grid(grids)
+    status = np.full(len(grids), BoardStatus.STALLED, dtype=np.int8)
+
+    active = np.arange(len(grids))
+    while active.size:
+        new, inconsistent, changed = propagation_step(candidates[active])
+        candidates[active] = new
+        status[active[inconsistent]] = BoardStatus.INCONSISTENT
+        active = active[~inconsistent & changed]
+
+    consistent = status != BoardStatus.INCONSISTENT
+    all_final = (candidates.sum(axis=-1) == 1).all(axis=-1)
+    status[consistent & all_final] = BoardStatus.SOLVED
+
+    solutions = grid_from_candidates(candidates)
+
+    if search:
+        for n in np.flatnonzero(status == BoardStatus.STALLED):
+            choices = BitmaskSudokuChoices(IOSudoku(solutions[n]))
+            try:
+                solved, _ = SearchSolver(
+                    choices, max_nodes=max_nodes,
+                    direct_solver=VectorizedDirectSolver).solve()
+            except MaxIterReachedException:
+                continue
+            if solved:
+                status[n] = BoardStatus.SOLVED
+                solutions[n] = choices.to_IOSudoku().grid
+            else:
+                status[n] = BoardStatus.INCONSISTENT
+
+    return status, solutions
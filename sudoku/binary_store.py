@@ -0,0 +1,136 @@
+"""Compact binary container of sudokus, read through np.memmap
+
+Layout (little-endian):
+    - a header of HEADER_SIZE bytes:
+        magic (4 bytes) | version (uint8) | packed (uint8) | 2 reserved bytes
+        | number of sudokus (uint64)
+    - fixed-size records, one per sudoku, row after row:
+        - 81 bytes, one cell value per byte (0 for empty cells),
+        - or 41 bytes when packed, two cell values per byte
+          (high nibble first, the last low nibble is unused).
+
+Unpacked stores give zero-copy views of the file: the pages are shared by
+all the processes reading the same store.
+"""
+import os
+import struct
+import numpy as np
+from typing import Iterable, List, Union
+
+from .io_sudoku import IOSudoku
+from .line_io import iter_grid_chunks
+
+
+MAGIC = b'SDKU'
+VERSION = 1
+HEADER_FORMAT = '<4sBB2xQ'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+RECORD_SIZE = 81
+PACKED_RECORD_SIZE = 41
+
+
+def pack_grids(grids: np.ndarray) -> np.ndarray:
+    """(N, 9, 9) grids into (N, PACKED_RECORD_SIZE) records,
+    two cell values per byte"""
+    cells = np.zeros((len(grids), 2 * PACKED_RECORD_SIZE), dtype=np.uint8)
+    cells[:, :81] = grids.reshape((-1, 81))
+    return (cells[:, 0::2] << 4) | cells[:, 1::2]
+
+
+def unpack_grids(records: np.ndarray) -> np.ndarray:
+    """The (N, 9, 9) grids of packed records, see ``pack_grids``"""
+    cells = np.stack([records >> 4, records & 0x0F], axis=-1)
+    return cells.reshape((-1, 2 * PACKED_RECORD_SIZE))[:, :81].reshape((-1, 9, 9))
+
+
+def write_store(path: str, grids: Iterable[np.ndarray], packed: bool = False) -> int:
+    """Writes the sudokus in a new store, and returns their number.
+
+    grids may yield (9, 9) grids or (n, 9, 9) stacks of grids,
+    it is consumed lazily.
+    """
+    count = 0
+    with open(path, "wb") as writer:
+        writer.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, packed, 0))
+        for grid in grids:
+            grid = np.asarray(grid, dtype=np.uint8).reshape((-1, 9, 9))
+            records = pack_grids(grid) if packed else grid.reshape((-1, 81))
+            writer.write(records.tobytes())
+            count += len(grid)
+        writer.seek(0)
+        writer.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION, packed, count))
+    return count
+
+
+def convert_to_store(source: str, path: str, packed: bool = False) -> int:
+    """Converts text sudokus into a new store, and returns their number.
+
+    ``source`` is either a ``.sudoku`` file (see IOSudoku), or a file in
+    the one-line-per-sudoku format (see ``line_io``).
+    """
+    if source.endswith(".sudoku"):
+        sudoku = IOSudoku()
+        with open(source, "r") as reader:
+            sudoku.load_from_txt(reader.read())
+        return write_store(path, [sudoku.grid], packed)
+
+    with open(source, "rb") as reader:
+        return write_store(path, iter_grid_chunks(reader), packed)
+
+
+class PuzzleStore:
+
+    def __init__(self, path: str):
+        """Read-only access to a store by index or slice
+
+        Sudokus are returned as IOSudoku whose grid is a read-only
+        view on the memory-mapped file (a decoded copy for packed stores).
+        """
+        with open(path, "rb") as reader:
+            header = reader.read(HEADER_SIZE)
+        if len(header) != HEADER_SIZE:
+            raise ValueError(f"{path} is too short to be a sudoku store")
+        magic, version, packed, count = struct.unpack(HEADER_FORMAT, header)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a sudoku store (version {VERSION})")
+
+        self.path = path
+        self.packed = bool(packed)
+        record_size = PACKED_RECORD_SIZE if self.packed else RECORD_SIZE
+        expected = HEADER_SIZE + count * record_size
+        if os.path.getsize(path) != expected:
+            raise ValueError(f"{path} should be {expected} bytes long")
+
+        if count == 0:
+            self._records = np.zeros((0, record_size), dtype=np.uint8)
+        else:
+            self._records = np.memmap(
+                path, dtype=np.uint8, mode="r", offset=HEADER_SIZE,
+                shape=(count, record_size))
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def grids(self, start: int = 0, stop: int = None) -> np.ndarray:
+        """Returns the (n, 9, 9) grids of the sudokus start to stop,
+        as a view on the file for unpacked stores"""
+        records = self._records[start:stop]
+        if self.packed:
+            return unpack_grids(records)
+        return records.reshape((-1, 9, 9))
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[IOSudoku, List[IOSudoku]]:
+        if isinstance(key, slice):
+            return [IOSudoku(grid) for grid in self._grids_of(key)]
+        if key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError(f"Sudoku {key} out of range")
+        return IOSudoku(self.grids(key, key + 1)[0])
+
+    def _grids_of(self, key: slice) -> np.ndarray:
+        start, stop, step = key.indices(len(self))
+        if step == 1:
+            return self.grids(start, stop)
+        records = self._records[start:stop:step]
+        return unpack_grids(records) if self.packed else records.reshape((-1, 9, 9))
@@ -0,0 +1,119 @@
+"""Solving large collections of sudokus with a pool of processes"""
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from itertools import islice
+from typing import Iterable, Iterator, List, Tuple, Optional, TypeVar
+
+import numpy as np
+
+from .line_io import parse_line, format_grid, is_content
+from .batch_solver import solve_batch, BoardStatus
+
+
+def solve_chunk(lines: List[str], max_nodes: Optional[int] = None) \
+        -> List[Tuple[int, str]]:
+    """Solves one-line sudokus together, see ``solve_batch``.
+
+    Returns a (status, solution line) pair per sudoku, lines which
+    cannot be read are reported INCONSISTENT with an empty solution.
+    """
+    grids, readable = list(), list()
+    for line in lines:
+        try:
+            grids.append(parse_line(line))
+            readable.append(True)
+        except ValueError:
+            readable.append(False)
+
+    solved = iter(())
+    if grids:
+        status, solutions = solve_batch(
+            np.stack(grids), search=True, max_nodes=max_nodes)
+        solved = zip(status, solutions)
+
+    results = list()
+    for is_readable in readable:
+        if is_readable:
+            board_status, solution = next(solved)
+            results.append((int(board_status), format_grid(solution)))
+        else:
+            results.append((int(BoardStatus.INCONSISTENT), ""))
+    return results
+
+T = TypeVar("T")
+
+
+def _chunks(items: Iterable[T], chunk_size: int) -> Iterator[List[T]]:
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def solve_bulk(lines: Iterable[str], workers: int = 1, chunk_size: int = 256,
+               ordered: bool = True, max_nodes: Optional[int] = None) \
+        -> Iterator[Tuple[int, int, str]]:
+    """Solves a stream of one-line sudokus, chunk by chunk.
+
+    Blank lines and comment lines are skipped, as in ``line_io``.
+    The lines are read lazily and at most a few chunks per worker are
+    in flight at once, so that the memory stays bounded whatever the
+    size of the collection.
+
+    :@param workers: Number of processes, 0 solves in the current process
+    :@param ordered: Yields the results in the order of the input,
+        otherwise as soon as they are available
+    :@param max_nodes: Search budget per sudoku
+
+    Yields (index of the line in the input, from 0, counting the blank
+    and comment lines, status, solution line) triplets.
+    """
+    # Lines are numbered before skipping the blank and comment lines
+    numbered = ((index, line) for index, line in enumerate(lines)
+                if is_content(line))
+    chunks = _chunks(numbered, chunk_size)
+
+    if workers == 0:
+        for chunk in chunks:
+            indices, chunk_lines = zip(*chunk)
+            yield from _number(indices, solve_chunk(list(chunk_lines), max_nodes))
+        return
+
+    max_in_flight = 4 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            indices, chunk_lines = zip(*chunk)
+            in_flight.append((indices, executor.submit(
+                solve_chunk, list(chunk_lines), max_nodes)))
+            if len(in_flight) < max_in_flight:
+                continue
+            if ordered:
+                indices, future = in_flight.popleft()
+                yield from _number(indices, future.result())
+            else:
+                yield from _number_first_completed(in_flight)
+
+        while in_flight:
+            if ordered:
+                indices, future = in_flight.popleft()
+                yield from _number(indices, future.result())
+            else:
+                yield from _number_first_completed(in_flight)
+
+
+def _number(indices: Tuple[int, ...], results: List[Tuple[int, str]]) \
+        -> Iterator[Tuple[int, int, str]]:
+    for index, (status, solution) in zip(indices, results):
+        yield index, status, solution
+
+
+def _number_first_completed(in_flight: deque) \
+        -> Iterator[Tuple[int, int, str]]:
+    done, _ = wait([future for _, future in in_flight],
+                   return_when=FIRST_COMPLETED)
+    for indices, future in [pair for pair in in_flight if pair[1] in done]:
+        in_flight.remove((indices, future))
+        yield from _number(indices, future.result())
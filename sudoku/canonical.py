@@ -0,0 +1,150 @@
+"""Canonical form of sudokus under the symmetries of the sudoku
+
+The symmetries considered are the ones preserving the solutions:
+    - the transposition,
+    - the permutations of the bands (groups of 3 rows) and of the rows
+      within each band, and the same for the stacks and the columns,
+    - the relabelings of the cell values.
+
+The canonical form is the lexicographically smallest grid (read row after
+row, empty cells first) among the transformed grids where the cell values
+are relabeled 1, 2, 3... in order of first appearance. Two sudokus which
+are the transform of each other have the same canonical form, and the
+transform gives back the solution of one from the solution of the other.
+"""
+import numpy as np
+from itertools import permutations
+from typing import NamedTuple
+
+from .io_sudoku import IOSudoku
+
+
+def _structured_permutations() -> np.ndarray:
+    """The 1296 permutations of 9 lines preserving the groups of 3 lines"""
+    triplets = list(permutations(range(3)))
+    return np.array([
+        [3 * group + line for group in groups for line in (l0, l1, l2)[group]]
+        for groups in triplets
+        for l0 in triplets for l1 in triplets for l2 in triplets
+    ], dtype=np.intp)
+
+
+COLUMN_PERMUTATIONS = _structured_permutations()
+_POWERS = 10 ** np.arange(8, -1, -1, dtype=np.int64)
+_LABEL_POWERS = 10 ** np.arange(10, dtype=np.int64)
+
+
+class Transform(NamedTuple):
+    """grid -> relabel[(grid.T if transpose else grid)[rows][:, columns]]"""
+
+    transpose: bool
+    rows: np.ndarray  # (9,) row permutation
+    columns: np.ndarray  # (9,) column permutation
+    relabel: np.ndarray  # (10,) bijection of the cell values, 0 -> 0
+
+    def apply(self, grid: np.ndarray) -> np.ndarray:
+        grid = np.asarray(grid)
+        if self.transpose:
+            grid = grid.T
+        return self.relabel[grid[self.rows][:, self.columns]]
+
+    def invert(self, grid: np.ndarray) -> np.ndarray:
+        """Inverse transform, eg from a canonical solution
+        to the solution of the original sudoku"""
+        inverse_relabel = np.zeros_like(self.relabel)
+        inverse_relabel[self.relabel] = np.arange(len(self.relabel))
+        original = np.empty_like(np.asarray(grid))
+        original[np.ix_(self.rows, self.columns)] = inverse_relabel[grid]
+        return original.T if self.transpose else original
+
+
+def _relabel_rows(values: np.ndarray, labels: np.ndarray):
+    """Relabels rows of values in place of first appearance, continuing
+    the labels (n, 10) of the previous rows. Returns the relabeled rows."""
+    n = len(values)
+    index = np.arange(n)
+    next_label = (labels > 0).sum(axis=1)
+    out = np.empty_like(values)
+    for j in range(9):
+        v = values[:, j]
+        new = (v != 0) & (labels[index, v] == 0)
+        next_label += new
+        labels[index[new], v[new]] = next_label[new]
+        out[:, j] = labels[index, v]
+    return out
+
+
+def canonical_form(grid: np.ndarray):
+    """Returns the canonical grid (uint8) and the Transform leading to it.
+
+    The output rows are chosen one after the other, keeping all the
+    (transposition, input rows, column permutation) states which give
+    the smallest prefix so far.
+    """
+    grid = np.asarray(grid, dtype=np.intp)
+    if grid.shape != (9, 9):
+        raise ValueError(f"Expected a (9, 9) grid, got {grid.shape}")
+    boards = np.stack([grid, grid.T])
+    nb_perms = len(COLUMN_PERMUTATIONS)
+
+    transposed = np.repeat([0, 1], nb_perms)
+    perms = np.tile(np.arange(nb_perms), 2)
+    rows = np.zeros((2 * nb_perms, 0), dtype=np.intp)
+    labels = np.zeros((2 * nb_perms, 10), dtype=np.intp)
+    all_rows = np.arange(9)
+    distinct_rows = all(
+        len(set(line[line != 0])) == np.count_nonzero(line)
+        for board in boards for line in board)
+
+    for position in range(9):
+        if position % 3 == 0:
+            used_bands = (rows[:, :, None] // 3 == np.arange(3)).any(axis=1)
+            allowed = ~used_bands[:, all_rows // 3]
+        else:
+            band = rows[:, -1:] // 3
+            allowed = (all_rows // 3 == band) \
+                & ~(rows[:, :, None] == all_rows).any(axis=1)
+        state, row = np.nonzero(allowed)
+
+        values = boards[transposed[state], row]
+        values = np.take_along_axis(
+            values, COLUMN_PERMUTATIONS[perms[state]], axis=1)
+        new_labels = labels[state]
+        if position == 0 and distinct_rows:
+            # No label given yet, and no value repeated within a row
+            nonzero = values != 0
+            relabeled = np.cumsum(nonzero, axis=1) * nonzero
+        else:
+            relabeled = _relabel_rows(values, new_labels)
+        keys = relabeled @ _POWERS
+        keep = np.flatnonzero(keys == keys.min())
+        if position == 0 and distinct_rows:
+            new_labels[keep[:, None], values[keep]] = relabeled[keep]
+            new_labels[:, 0] = 0
+
+        state, row = state[keep], row[keep]
+        transposed, perms = transposed[state], perms[state]
+        rows = np.hstack([rows[state], row[:, None]])
+        labels = new_labels[keep]
+
+        # The order of the rows already chosen does not matter anymore:
+        # only one of the states with the same future is kept
+        used = (1 << rows).sum(axis=1)
+        future = np.column_stack([
+            transposed, used, rows[:, -1] // 3, perms, labels @ _LABEL_POWERS])
+        _, unique = np.unique(future, axis=0, return_index=True)
+        transposed, perms = transposed[unique], perms[unique]
+        rows, labels = rows[unique], labels[unique]
+
+    relabel = labels[0].copy()
+    missing = [v for v in range(1, 10) if relabel[v] == 0]
+    unused = [label for label in range(1, 10) if label not in relabel]
+    relabel[missing] = unused
+    transform = Transform(bool(transposed[0]), rows[0].copy(),
+                          COLUMN_PERMUTATIONS[perms[0]].copy(), relabel)
+    return transform.apply(grid).astype(np.uint8), transform
+
+
+def canonical_key(grid: np.ndarray) -> bytes:
+    """81-byte key of the canonical form"""
+    return canonical_form(grid)[0].tobytes()
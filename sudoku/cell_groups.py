@@ -1,6 +1,14 @@
 """Defines box groups for direct solving"""
 
-from typing import Tuple
+from functools import lru_cache
+from typing import Tuple, Type, Dict, Sequence
+
+from . import cell_indices
+
+
+# Bound of the caches keyed by groupings (jigsaw groupings are built
+# per puzzle, an unbounded cache would grow with the puzzles solved)
+GROUPINGS_CACHE_SIZE = 64
 
 
 class Grouping:
@@ -12,18 +20,83 @@ class Grouping:
         - The children are the difference of coordinates describing a group,
         with respect to a given parent coordinate.
         - A grouping is a set of groups described as parents/children,
-        such that it describes the entire 9x9 board.
+        such that it describes the entire board (the variant groupings,
+        such as the diagonals, may only cover part of the board).
 
     The parents are described in ARRAY values.
 
     See the associated example in the RowGrouping docstring.
+
+    The groups are precomputed once per grouping class: SUB_GROUPS holds
+    the sub group of each parent (aligned with PARENTS), and UNITS the same
+    groups as flat cell indices (see ``cell_indices``).
+
+    The grouping classes describe the 9x9 board (ORDER = 3), and
+    ``of_order`` derives the same grouping for boards of other orders
+    from the ``layout`` of the class.
+
+    Irregular groups (eg jigsaw regions) are given directly as UNITS,
+    the parents are then the first cells of the groups. Each group must
+    hold order * order cells, ie each cell value exactly once.
     """
 
+    ORDER = 3
     PARENTS = None
     CHILDREN = None
+    UNITS = None
+    SUB_GROUPS = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._OF_ORDER = dict()
+        if "PARENTS" not in cls.__dict__ and cls.layout is not Grouping.layout:
+            cls.PARENTS, cls.CHILDREN, cls.UNITS = cls.layout(cls.ORDER)
+        size = cls.ORDER * cls.ORDER
+        if cls.UNITS is not None:
+            coordinates = cell_indices.board_indices(cls.ORDER).COORDINATES
+            cls.SUB_GROUPS = tuple(
+                tuple(coordinates[k] for k in unit) for unit in cls.UNITS
+            )
+            if cls.PARENTS is None:
+                cls.PARENTS = tuple(sub_group[0] for sub_group in cls.SUB_GROUPS)
+        elif cls.PARENTS is not None and cls.CHILDREN is not None:
+            cls.SUB_GROUPS = tuple(
+                tuple(cls._offset_sub_group(parent)) for parent in cls.PARENTS
+            )
+            cls.UNITS = tuple(
+                tuple(size * row + col for row, col in sub_group)
+                for sub_group in cls.SUB_GROUPS
+            )
+        if cls.SUB_GROUPS is not None:
+            cls._SUB_GROUP_OF = dict(zip(cls.PARENTS, cls.SUB_GROUPS))
+
+    @staticmethod
+    def layout(order: int):
+        """Returns the (PARENTS, CHILDREN, UNITS) of the grouping
+        on the board of the given order"""
+        raise NotImplementedError
+
+    @classmethod
+    def of_order(cls, order: int) -> Type["Grouping"]:
+        """The same grouping on the board of the given order"""
+        if order == cls.ORDER:
+            return cls
+        if cls.layout is Grouping.layout:
+            raise ValueError(f"{cls.__name__} only exists for order {cls.ORDER}")
+        if order not in cls._OF_ORDER:
+            cls._OF_ORDER[order] = type(
+                f"{cls.__name__}{order * order}", (cls,),
+                {"ORDER": order, "__doc__": cls.__doc__})
+        return cls._OF_ORDER[order]
 
     @classmethod
     def sub_group(cls, parent: Tuple[int]):
+        if cls.SUB_GROUPS is not None and parent in cls._SUB_GROUP_OF:
+            return cls._SUB_GROUP_OF[parent]
+        return cls._offset_sub_group(parent)
+
+    @classmethod
+    def _offset_sub_group(cls, parent: Tuple[int]):
         row, col = parent
         pairs = [
             (row + child_row, col + child_col)
@@ -66,8 +139,12 @@ class RowGrouping(Grouping):
         ((0, 0), (0, 1), ..., (0, 8), (0, 9))
     """
 
-    PARENTS = tuple([(row, 0) for row in range(9)])
-    CHILDREN = tuple([(0, col) for col in range(9)])
+    @staticmethod
+    def layout(order: int):
+        size = order * order
+        return tuple([(row, 0) for row in range(size)]), \
+            tuple([(0, col) for col in range(size)]), \
+            cell_indices.board_indices(order).ROW_UNITS
 
 
 class ColumnGrouping(Grouping):
@@ -76,15 +153,89 @@ class ColumnGrouping(Grouping):
     The parents are the first boxes on the top.
     """
 
-    PARENTS = tuple([(0, col) for col in range(9)])
-    CHILDREN = tuple([(row, 0) for row in range(9)])
+    @staticmethod
+    def layout(order: int):
+        size = order * order
+        return tuple([(0, col) for col in range(size)]), \
+            tuple([(row, 0) for row in range(size)]), \
+            cell_indices.board_indices(order).COLUMN_UNITS
 
 
 class BoxGrouping(Grouping):
     """
-    One group is one of the basic 3x3 boxes.
+    One group is one of the basic 3x3 boxes (order x order in general).
     The parents are the upper-left boxes.
     """
 
-    PARENTS = tuple([(i, j) for i in [0, 3, 6] for j in [0, 3, 6]])
-    CHILDREN = tuple([(i, j) for i in [0, 1, 2] for j in [0, 1, 2]])
+    @staticmethod
+    def layout(order: int):
+        origins = range(0, order * order, order)
+        return tuple([(i, j) for i in origins for j in origins]), \
+            tuple([(i, j) for i in range(order) for j in range(order)]), \
+            cell_indices.board_indices(order).BOX_UNITS
+
+
+def groupings_of_order(order: int) -> Tuple[Type[Grouping], ...]:
+    """The row, column and box groupings of the board of the given order"""
+    return tuple(grouping.of_order(order)
+                 for grouping in (RowGrouping, ColumnGrouping, BoxGrouping))
+
+
+class DiagonalGrouping(Grouping):
+    """
+    The two main diagonals (sudoku X), on top of the usual groupings.
+    The parents are the upper-left and upper-right boxes.
+    """
+
+    @staticmethod
+    def layout(order: int):
+        size = order * order
+        return None, None, (
+            tuple(size * i + i for i in range(size)),
+            tuple(size * i + size - 1 - i for i in range(size)),
+        )
+
+
+class WindokuGrouping(Grouping):
+    """
+    The extra windows of the windoku, on top of the usual groupings:
+    boxes separated from the border and from each other by one line.
+    The parents are the upper-left boxes.
+    """
+
+    @staticmethod
+    def layout(order: int):
+        origins = range(1, order * order - order + 1, order + 1)
+        return tuple([(i, j) for i in origins for j in origins]), \
+            tuple([(i, j) for i in range(order) for j in range(order)]), \
+            None
+
+
+def jigsaw_grouping(regions: Sequence[Sequence[int]]) -> Type[Grouping]:
+    """Grouping of the irregular regions of a jigsaw sudoku,
+    which replace the boxes
+
+    :@param regions: (size, size) region number of each cell
+    """
+    size = len(regions)
+    order = cell_indices.order_of_size(size)
+    units = dict()
+    for row in range(size):
+        for col in range(size):
+            units.setdefault(regions[row][col], list()).append(size * row + col)
+    if len(units) != size or any(len(unit) != size for unit in units.values()):
+        raise ValueError(f"Expected {size} regions of {size} cells")
+    return _jigsaw_of_units(
+        order, tuple(sorted(tuple(unit) for unit in units.values())))
+
+
+@lru_cache(maxsize=GROUPINGS_CACHE_SIZE)
+def _jigsaw_of_units(order: int,
+                     units: Tuple[Tuple[int, ...], ...]) -> Type[Grouping]:
+    """The same regions give the same grouping, and hit the caches
+    of the solvers"""
+    return type("JigsawGrouping", (Grouping,), {
+        "__doc__": "Irregular regions of a jigsaw sudoku",
+        "ORDER": order,
+        "UNITS": units,
+    })
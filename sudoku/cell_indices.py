@@ -0,0 +1,120 @@
+"""Precomputed, immutable index tables of the boards
+
+A board of order n has size n * n (9 for the usual 9x9 sudoku, of order 3).
+Cells are described by their flat index k = size * row + col.
+Units are the 3 * size groups of size cells which should not contain
+the same value twice: the rows, then the columns, then the boxes.
+
+The tables are built once per order, and are plain tuples so that
+importing them does not require numpy. The module-level tables describe
+the 9x9 board, see ``board_indices`` for the other orders.
+"""
+from typing import NamedTuple, Tuple, Dict
+
+
+class BoardIndices(NamedTuple):
+    ORDER: int
+    SIZE: int
+    CELLS: Tuple[int, ...]
+    ROW_OF: Tuple[int, ...]
+    COL_OF: Tuple[int, ...]
+    BOX_OF: Tuple[int, ...]
+    COORDINATES: Tuple[Tuple[int, int], ...]
+    ROW_UNITS: Tuple[Tuple[int, ...], ...]
+    COLUMN_UNITS: Tuple[Tuple[int, ...], ...]
+    BOX_UNITS: Tuple[Tuple[int, ...], ...]
+    UNITS: Tuple[Tuple[int, ...], ...]
+    CELL_UNITS: Tuple[Tuple[int, int, int], ...]  # (row, column, box) units
+    PEERS: Tuple[Tuple[int, ...], ...]  # The other cells sharing a unit
+
+
+def _build_indices(order: int) -> BoardIndices:
+    size = order * order
+    cells = tuple(range(size * size))
+    row_of = tuple(k // size for k in cells)
+    col_of = tuple(k % size for k in cells)
+    box_of = tuple(
+        order * (row_of[k] // order) + col_of[k] // order for k in cells)
+
+    row_units = tuple(
+        tuple(size * row + col for col in range(size)) for row in range(size))
+    column_units = tuple(
+        tuple(size * row + col for row in range(size)) for col in range(size))
+    box_units = tuple(
+        tuple(k for k in cells if box_of[k] == box) for box in range(size))
+    units = row_units + column_units + box_units
+    cell_units = tuple(
+        (row_of[k], size + col_of[k], 2 * size + box_of[k]) for k in cells)
+    peers = tuple(
+        tuple(sorted(set(p for u in cell_units[k] for p in units[u]) - {k}))
+        for k in cells
+    )
+    return BoardIndices(
+        order, size, cells, row_of, col_of, box_of,
+        tuple(zip(row_of, col_of)), row_units, column_units, box_units,
+        units, cell_units, peers)
+
+
+_BOARD_INDICES: Dict[int, BoardIndices] = dict()
+
+
+def board_indices(order: int = 3) -> BoardIndices:
+    """The index tables of the board of the given order, built on first use"""
+    if order not in _BOARD_INDICES:
+        if order < 1:
+            raise ValueError(f"Invalid board order: {order}")
+        _BOARD_INDICES[order] = _build_indices(order)
+    return _BOARD_INDICES[order]
+
+
+def order_of_size(size: int) -> int:
+    """Order of the board with size (= order * order) cells per unit"""
+    order = round(size ** 0.5)
+    if order * order != size or order < 1:
+        raise ValueError(f"Invalid board size: {size}")
+    return order
+
+
+_INDICES = board_indices(3)
+CELLS = _INDICES.CELLS
+ROW_OF = _INDICES.ROW_OF
+COL_OF = _INDICES.COL_OF
+BOX_OF = _INDICES.BOX_OF
+COORDINATES = _INDICES.COORDINATES
+
+ROW_UNITS = _INDICES.ROW_UNITS
+COLUMN_UNITS = _INDICES.COLUMN_UNITS
+BOX_UNITS = _INDICES.BOX_UNITS
+UNITS = _INDICES.UNITS
+
+# The 3 units of each cell: (row unit, column unit, box unit)
+CELL_UNITS = _INDICES.CELL_UNITS
+
+# The 20 other cells sharing a unit with each cell
+PEERS = _INDICES.PEERS
+
+
+class IndexArrays(NamedTuple):
+    units: "np.ndarray"  # (3 * size, size)
+    peers: "np.ndarray"  # (size * size, 3 * size - 2 * order - 1)
+    cell_units: "np.ndarray"  # (size * size, 3)
+
+
+_INDEX_ARRAYS: Dict[int, IndexArrays] = dict()
+
+
+def index_arrays(order: int = 3) -> IndexArrays:
+    """The same tables as NumPy index arrays, for gather/scatter operations.
+    numpy is only imported on the first call."""
+    if order not in _INDEX_ARRAYS:
+        import numpy as np
+        indices = board_indices(order)
+        arrays = IndexArrays(
+            units=np.array(indices.UNITS, dtype=np.intp),
+            peers=np.array(indices.PEERS, dtype=np.intp),
+            cell_units=np.array(indices.CELL_UNITS, dtype=np.intp),
+        )
+        for array in arrays:
+            array.setflags(write=False)
+        _INDEX_ARRAYS[order] = arrays
+    return _INDEX_ARRAYS[order]
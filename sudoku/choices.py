@@ -1,10 +1,11 @@
 
-import numpy as np
-from typing import Type, List
+from array import array
+from functools import lru_cache
+from typing import Type, List, NamedTuple, Sequence, Tuple, Dict
 from enum import Enum
 from io import StringIO
 
-from .io_sudoku import IOSudoku
+from .io_sudoku import IOSudoku, GRID_DTYPE
 from .exceptions import \
     SudokuException, \
     UnableToSolveException, \
@@ -36,8 +37,16 @@ class ForceSetOutcome(Enum):
 
 class SudokuChoices:
 
-    def __init__(self):
-        pass
+    def __init__(self, order: int = 3):
+        """:@param order: Order of the board, of size order * order
+
+        Mutations are only recorded in the undo trail while a snapshot
+        is outstanding, see ``snapshot``.
+        """
+        self.order = order
+        self.size = order * order
+        self._trail = list()
+        self._snapshots = list()  # Trail length at each outstanding snapshot
 
     def __str__(self):
         raise NotImplementedError
@@ -77,6 +86,30 @@ class SudokuChoices:
         """Says whether all the cells have there final value"""
         raise NotImplementedError
 
+    def snapshot(self) -> int:
+        """Returns a token describing the current state of the choices,
+        the token is only valid until a former state is restored
+        (or the snapshot is released)"""
+        self._snapshots.append(len(self._trail))
+        return len(self._snapshots) - 1
+
+    def restore(self, token: int):
+        """Puts the choices back in the state described by the token,
+        undoing the mutations made since the snapshot, and releases it"""
+        self._undo(self._snapshots[token])
+        self.release(token)
+
+    def release(self, token: int):
+        """Keeps the current state, and forgets the snapshot of the token
+        and the later ones: the trail is dropped when none is left"""
+        del self._snapshots[token:]
+        if not self._snapshots:
+            self._trail = list()
+
+    def _undo(self, length: int):
+        """Undoes the mutations of the trail beyond length"""
+        raise NotImplementedError
+
 
 
 class StaticSudokuChoices(SudokuChoices):
@@ -91,43 +124,43 @@ class StaticSudokuChoices(SudokuChoices):
                       |------------------|---------------|
                          Allowed values   Forbidden values
         Number of allowed values: (count)_ij
+
+        While a snapshot is outstanding, mutations are recorded in
+        an undo trail of (row, col, former choices, former count).
         """
-        super().__init__()
-        self._choices = np.zeros((9, 9, 9), dtype=int)
-        self._count = np.zeros((9, 9), dtype=int)
-
-        for row in range(9):
-            for col in range(9):
-                cell_value = sudoku.get_cell(row, col)
-                if cell_value == IOSudoku.EMPTY_CELL:
-                    self._choices[row, col, :] = np.arange(1, 10)
-                    self._count[row, col] = 9
-                else:
-                    self._choices[row, col, 0] = cell_value
-                    self._count[row, col] = 1
+        import numpy as np
+        super().__init__(sudoku.order)
+        size = self.size
+        grid = np.asarray(sudoku.grid)
+        empty = grid == IOSudoku.EMPTY_CELL
+        self._choices = np.zeros((size, size, size), dtype=GRID_DTYPE)
+        self._choices[empty] = np.arange(1, size + 1)
+        self._choices[~empty, 0] = grid[~empty]
+        self._count = np.where(empty, size, 1).astype(GRID_DTYPE)
 
     def __str__(self):
+        order = self.order
         txt = StringIO()
-        for row in range(9):
-            for col in [0, 3, 6]:
-                counts = self._count[row, col:col + 3]
-                choices = self._choices[row, col:col + 3, 0]
-                three_cells = [f'[{counts[k]}]' if counts[k] > 1 else f' {choices[k]} ' for k in range(3)]
-                txt.write(" ".join(map(str, three_cells)))
+        for row in range(self.size):
+            for col in range(0, self.size, order):
+                counts = self._count[row, col:col + order]
+                choices = self._choices[row, col:col + order, 0]
+                box_cells = [f'[{counts[k]}]' if counts[k] > 1 else f' {choices[k]} ' for k in range(order)]
+                txt.write(" ".join(map(str, box_cells)))
                 txt.write("  ")
             txt.write('\n')
-            if row in [2, 5]:
+            if row % order == order - 1 and row != self.size - 1:
                 txt.write('\n')
         return txt.getvalue()
 
     def show_details(self):
         col2size = [
-            max([self.number_of_choices(row, col) for row in range(9)])
-            for col in range(9)
+            max([self.number_of_choices(row, col) for row in range(self.size)])
+            for col in range(self.size)
         ]
         txt = StringIO()
-        for row in range(9):
-            for col in range(9):
+        for row in range(self.size):
+            for col in range(self.size):
                 size = col2size[col]
                 if self.number_of_choices(row, col) == 1:
                     t = str(self.get_cell_value(row, col))
@@ -136,7 +169,7 @@ class StaticSudokuChoices(SudokuChoices):
                 txt.write((size - len(t)) * " " + t)
                 txt.write("  ")
             txt.write('\n')
-            if row in [2, 5]:
+            if row % self.order == self.order - 1:
                 txt.write('\n')
         print(txt.getvalue())
 
@@ -146,7 +179,7 @@ class StaticSudokuChoices(SudokuChoices):
     def forbid(self, arr_row: int, arr_col: int, cell_value: int) -> ForbidOutcome:
         """Removes the current value from the possible choices,
         the outcome specifies what precisely happened"""
-        count_ij = self._count[arr_row, arr_col]
+        count_ij = int(self._count[arr_row, arr_col])
         choices = self._choices[arr_row, arr_col, :count_ij]
 
         if count_ij == 1:
@@ -161,6 +194,9 @@ class StaticSudokuChoices(SudokuChoices):
         if cell_value not in choices:
             return ForbidOutcome.USELESS
 
+        if self._snapshots:
+            self._trail.append((arr_row, arr_col,
+                                self._choices[arr_row, arr_col].copy(), count_ij))
         new_choices = [c for c in choices if c != cell_value]
         self._choices[arr_row, arr_col, :count_ij - 1] = new_choices
         self._choices[arr_row, arr_col, count_ij - 1] = 0
@@ -177,6 +213,9 @@ class StaticSudokuChoices(SudokuChoices):
         if count == 1:
             return ForceSetOutcome.USELESS
 
+        if self._snapshots:
+            self._trail.append((arr_row, arr_col,
+                                self._choices[arr_row, arr_col].copy(), count))
         self._choices[arr_row, arr_col, 0] = cell_value
         self._choices[arr_row, arr_col, 1:count] = 0
         self._count[arr_row, arr_col] = 1
@@ -193,17 +232,242 @@ class StaticSudokuChoices(SudokuChoices):
         """Returns the value of the designated cell,
         but does NOT check is there is only one value available
         """
-        return self._choices[arr_row, arr_col, 0]
+        return int(self._choices[arr_row, arr_col, 0])
 
     def number_of_choices(self, arr_row: int, arr_col: int) -> int:
         """Counts the number of possible choices in the designated cell"""
-        return self._count[arr_row, arr_col]
+        return int(self._count[arr_row, arr_col])
 
     def get_cell_value_choices(self, arr_row: int, arr_col: int) -> List[int]:
         """Returns a list of possible cell value choices"""
         nb = self._count[arr_row, arr_col]
-        return list(self._choices[arr_row, arr_col, :nb])
+        return self._choices[arr_row, arr_col, :nb].tolist()
+
+    def all_final(self) -> bool:
+        """Says whether all the cells have there final value"""
+        return bool((self._count == 1).all())
+
+    def _undo(self, length: int):
+        trail = self._trail
+        while len(trail) > length:
+            arr_row, arr_col, choices, count = trail.pop()
+            self._choices[arr_row, arr_col] = choices
+            self._count[arr_row, arr_col] = count
+
+
+class _ComputedTable:
+    """Read-only table computing its items on demand,
+    for masks too wide to tabulate"""
+
+    def __init__(self, function):
+        self._function = function
+
+    def __getitem__(self, mask: int):
+        return self._function(mask)
+
+
+class MaskTables(NamedTuple):
+    """Lookup tables of the size-bit candidate masks, where
+    bit (cell_value - 1) is set when cell_value is allowed"""
+
+    full_mask: int
+    popcount: Sequence[int]
+    lowest_value: Sequence[int]
+    mask_values: Sequence[Tuple[int, ...]]
+    typecode: str  # array typecode wide enough for the masks
+
+
+# Masks up to this size are tabulated (2 ** size entries per table)
+MAX_TABULATED_SIZE = 16
+_MASK_TABLES: Dict[int, MaskTables] = dict()
+
+
+def _mask_typecode(size: int) -> str:
+    """Narrowest unsigned array typecode holding size-bit masks
+    ('L' is 8 bytes on most 64-bit platforms, 'I' 4 bytes)"""
+    for typecode in "HILQ":
+        if 8 * array(typecode).itemsize >= size:
+            return typecode
+    raise ValueError(f"No array typecode holds {size}-bit masks")
+
+
+def mask_tables(size: int) -> MaskTables:
+    """The mask tables of the boards of the given size, built on first use"""
+    if size in _MASK_TABLES:
+        return _MASK_TABLES[size]
+
+    full_mask = (1 << size) - 1
+
+    def popcount(mask: int) -> int:
+        return bin(mask).count('1')
+
+    def lowest_value(mask: int) -> int:
+        return (mask & -mask).bit_length()
+
+    def mask_values(mask: int) -> Tuple[int, ...]:
+        return tuple(v for v in range(1, size + 1) if mask & (1 << (v - 1)))
+
+    if size <= MAX_TABULATED_SIZE:
+        masks = range(full_mask + 1)
+        tables = MaskTables(
+            full_mask,
+            tuple(map(popcount, masks)),
+            tuple(map(lowest_value, masks)),
+            tuple(map(mask_values, masks)),
+            _mask_typecode(size))
+    else:
+        tables = MaskTables(
+            full_mask,
+            _ComputedTable(popcount),
+            _ComputedTable(lowest_value),
+            _ComputedTable(lru_cache(maxsize=1 << 16)(mask_values)),
+            _mask_typecode(size))
+    _MASK_TABLES[size] = tables
+    return tables
+
+
+# 9-bit candidate masks of the 9x9 board
+FULL_MASK, POPCOUNT, LOWEST_VALUE, MASK_VALUES, _ = mask_tables(9)
+
+
+class BitmaskSudokuChoices(SudokuChoices):
+
+    def __init__(self, sudoku: IOSudoku):
+        """
+
+        (mask)_k: int, size-bit integer with k = size * row + col
+
+        (mask)_k = b v9 v8 v7 v6 v5 v4 v3 v2 v1   (on the 9x9 board)
+        where v_i is set iff the cell value i is still allowed.
+        Number of allowed values: POPCOUNT[(mask)_k]
+
+        The masks are stored on 16 bits up to 16x16 boards, and on
+        32 bits beyond (see ``mask_tables``).
+
+        While a snapshot is outstanding, mutations are recorded in
+        an undo trail of (k, former mask).
+        """
+        super().__init__(sudoku.order)
+        self._set_values(sudoku.grid.ravel().tolist())
+
+    @classmethod
+    def from_values(cls, values: Sequence[int], order: int = 3) \
+            -> "BitmaskSudokuChoices":
+        """Builds the choices from the flat cell values (IOSudoku.EMPTY_CELL
+        for the empty cells), without numpy"""
+        choices = cls.__new__(cls)
+        SudokuChoices.__init__(choices, order)
+        choices._set_values(values)
+        return choices
+
+    def _set_values(self, values: Sequence[int]):
+        size = self.size
+        if len(values) != size * size:
+            raise ValueError(f"Expected {size * size} cell values, got {len(values)}")
+        (self._full_mask, self._popcount, self._lowest_value,
+         self._mask_values, typecode) = mask_tables(size)
+        self._masks = array(typecode, [
+            self._full_mask if cell_value == IOSudoku.EMPTY_CELL
+            else 1 << (int(cell_value) - 1)
+            for cell_value in values
+        ])
+
+    def __str__(self):
+        order, size = self.order, self.size
+        popcount, lowest_value = self._popcount, self._lowest_value
+        txt = StringIO()
+        for row in range(size):
+            for col in range(0, size, order):
+                masks = self._masks[size * row + col:size * row + col + order]
+                box_cells = [
+                    f'[{popcount[mask]}]' if popcount[mask] > 1
+                    else f' {lowest_value[mask]} '
+                    for mask in masks
+                ]
+                txt.write(" ".join(box_cells))
+                txt.write("  ")
+            txt.write('\n')
+            if row % order == order - 1 and row != size - 1:
+                txt.write('\n')
+        return txt.getvalue()
+
+    def to_IOSudoku(self) -> IOSudoku:
+        """Cells which are not final are left empty"""
+        import numpy as np
+        grid = np.array(self.to_values(), dtype=GRID_DTYPE).reshape((self.size, self.size))
+        return IOSudoku(grid)
+
+    def to_values(self) -> List[int]:
+        """Flat cell values, cells which are not final are left empty"""
+        popcount, lowest_value = self._popcount, self._lowest_value
+        return [
+            lowest_value[mask] if popcount[mask] == 1 else IOSudoku.EMPTY_CELL
+            for mask in self._masks
+        ]
+
+    def forbid(self, arr_row: int, arr_col: int, cell_value: int) -> ForbidOutcome:
+        """Removes the current value from the possible choices,
+        the outcome specifies what precisely happened"""
+        k = self.size * arr_row + arr_col
+        mask = self._masks[k]
+        bit = 1 << (cell_value - 1)
+
+        if not mask & bit:
+            if not mask:
+                raise ValueError(f"(mask)_({arr_row},{arr_col}) is already 0")
+            return ForbidOutcome.USELESS
+
+        if mask == bit:
+            return ForbidOutcome.LEFT_EMPTY_HANDED
+
+        if self._snapshots:
+            self._trail.append((k, mask))
+        self._masks[k] = mask ^ bit
+        return ForbidOutcome.USEFUL
+
+    def force_set(self, arr_row: int, arr_col: int, cell_value: int) -> ForceSetOutcome:
+        """Forces designated cell to equal cell value"""
+        k = self.size * arr_row + arr_col
+        mask = self._masks[k]
+        bit = 1 << (cell_value - 1)
+
+        if not mask & bit:
+            return ForceSetOutcome.IMPOSSIBLE
+
+        if mask == bit:
+            return ForceSetOutcome.USELESS
+
+        if self._snapshots:
+            self._trail.append((k, mask))
+        self._masks[k] = bit
+        return ForceSetOutcome.OK
+
+    def is_final(self, arr_row: int, arr_col: int) -> bool:
+        """Says whether the designated cell has its final value,
+        ie that there is only one possible choice"""
+        return self._popcount[self._masks[self.size * arr_row + arr_col]] == 1
+
+    def get_cell_value(self, arr_row: int, arr_col: int) -> int:
+        """Returns the value of the designated cell,
+        but does NOT check is there is only one value available
+        """
+        return self._lowest_value[self._masks[self.size * arr_row + arr_col]]
+
+    def number_of_choices(self, arr_row: int, arr_col: int) -> int:
+        """Counts the number of possible choices in the designated cell"""
+        return self._popcount[self._masks[self.size * arr_row + arr_col]]
+
+    def get_cell_value_choices(self, arr_row: int, arr_col: int) -> List[int]:
+        """Returns a list of possible cell value choices"""
+        return list(self._mask_values[self._masks[self.size * arr_row + arr_col]])
 
     def all_final(self) -> bool:
         """Says whether all the cells have there final value"""
-        return np.all(self._count == 1)
+        popcount = self._popcount
+        return all(popcount[mask] == 1 for mask in self._masks)
+
+    def _undo(self, length: int):
+        trail, masks = self._trail, self._masks
+        while len(trail) > length:
+            k, mask = trail.pop()
+            masks[k] = mask
@@ -1,20 +1,68 @@
-import numpy as np
-from typing import Tuple, Type, List
+import threading
+from collections import deque
+from functools import lru_cache
+from time import perf_counter
+from typing import Tuple, Type, List, Callable, Optional, Sequence
 
 from .choices import SudokuChoices, \
     ForbidOutcome, DirectOutcome, ForceSetOutcome
-from .cell_groups import Grouping, RowGrouping, ColumnGrouping, BoxGrouping
+from .cell_groups import Grouping, groupings_of_order, GROUPINGS_CACHE_SIZE
+from .stats import SolverObserver
+
+
+_ISOLATE_BUFFERS = threading.local()
+
+
+def _isolate_buffers(size: int) -> Tuple[List[int], List[int], List]:
+    """Scratch buffers of isolate_sub_group, shared by all the solvers of
+    the thread (so by all the puzzles of a worker), for all the groups of
+    all the passes: usage is reset by copying no_usage, and location is
+    only read where it has been written for the group.
+
+    Returns the (no_usage, usage, location) buffers of the size."""
+    buffers = getattr(_ISOLATE_BUFFERS, "by_size", None)
+    if buffers is None:
+        buffers = _ISOLATE_BUFFERS.by_size = dict()
+    if size not in buffers:
+        buffers[size] = [0] * size, [0] * size, [None] * size
+    return buffers[size]
 
 
 class DirectSolver:
 
-    def __init__(self, initial_sudoku: SudokuChoices):
+    def __init__(self, initial_sudoku: SudokuChoices,
+                 observer: Optional[SolverObserver] = None):
         self.sudoku = initial_sudoku
+        self.observer = observer
 
     def __call__(self) \
             -> Tuple[bool, SudokuChoices]:
         return self.solve()
 
+    def forbid(self, arr_row: int, arr_col: int, cell_value: int) -> ForbidOutcome:
+        """Forbids a value on the sudoku being solved"""
+        outcome = self.sudoku.forbid(arr_row, arr_col, cell_value)
+        if self.observer is not None:
+            self.observer.on_forbid(arr_row, arr_col, cell_value, outcome)
+        return outcome
+
+    def force_set(self, arr_row: int, arr_col: int, cell_value: int) -> ForceSetOutcome:
+        """Forces a value on the sudoku being solved"""
+        outcome = self.sudoku.force_set(arr_row, arr_col, cell_value)
+        if self.observer is not None:
+            self.observer.on_force_set(arr_row, arr_col, cell_value, outcome)
+        return outcome
+
+    def run_rule(self, rule: str, apply: Callable[..., DirectOutcome], *args) \
+            -> DirectOutcome:
+        """Applies a rule, and reports it to the observer (if any)"""
+        if self.observer is None:
+            return apply(*args)
+        start = perf_counter()
+        outcome = apply(*args)
+        self.observer.on_rule(rule, outcome, perf_counter() - start)
+        return outcome
+
     def solve(self) -> Tuple[bool, SudokuChoices]:
         """
         Returns:
@@ -34,28 +82,73 @@ class EmptyDirectSolver(DirectSolver):
 
 class GroupBasedDirectSolver(DirectSolver):
 
+    def __init__(self, initial_sudoku: SudokuChoices,
+                 observer: Optional[SolverObserver] = None,
+                 groupings: Optional[Sequence[Type[Grouping]]] = None):
+        """Naked and hidden singles, group by group
+
+        :@param groupings: Groupings whose groups hold each cell value
+            exactly once (default: the rows, columns and boxes of the order
+            of the sudoku), see ``cell_groups`` for the variant groupings
+        """
+        super().__init__(initial_sudoku, observer)
+        if groupings is None:
+            groupings = groupings_of_order(initial_sudoku.order)
+        self.groupings = tuple(groupings)
+
+        self._no_usage, self._usage, self._location = \
+            _isolate_buffers(initial_sudoku.size)
+
     def solve(self) -> Tuple[bool, SudokuChoices]:
+        outcome = self.propagate()
+        if outcome == DirectOutcome.INCONSISTENT_CHANGE:
+            return False, self.sudoku
+        return self.is_solved(), self.sudoku
+
+    def propagate(self) -> DirectOutcome:
+        """
+        Applies the direct rules until nothing changes anymore.
+
+        Returns:
+            - INCONSISTENT_CHANGE if a contradiction was met,
+            - NOTHING_CHANGED once a fixed point is reached.
+        """
         while True:
             outcome = self.clean_and_isolate()
-            if outcome == DirectOutcome.INCONSISTENT_CHANGE:
-                return False, self.sudoku
-            if outcome == DirectOutcome.NOTHING_CHANGED:
-                return self.is_solved(), self.sudoku
+            if outcome != DirectOutcome.HAS_CHANGED:
+                return outcome
 
     def is_solved(self) -> bool:
-        # TODO: determine if it is necessary to check the overall sudoku consistency
-        return self.sudoku.all_final()
+        """All the cells are final, and no group holds a value twice.
+
+        After propagate, the consistency always holds (the cleaning meets
+        two final cells sharing a value as a contradiction), but it is
+        checked anyway since it only costs one pass once all are final.
+        See ``validation`` to check many grids at once."""
+        return self.sudoku.all_final() and self.is_consistent()
+
+    def is_consistent(self) -> bool:
+        """No group holds the same final value twice"""
+        for group in self.groupings:
+            for sub_group in group.SUB_GROUPS:
+                values = [
+                    self.sudoku.get_cell_value(row, col)
+                    for row, col in sub_group if self.sudoku.is_final(row, col)
+                ]
+                if len(set(values)) != len(values):
+                    return False
+        return True
 
     def clean_and_isolate(self) -> DirectOutcome:
-        cleaning_outcome = self.clean_all_groups()
+        if self.observer is not None:
+            self.observer.on_pass()
+
+        cleaning_outcome = self.run_rule("clean", self.clean_all_groups)
         if cleaning_outcome == DirectOutcome.INCONSISTENT_CHANGE:
-            print("Inconsistent cleaning")
             return DirectOutcome.INCONSISTENT_CHANGE
 
-        # isolation_outcome = DirectOutcome.NOTHING_CHANGED
-        isolation_outcome = self.isolate_all_groups()
+        isolation_outcome = self.run_rule("isolate", self.isolate_all_groups)
         if isolation_outcome == DirectOutcome.INCONSISTENT_CHANGE:
-            print("Inconsistent isolation")
             return DirectOutcome.INCONSISTENT_CHANGE
 
         if DirectOutcome.HAS_CHANGED in [cleaning_outcome, isolation_outcome]:
@@ -65,7 +158,7 @@ class GroupBasedDirectSolver(DirectSolver):
 
     def clean_all_groups(self) -> DirectOutcome:
         cleaning_outcome = DirectOutcome.NOTHING_CHANGED
-        for group in (RowGrouping, ColumnGrouping, BoxGrouping):
+        for group in self.groupings:
             group_outcome = self.clean_group(group)
             if group_outcome == DirectOutcome.INCONSISTENT_CHANGE:
                 return DirectOutcome.INCONSISTENT_CHANGE
@@ -75,8 +168,8 @@ class GroupBasedDirectSolver(DirectSolver):
 
     def clean_group(self, group: Type[Grouping]) -> DirectOutcome:
         group_outcome = DirectOutcome.NOTHING_CHANGED
-        for parent in group.PARENTS:
-            sub_outcome = self.clean_sub_group(group.sub_group(parent))
+        for sub_group in group.SUB_GROUPS:
+            sub_outcome = self.clean_sub_group(sub_group)
             if sub_outcome == DirectOutcome.INCONSISTENT_CHANGE:
                 return DirectOutcome.INCONSISTENT_CHANGE
             if sub_outcome == DirectOutcome.HAS_CHANGED:
@@ -96,20 +189,27 @@ class GroupBasedDirectSolver(DirectSolver):
             self.sudoku.get_cell_value(arr_pos[0], arr_pos[1])
             for arr_pos in final_positions
         ]
+        if len(set(already_used)) != len(already_used):
+            # Two final cells share the same value
+            return DirectOutcome.INCONSISTENT_CHANGE
 
+        # Only the used values still allowed are forbidden (rather than
+        # all the used values in all the cells), which matters on large boards
+        used_values = set(already_used)
         for row, col in still_free_positions:
-            for cell_value in already_used:
-                outcome = self.sudoku.forbid(row, col, cell_value)
-                if outcome == ForbidOutcome.LEFT_EMPTY_HANDED:
-                    return DirectOutcome.INCONSISTENT_CHANGE
-                if outcome == ForbidOutcome.USEFUL:
-                    sub_outcome = DirectOutcome.HAS_CHANGED
+            for cell_value in self.sudoku.get_cell_value_choices(row, col):
+                if cell_value in used_values:
+                    outcome = self.forbid(row, col, cell_value)
+                    if outcome == ForbidOutcome.LEFT_EMPTY_HANDED:
+                        return DirectOutcome.INCONSISTENT_CHANGE
+                    if outcome == ForbidOutcome.USEFUL:
+                        sub_outcome = DirectOutcome.HAS_CHANGED
 
         return sub_outcome
 
     def isolate_all_groups(self) -> DirectOutcome:
         isolation_outcome = DirectOutcome.NOTHING_CHANGED
-        for group in (RowGrouping, ColumnGrouping, BoxGrouping):
+        for group in self.groupings:
             group_outcome = self.isolate_group(group)
             if group_outcome == DirectOutcome.INCONSISTENT_CHANGE:
                 return DirectOutcome.INCONSISTENT_CHANGE
@@ -119,27 +219,124 @@ class GroupBasedDirectSolver(DirectSolver):
 
     def isolate_group(self, group: Type[Grouping]) -> DirectOutcome:
         isolated = False
-        for parent in group.PARENTS:
-            sub_group = group.sub_group(parent)
-            usage = np.zeros((9,), dtype=int)  # cell values
-            # location contains inconsistent array indices by default
-            location = np.zeros((9, 2), dtype=int)
-            for row, col in sub_group:
-                choices = self.sudoku.get_cell_value_choices(row, col)
-                for cell_value in choices:
-                    arr_value = cell_value - 1
-                    usage[arr_value] += 1
-                    location[arr_value, :] = (row, col)
-
-            for arr_value in range(9):
-                row, col = location[arr_value, :]
-                if usage[arr_value] != 1 or self.sudoku.is_final(row, col):
-                    continue
-                cell_value = arr_value + 1
-                # print(f"\tIsolating ({row}, {col}) to {cell_value}")
-                outcome = self.sudoku.force_set(row, col, cell_value)
-                if outcome == ForceSetOutcome.IMPOSSIBLE:
-                    return DirectOutcome.INCONSISTENT_CHANGE
-                elif outcome == ForceSetOutcome.OK:
-                    isolated = True
+        for sub_group in group.SUB_GROUPS:
+            sub_outcome = self.isolate_sub_group(sub_group)
+            if sub_outcome == DirectOutcome.INCONSISTENT_CHANGE:
+                return DirectOutcome.INCONSISTENT_CHANGE
+            if sub_outcome == DirectOutcome.HAS_CHANGED:
+                isolated = True
         return DirectOutcome.HAS_CHANGED if isolated else DirectOutcome.NOTHING_CHANGED
+
+    def isolate_sub_group(self, sub_group: List[Tuple[int]]) -> DirectOutcome:
+        isolated = False
+        size = self.sudoku.size
+        usage, location = self._usage, self._location
+        usage[:] = self._no_usage
+        for row, col in sub_group:
+            choices = self.sudoku.get_cell_value_choices(row, col)
+            for cell_value in choices:
+                arr_value = cell_value - 1
+                usage[arr_value] += 1
+                location[arr_value] = (row, col)
+
+        for arr_value in range(size):
+            if usage[arr_value] == 0:
+                # No cell of the group can hold this value anymore
+                return DirectOutcome.INCONSISTENT_CHANGE
+            row, col = location[arr_value]
+            if usage[arr_value] != 1 or self.sudoku.is_final(row, col):
+                continue
+            cell_value = arr_value + 1
+            outcome = self.force_set(row, col, cell_value)
+            if outcome == ForceSetOutcome.IMPOSSIBLE:
+                return DirectOutcome.INCONSISTENT_CHANGE
+            elif outcome == ForceSetOutcome.OK:
+                isolated = True
+        return DirectOutcome.HAS_CHANGED if isolated else DirectOutcome.NOTHING_CHANGED
+
+
+@lru_cache(maxsize=GROUPINGS_CACHE_SIZE)
+def _worklist_groups(groupings: Tuple[Type[Grouping], ...]):
+    """The groups of all the groupings (as coordinates),
+    and the indices of the groups of each cell by [row][col]"""
+    size = groupings[0].ORDER ** 2
+    groups = tuple(
+        sub_group for grouping in groupings
+        for sub_group in grouping.SUB_GROUPS
+    )
+    cell_groups = [[list() for _ in range(size)] for _ in range(size)]
+    for k, sub_group in enumerate(groups):
+        for row, col in sub_group:
+            cell_groups[row][col].append(k)
+    return groups, tuple(
+        tuple(tuple(cell) for cell in row) for row in cell_groups)
+
+
+class IncrementalDirectSolver(GroupBasedDirectSolver):
+    """
+    Same rules as GroupBasedDirectSolver, but driven by a worklist:
+    every useful forbid/force_set queues the groups (row, column, box
+    and those of the variant groupings) of the modified cell, and only
+    the queued groups are re-examined.
+
+    All the groups are queued initially. The queue survives between
+    calls to propagate, so that a caller (e.g. a search) only pays
+    for the groups touched by its own force_set calls.
+    """
+
+    def __init__(self, initial_sudoku: SudokuChoices,
+                 observer: Optional[SolverObserver] = None,
+                 groupings: Optional[Sequence[Type[Grouping]]] = None):
+        super().__init__(initial_sudoku, observer, groupings)
+        self._groups, self._cell_groups = _worklist_groups(self.groupings)
+        self._queue = deque(range(len(self._groups)))
+        self._queued = [True] * len(self._groups)
+
+    def _push_cell(self, arr_row: int, arr_col: int):
+        for k in self._cell_groups[arr_row][arr_col]:
+            if not self._queued[k]:
+                self._queued[k] = True
+                self._queue.append(k)
+
+    def _clear_queue(self):
+        self._queue.clear()
+        self._queued = [False] * len(self._groups)
+
+    def forbid(self, arr_row: int, arr_col: int, cell_value: int) -> ForbidOutcome:
+        outcome = super().forbid(arr_row, arr_col, cell_value)
+        if outcome == ForbidOutcome.USEFUL:
+            self._push_cell(arr_row, arr_col)
+        return outcome
+
+    def force_set(self, arr_row: int, arr_col: int, cell_value: int) -> ForceSetOutcome:
+        outcome = super().force_set(arr_row, arr_col, cell_value)
+        if outcome == ForceSetOutcome.OK:
+            self._push_cell(arr_row, arr_col)
+        return outcome
+
+    def propagate(self) -> DirectOutcome:
+        """
+        Re-examines the queued groups until the queue is empty.
+
+        Returns:
+            - INCONSISTENT_CHANGE if a contradiction was met
+              (the queue is then emptied),
+            - NOTHING_CHANGED once a fixed point is reached.
+        """
+        while self._queue:
+            k = self._queue.popleft()
+            self._queued[k] = False
+            sub_group = self._groups[k]
+            if self.observer is None:
+                outcome = self.clean_sub_group(sub_group)
+                if outcome != DirectOutcome.INCONSISTENT_CHANGE:
+                    outcome = self.isolate_sub_group(sub_group)
+            else:
+                outcome = self.run_rule("clean", self.clean_sub_group, sub_group)
+                if outcome != DirectOutcome.INCONSISTENT_CHANGE:
+                    outcome = self.run_rule(
+                        "isolate", self.isolate_sub_group, sub_group)
+            if outcome == DirectOutcome.INCONSISTENT_CHANGE:
+                self._clear_queue()
+                return DirectOutcome.INCONSISTENT_CHANGE
+        return DirectOutcome.NOTHING_CHANGED
@@ -0,0 +1,204 @@
+"""Exact-cover solving with Dancing Links (Knuth's Algorithm X)
+
+A sudoku is the exact cover of 324 columns by rows (cell, cell value):
+    - columns 0 to 80: each cell holds a value,
+    - columns 81 to 161: each row holds each value,
+    - columns 162 to 242: each column holds each value,
+    - columns 243 to 323: each box holds each value.
+On a board of size n (n * n cells), each block has n * n columns.
+"""
+from typing import Hashable, Iterator, List, Optional, Sequence, Tuple
+
+from .io_sudoku import IOSudoku
+from .choices import SudokuChoices, BitmaskSudokuChoices, ForceSetOutcome
+from .direct_solver import DirectSolver
+from .exceptions import MaxIterReachedException
+from .stats import SolverObserver
+from . import cell_indices
+
+
+class DancingLinks:
+
+    def __init__(self, nb_columns: int):
+        """Sparse exact-cover matrix as circular doubly-linked lists,
+        stored in flat lists: node 0 is the root, nodes 1 to nb_columns
+        are the column headers, the other nodes are the 1s of the rows."""
+        n = nb_columns + 1
+        self.left = [i - 1 for i in range(n)]
+        self.right = [i + 1 for i in range(n)]
+        self.left[0], self.right[-1] = nb_columns, 0
+        self.up = list(range(n))
+        self.down = list(range(n))
+        self.column = list(range(n))
+        self.size = [0] * n
+        self.row_of = [None] * n
+        self.nodes = 0
+
+    def add_row(self, row_id: Hashable, columns: Sequence[int]):
+        """Adds a row with 1s in the columns (0-indexed)"""
+        first = None
+        for col in columns:
+            header = col + 1
+            node = len(self.column)
+            self.column.append(header)
+            self.row_of.append(row_id)
+            self.up.append(self.up[header])
+            self.down.append(header)
+            self.down[self.up[header]] = node
+            self.up[header] = node
+            self.size[header] += 1
+            if first is None:
+                first = node
+                self.left.append(node)
+                self.right.append(node)
+            else:
+                self.left.append(self.left[first])
+                self.right.append(first)
+                self.right[self.left[first]] = node
+                self.left[first] = node
+
+    def _cover(self, header: int):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        right[left[header]] = right[header]
+        left[right[header]] = left[header]
+        i = down[header]
+        while i != header:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                self.size[self.column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, header: int):
+        left, right, up, down = self.left, self.right, self.up, self.down
+        i = up[header]
+        while i != header:
+            j = left[i]
+            while j != i:
+                self.size[self.column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[header]] = header
+        left[right[header]] = header
+
+    def solutions(self, max_nodes: Optional[int] = None,
+                  observer: Optional[SolverObserver] = None) -> Iterator[List[Hashable]]:
+        """Yields the row ids of each exact cover, the search goes on
+        only when the next one is requested.
+
+        :@param max_nodes: Maximum number of explored search nodes,
+            MaxIterReachedException is raised beyond it (None: no limit)
+        """
+        self.nodes = 0
+        yield from self._search([], max_nodes, observer)
+
+    def _search(self, partial: List[Hashable], max_nodes: Optional[int],
+                observer: Optional[SolverObserver]) -> Iterator[List[Hashable]]:
+        self.nodes += 1
+        if max_nodes is not None and self.nodes > max_nodes:
+            raise MaxIterReachedException(
+                f"Search stopped after {max_nodes} nodes")
+        if observer is not None:
+            observer.on_node(len(partial))
+
+        right, size = self.right, self.size
+        if right[0] == 0:
+            yield list(partial)
+            return
+
+        # Column with the fewest rows
+        header, best = right[0], size[right[0]]
+        j = right[header]
+        while j != 0 and best > 1:
+            if size[j] < best:
+                header, best = j, size[j]
+            j = right[j]
+        if best == 0:
+            return
+
+        self._cover(header)
+        i = self.down[header]
+        while i != header:
+            partial.append(self.row_of[i])
+            j = right[i]
+            while j != i:
+                self._cover(self.column[j])
+                j = right[j]
+
+            yield from self._search(partial, max_nodes, observer)
+
+            j = self.left[i]
+            while j != i:
+                self._uncover(self.column[j])
+                j = self.left[j]
+            partial.pop()
+            i = self.down[i]
+        self._uncover(header)
+
+
+def sudoku_columns(k: int, cell_value: int, order: int = 3) \
+        -> Tuple[int, int, int, int]:
+    """Exact-cover columns of the cell k holding the value"""
+    indices = cell_indices.board_indices(order)
+    size = indices.SIZE
+    cells = size * size
+    row, col = indices.COORDINATES[k]
+    arr_value = cell_value - 1
+    box = indices.BOX_OF[k]
+    return k, cells + size * row + arr_value, \
+        2 * cells + size * col + arr_value, 3 * cells + size * box + arr_value
+
+
+def sudoku_links(sudoku: SudokuChoices) -> DancingLinks:
+    """One row per remaining (cell, cell value) choice"""
+    links = DancingLinks(4 * sudoku.size * sudoku.size)
+    coordinates = cell_indices.board_indices(sudoku.order).COORDINATES
+    for k, (row, col) in enumerate(coordinates):
+        for cell_value in sudoku.get_cell_value_choices(row, col):
+            links.add_row((k, cell_value),
+                          sudoku_columns(k, cell_value, sudoku.order))
+    return links
+
+
+class DancingLinksSolver(DirectSolver):
+
+    def __init__(self, initial_sudoku: SudokuChoices,
+                 observer: Optional[SolverObserver] = None,
+                 max_nodes: Optional[int] = None):
+        """Exact-cover search over the remaining choices of the sudoku
+
+        :@param max_nodes: Maximum number of explored search nodes,
+            MaxIterReachedException is raised beyond it (None: no limit)
+        """
+        super().__init__(initial_sudoku, observer)
+        self.max_nodes = max_nodes
+        self.nodes = 0
+
+    @classmethod
+    def from_IOSudoku(cls, sudoku: IOSudoku, **kwargs) -> "DancingLinksSolver":
+        return cls(BitmaskSudokuChoices(sudoku), **kwargs)
+
+    def solve(self) -> Tuple[bool, SudokuChoices]:
+        """
+        Returns:
+            - (True, solution) if a solution was found,
+            - (False, initial_sudoku) if the sudoku is infeasible.
+        """
+        links = sudoku_links(self.sudoku)
+        try:
+            solution = next(links.solutions(self.max_nodes, self.observer), None)
+        finally:
+            self.nodes = links.nodes
+        if solution is None:
+            return False, self.sudoku
+
+        coordinates = cell_indices.board_indices(self.sudoku.order).COORDINATES
+        for k, cell_value in solution:
+            row, col = coordinates[k]
+            if self.force_set(row, col, cell_value) == ForceSetOutcome.IMPOSSIBLE:
+                raise RuntimeError(f"Inconsistent exact cover at ({row}, {col})")
+        return True, self.sudoku
@@ -0,0 +1,187 @@
+"""Generation of uniquely-solvable sudokus, graded by difficulty
+
+A sudoku is generated from a random full grid by removing clues in a
+random order, as long as the sudoku stays solvable by the techniques of
+the requested difficulty (which implies that its solution is unique), or
+as long as its solution stays unique for HARD sudokus.
+
+Generation is seeded: the same seed always gives the same sudokus,
+whatever the number of worker processes.
+"""
+import numpy as np
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from enum import IntEnum
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+from .io_sudoku import IOSudoku
+from .choices import BitmaskSudokuChoices, DirectOutcome
+from .rules import RuleBasedDirectSolver
+from .search_solver import SearchSolver
+from .stats import SolverStats
+from .vectorized_solver import VectorizedDirectSolver, candidates_from_grid, \
+    grid_from_candidates, propagate
+
+
+class Difficulty(IntEnum):
+
+    TRIVIAL = 0  # Naked singles only
+    EASY = 1  # Naked and hidden singles
+    MEDIUM = 2  # Singles and the additional rules of RuleBasedDirectSolver
+    HARD = 3  # Search is needed
+
+
+class Grade(NamedTuple):
+
+    difficulty: Difficulty
+    rules: Tuple[str, ...]  # Additional rules which made progress
+    search_nodes: int  # Search nodes needed by SearchSolver (0 if not needed)
+
+
+def random_full_grid(rng: np.random.Generator) -> np.ndarray:
+    """Fills an empty grid with random guesses and vectorized propagation"""
+    while True:
+        candidates = np.ones((81, 9), dtype=bool)
+        for k in rng.permutation(81):
+            values = np.flatnonzero(candidates[k])
+            if len(values) == 1:
+                continue
+            candidates[k] = False
+            candidates[k, rng.choice(values)] = True
+            outcome, candidates = propagate(candidates)
+            if outcome == DirectOutcome.INCONSISTENT_CHANGE:
+                break
+        else:
+            return grid_from_candidates(candidates).astype(np.uint8)
+
+
+def _solved_by_singles(grid: np.ndarray, hidden_singles: bool = True) -> bool:
+    outcome, candidates = propagate(candidates_from_grid(grid), hidden_singles)
+    return outcome == DirectOutcome.NOTHING_CHANGED \
+        and bool((candidates.sum(axis=-1) == 1).all())
+
+
+def _solved_by_rules(grid: np.ndarray, observer: SolverStats = None) -> bool:
+    choices = BitmaskSudokuChoices(IOSudoku(grid.copy()))
+    return RuleBasedDirectSolver(choices, observer).solve()[0]
+
+
+def _has_other_solution(grid: np.ndarray, row: int, col: int, value: int) -> bool:
+    """States whether the sudoku has a solution where (row, col) != value"""
+    choices = BitmaskSudokuChoices(IOSudoku(grid.copy()))
+    choices.forbid(row, col, value)
+    solver = SearchSolver(choices, direct_solver=VectorizedDirectSolver)
+    return solver.count(limit=1) > 0
+
+
+def _keeps_difficulty(grid: np.ndarray, difficulty: Optional[Difficulty],
+                      row: int, col: int, value: int) -> bool:
+    """Says whether the grid, whose cell (row, col) was just emptied,
+    is still solvable at the requested difficulty"""
+    if difficulty == Difficulty.TRIVIAL:
+        return _solved_by_singles(grid, hidden_singles=False)
+    if _solved_by_singles(grid):
+        return True
+    if difficulty == Difficulty.EASY:
+        return False
+    if difficulty == Difficulty.MEDIUM:
+        return _solved_by_rules(grid)
+    return not _has_other_solution(grid, row, col, value)
+
+
+def grade(grid: np.ndarray) -> Grade:
+    """Grades a sudoku by the techniques it needs"""
+    if _solved_by_singles(grid, hidden_singles=False):
+        return Grade(Difficulty.TRIVIAL, (), 0)
+    if _solved_by_singles(grid):
+        return Grade(Difficulty.EASY, (), 0)
+
+    stats = SolverStats()
+    solved = _solved_by_rules(grid, stats)
+    rules = tuple(
+        rule for rule, rule_stats in stats.rules.items()
+        if rule_stats["outcomes"][DirectOutcome.HAS_CHANGED]
+        and rule not in ("clean", "isolate")
+    )
+    if solved:
+        return Grade(Difficulty.MEDIUM, rules, 0)
+
+    solver = SearchSolver(BitmaskSudokuChoices(IOSudoku(grid.copy())),
+                          direct_solver=RuleBasedDirectSolver)
+    solver.solve()
+    return Grade(Difficulty.HARD, rules, solver.nodes)
+
+
+def remove_clues(grid: np.ndarray, rng: np.random.Generator,
+                 difficulty: Optional[Difficulty] = None,
+                 min_clues: int = 0) -> np.ndarray:
+    """Empties the cells of a grid (in place) in a random order, as long as
+    the sudoku stays at most as difficult as requested (see
+    ``generate_sudoku``), down to min_clues clues"""
+    clues = int((grid != IOSudoku.EMPTY_CELL).sum())
+    for k in rng.permutation(grid.size):
+        if clues <= min_clues:
+            break
+        row, col = divmod(int(k), grid.shape[1])
+        value = int(grid[row, col])
+        if value == IOSudoku.EMPTY_CELL:
+            continue
+        grid[row, col] = IOSudoku.EMPTY_CELL
+        if _keeps_difficulty(grid, difficulty, row, col, value):
+            clues -= 1
+        else:
+            grid[row, col] = value
+    return grid
+
+
+def generate_sudoku(rng: np.random.Generator,
+                    difficulty: Optional[Difficulty] = None) \
+        -> Tuple[np.ndarray, Grade]:
+    """Generates a sudoku (empty cells are IOSudoku.EMPTY_CELL) and its grade.
+
+    Clues are removed as long as the sudoku stays at most as difficult as
+    requested, and the sudoku is drawn again until it has the requested
+    difficulty. Without difficulty, clues are removed as long as the
+    solution stays unique.
+    """
+    while True:
+        grid = remove_clues(random_full_grid(rng), rng, difficulty)
+        sudoku_grade = grade(grid)
+        if difficulty is None or sudoku_grade.difficulty == difficulty:
+            return grid, sudoku_grade
+
+
+def _generate_chunk(seeds: List[np.random.SeedSequence],
+                    difficulty: Optional[Difficulty]) -> List[Tuple[np.ndarray, Grade]]:
+    return [generate_sudoku(np.random.default_rng(seed), difficulty)
+            for seed in seeds]
+
+
+def generate_sudokus(count: int, seed: Optional[int] = None,
+                     difficulty: Optional[Difficulty] = None,
+                     workers: int = 0, chunk_size: int = 8) \
+        -> Iterator[Tuple[np.ndarray, Grade]]:
+    """Yields count sudokus with their grade, in a deterministic order.
+
+    Each sudoku has its own random generator spawned from the seed,
+    so that the sudokus do not depend on the number of workers.
+
+    :@param workers: Number of processes, 0 generates in the current process
+    :@param chunk_size: Number of sudokus generated by a worker at once
+    """
+    seeds = np.random.SeedSequence(seed).spawn(count)
+    chunks = [seeds[i:i + chunk_size] for i in range(0, count, chunk_size)]
+
+    if workers == 0:
+        for chunk in chunks:
+            yield from _generate_chunk(chunk, difficulty)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(executor.submit(_generate_chunk, chunk, difficulty))
+            if len(in_flight) >= 4 * workers:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
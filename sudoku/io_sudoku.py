@@ -1,13 +1,38 @@
-"""For file interfacing"""
+"""For file interfacing
+
+numpy is only imported when an IOSudoku is built, so that the modules
+depending on this one can be imported without it.
+"""
 import os
-import numpy as np
-from typing import Union
+from functools import lru_cache
+from typing import Union, Optional
 from io import StringIO
 
+from .cell_indices import order_of_size
+
 
 SUDOKU_SAMPLES_DIRECTORY = "samples"
 EMPTY_CHARACTER = 'x'
 ALLOWED_CHARACTERS = f'123456789{EMPTY_CHARACTER}'
+# Symbol of each cell value (cell value 1 is SYMBOLS[0]), the boards of
+# order up to 3 use digits, and larger boards continue with letters
+SYMBOLS = '123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+# Cell values fit in one byte (up to len(SYMBOLS))
+GRID_DTYPE = 'uint8'
+BLANK_CHARACTERS = b' \t\r'  # Ignored within the lines of a sudoku
+
+_INVALID = 255
+
+
+@lru_cache(maxsize=None)
+def _translation(size: int) -> bytes:
+    """bytes.translate table from the characters of the boards of the
+    given size to their cell values, invalid characters give _INVALID"""
+    table = bytearray([_INVALID] * 256)
+    for value, symbol in enumerate(SYMBOLS[:size]):
+        table[ord(symbol)] = value + 1
+    table[ord(EMPTY_CHARACTER)] = IOSudoku.EMPTY_CELL
+    return bytes(table)
 
 
 class IOSudoku:
@@ -15,19 +40,26 @@ class IOSudoku:
     EMPTY_CELL = 0
     EMPTY_CELL_STR = str(EMPTY_CELL)
 
-    def __init__(self, file: Union[str, np.ndarray] = None):
+    def __init__(self, file: Union[str, bytes, "np.ndarray"] = None,
+                 order: Optional[int] = None):
         """Input-Output operations for sudokus
 
         Different possibilities for the input file:
             - If ``file`` is a single-line str, then it conveys
               the file name of a sudoku in the sample folder,
             - If ``file`` is a multi-line str, then it conveys
-              the sudoku itself,
+              the sudoku itself (as does bytes),
+            - If ``file`` is a (size, size) array, then it is the grid,
             - If ``file`` is None, then the IOSudoku is left empty.
 
         :@param file: Loads a sudoku from the file object
+        :@param order: Order of the board (3 for 9x9, 4 for 16x16...),
+            guessed from the first line of a text sudoku when None
         """
-        self.grid = np.ones((9, 9), dtype=int) * self.EMPTY_CELL
+        import numpy as np
+        self._order = order
+        size = (order or 3) ** 2
+        self.grid = np.full((size, size), self.EMPTY_CELL, dtype=GRID_DTYPE)
 
         if file is None:
             return
@@ -37,6 +69,8 @@ class IOSudoku:
                 self.load_from_file(file)
             else:
                 self.load_from_txt(file)
+        elif isinstance(file, bytes):
+            self.load_from_txt(file)
         elif isinstance(file, np.ndarray):
             self.grid = file
         else:
@@ -56,52 +90,69 @@ class IOSudoku:
 
         self.load_from_txt(txt)
 
-    def load_from_txt(self, txt: str):
-        """Loads from a str directly describing the sudoku"""
-        txt = txt.splitlines()
-
-        counter = 0
-        for idx, line in enumerate(txt):
-            if self._digest_txt_line(counter, line):
-                counter += 1
+    @property
+    def size(self) -> int:
+        """Number of cells per row, column and box"""
+        return self.grid.shape[0]
 
-            if counter >= 9:
-                break
+    @property
+    def order(self) -> int:
+        return order_of_size(self.grid.shape[0])
 
-    def _digest_txt_line(self, row: int, line: str) -> bool:
-        if line.strip() == '':
-            return False
+    def load_from_txt(self, txt: Union[str, bytes]):
+        """Loads from a str directly describing the sudoku: size lines of
+        size characters (blank lines and blanks are ignored, lines beyond
+        the size-th are ignored).
 
-        raw_characters = line.replace(" ", '')
-        characters = [c for c in line if c in ALLOWED_CHARACTERS]
-
-        if len(raw_characters) != len(characters):
-            raise RuntimeError(f"There are invalid characters: {line}")
-
-        if len(characters) != 9:
-            return RuntimeError("Invalid number of character")
-
-        for col, ch in enumerate(characters):
-            value = self.EMPTY_CELL if ch == EMPTY_CHARACTER else int(ch)
-            self.set_cell(row, col, value)
-
-        return True
+        The lines are translated to cell values by a single bytes.translate
+        and np.frombuffer call. RuntimeError is raised on malformed input.
+        """
+        import numpy as np
+        if isinstance(txt, str):
+            txt = txt.encode("ascii", errors="replace")
+        lines = (
+            line.translate(None, BLANK_CHARACTERS) for line in txt.split(b"\n"))
+        lines = [line for line in lines if line]
+
+        size = self.size if self._order is not None \
+            else len(lines[0]) if lines else 0
+        try:
+            order_of_size(size)
+        except ValueError:
+            raise RuntimeError(f"Invalid number of characters: {size}") from None
+        if len(lines) < size:
+            raise RuntimeError(f"Expected {size} lines, got {len(lines)}")
+
+        rows = lines[:size]
+        for row, line in enumerate(rows):
+            if len(line) != size:
+                raise RuntimeError(
+                    f"Invalid number of characters on line {row + 1}: {line!r}")
+        values = np.frombuffer(
+            b"".join(rows).translate(_translation(size)), dtype=np.uint8)
+        if (values == _INVALID).any():
+            invalid = next(line for line in rows
+                           if _INVALID in line.translate(_translation(size)))
+            raise RuntimeError(f"There are invalid characters: {invalid!r}")
+        self.grid = values.reshape((size, size)).copy()  # Writable
 
     def set_cell(self, row: int, col: int, value: int):
         self.grid[row, col] = value
 
     def get_cell(self, row: int, col: int) -> int:
-        return self.grid[row, col]
+        return int(self.grid[row, col])
 
     def __str__(self):
+        order, size = self.order, self.size
+        symbols = '.' + SYMBOLS[:size]
         txt = StringIO()
-        for row in range(9):
-            for col in [0, 3, 6]:
-                three_cells = map(str, self.grid[row, col:col + 3])
-                txt.write(" ".join(three_cells))
+        for row in range(size):
+            for col in range(0, size, order):
+                box_cells = [symbols[value] for value in self.grid[row, col:col + order]]
+                txt.write(" ".join(box_cells))
                 txt.write("  ")
             txt.write('\n')
-            if row in [2, 5]:
+            if row % order == order - 1 and row != size - 1:
                 txt.write('\n')
-        txt = txt.getvalue()
-        return txt.replace(self.EMPTY_CELL_STR, '.')
+        return txt.getvalue()
+
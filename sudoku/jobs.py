@@ -0,0 +1,164 @@
+"""Resumable bulk solving jobs
+
+A job solves a file in the one-line format (see ``line_io``) into an
+append-only results file, by default next to it (RESULTS_SUFFIX). The
+results are appended in the order of the input, and flushed to disk
+(a checkpoint) after each chunk, so that a job which is interrupted
+resumes after its last recorded sudoku instead of starting over.
+
+Layout of the results file (little-endian):
+    - a header of HEADER_SIZE bytes:
+        magic (4 bytes) | version (uint8) | 3 reserved bytes
+    - fixed-size records of RESULT_DTYPE, one per solved sudoku:
+        - the offset of the end of its line in the input (uint64),
+          where the job resumes,
+        - its BoardStatus (uint8),
+        - its (partial) solution, two cell values per byte
+          (see ``binary_store``).
+
+A record cut by an interruption is dropped when the job resumes.
+"""
+import os
+import struct
+from collections import deque
+from typing import Iterator, NamedTuple, Optional, TextIO, Tuple
+
+import numpy as np
+
+from .binary_store import PACKED_RECORD_SIZE, pack_grids, unpack_grids
+from .bulk import solve_bulk
+from .line_io import iter_grid_chunks, write_grids, line_to_bytes, is_content, \
+    OUTPUT_EMPTY_CHARACTER
+
+
+MAGIC = b'SDKJ'
+VERSION = 1
+HEADER_FORMAT = '<4sB3x'
+HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+RESULTS_SUFFIX = ".results"
+
+RESULT_DTYPE = np.dtype([
+    ("offset", "<u8"),
+    ("status", "u1"),
+    ("solution", "u1", (PACKED_RECORD_SIZE,)),
+])
+
+
+class JobProgress(NamedTuple):
+    resumed: int  # Sudokus already solved by the former runs
+    solved: int  # Sudokus solved by this run
+
+
+def results_path(puzzle_file: str) -> str:
+    return puzzle_file + RESULTS_SUFFIX
+
+
+def _check_header(path: str, header: bytes):
+    if len(header) != HEADER_SIZE \
+            or struct.unpack(HEADER_FORMAT, header) != (MAGIC, VERSION):
+        raise ValueError(f"{path} is not a results file (version {VERSION})")
+
+
+def _open_results(path: str) -> Tuple[int, int]:
+    """Creates the results file, or drops its cut record (if any).
+
+    Returns the number of records, and the input offset to resume from.
+    """
+    if not os.path.exists(path):
+        with open(path, "wb") as writer:
+            writer.write(struct.pack(HEADER_FORMAT, MAGIC, VERSION))
+        return 0, 0
+
+    with open(path, "r+b") as file:
+        _check_header(path, file.read(HEADER_SIZE))
+        count = (os.path.getsize(path) - HEADER_SIZE) // RESULT_DTYPE.itemsize
+        file.truncate(HEADER_SIZE + count * RESULT_DTYPE.itemsize)
+        if count == 0:
+            return 0, 0
+        file.seek(HEADER_SIZE + (count - 1) * RESULT_DTYPE.itemsize)
+        last = np.frombuffer(file.read(RESULT_DTYPE.itemsize), RESULT_DTYPE)
+        return count, int(last["offset"][0])
+
+
+def _lines_from(reader, offset: int, offsets: deque) -> Iterator[bytes]:
+    """The sudoku lines of the input from the offset, the offsets
+    of the ends of the lines are pushed to offsets"""
+    reader.seek(offset)
+    for line in reader:
+        offset += len(line)
+        raw = line_to_bytes(line)
+        if is_content(raw):
+            offsets.append(offset)
+            yield raw
+
+
+def solve_job(puzzle_file: str, results_file: Optional[str] = None,
+              workers: int = 1, chunk_size: int = 256,
+              max_nodes: Optional[int] = None) -> JobProgress:
+    """Solves the sudokus of a one-line file, resuming a former job.
+
+    :@param results_file: Defaults to the puzzle file with RESULTS_SUFFIX
+    :@param workers, chunk_size, max_nodes: See ``bulk.solve_bulk``,
+        a checkpoint is written after each chunk
+    """
+    if puzzle_file == "-":
+        raise ValueError("A job needs an input file, not stdin")
+    results_file = results_file or results_path(puzzle_file)
+    resumed, offset = _open_results(results_file)
+    if offset > os.path.getsize(puzzle_file):
+        raise ValueError(f"{results_file} goes beyond the end of {puzzle_file}")
+
+    offsets, results = deque(), list()
+    empty_line = OUTPUT_EMPTY_CHARACTER * 81
+    solved = 0
+    with open(puzzle_file, "rb") as reader, \
+            open(results_file, "ab") as writer:
+
+        def checkpoint():
+            records = np.zeros(len(results), dtype=RESULT_DTYPE)
+            records["offset"] = [end for end, _, _ in results]
+            records["status"] = [status for _, status, _ in results]
+            grids = next(iter_grid_chunks(
+                (solution or empty_line for _, _, solution in results),
+                chunk_size=len(results)))
+            records["solution"] = pack_grids(grids)
+            writer.write(records.tobytes())
+            writer.flush()
+            os.fsync(writer.fileno())
+            results.clear()
+
+        for _, status, solution in solve_bulk(
+                _lines_from(reader, offset, offsets), workers=workers,
+                chunk_size=chunk_size, ordered=True, max_nodes=max_nodes):
+            results.append((offsets.popleft(), status, solution))
+            solved += 1
+            if len(results) == chunk_size:
+                checkpoint()
+        if results:
+            checkpoint()
+
+    return JobProgress(resumed, solved)
+
+
+def read_results(results_file: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Reads the results of a job, in the order of the input.
+
+    Returns:
+        - (N,) array of the offsets of the ends of the lines in the input,
+        - (N,) array of BoardStatus values,
+        - (N, 9, 9) array of (partial) solutions.
+    """
+    with open(results_file, "rb") as reader:
+        _check_header(results_file, reader.read(HEADER_SIZE))
+        data = reader.read()
+    count = len(data) // RESULT_DTYPE.itemsize
+    records = np.frombuffer(
+        data[:count * RESULT_DTYPE.itemsize], dtype=RESULT_DTYPE)
+    return records["offset"], records["status"], unpack_grids(records["solution"])
+
+
+def export_results(results_file: str, writer: TextIO):
+    """Writes the solutions of a job one per line (see ``line_io``),
+    unreadable sudokus are reported INCONSISTENT with an empty grid"""
+    _, _, solutions = read_results(results_file)
+    write_grids(writer, solutions)
@@ -0,0 +1,115 @@
+"""Streaming reader and writer for the one-line-per-sudoku format
+
+Each sudoku is written on a single line of 81 characters, row after row.
+Empty cells are written with any of LINE_EMPTY_CHARACTERS, blank lines and
+lines starting with '#' are ignored.
+
+Lines are parsed with a single bytes.translate and np.frombuffer call,
+straight into uint8 arrays.
+"""
+import sys
+import numpy as np
+from contextlib import nullcontext
+from itertools import islice
+from typing import Iterable, Iterator, Union, TextIO
+
+from .io_sudoku import IOSudoku, EMPTY_CHARACTER
+
+
+LINE_EMPTY_CHARACTERS = f'.0{EMPTY_CHARACTER}'
+OUTPUT_EMPTY_CHARACTER = '.'
+
+_INVALID = 255
+_TRANSLATION = bytearray([_INVALID] * 256)
+for _value in range(1, 10):
+    _TRANSLATION[ord(str(_value))] = _value
+for _ch in LINE_EMPTY_CHARACTERS:
+    _TRANSLATION[ord(_ch)] = IOSudoku.EMPTY_CELL
+_TRANSLATION = bytes(_TRANSLATION)
+
+_OUTPUT_SYMBOLS = np.frombuffer(
+    (OUTPUT_EMPTY_CHARACTER + '123456789').encode(), dtype=np.uint8)
+
+Line = Union[str, bytes]
+
+
+def line_to_bytes(line: Line) -> bytes:
+    """The stripped bytes of a line (non-ASCII characters are replaced)"""
+    if isinstance(line, str):
+        line = line.encode("ascii", errors="replace")
+    return line.strip()
+
+
+def is_content(line: Line) -> bool:
+    """Whether the line holds a sudoku, rather than being blank
+    or a comment"""
+    raw = line_to_bytes(line)
+    return bool(raw) and not raw.startswith(b'#')
+
+
+def _translate(raw: bytes) -> np.ndarray:
+    values = np.frombuffer(raw.translate(_TRANSLATION), dtype=np.uint8)
+    if (values == _INVALID).any():
+        raise ValueError(f"There are invalid characters: {raw!r}")
+    return values
+
+
+def parse_line(line: Line) -> np.ndarray:
+    """Reads a single line into a (9, 9) uint8 grid"""
+    raw = line_to_bytes(line)
+    if len(raw) != 81:
+        raise ValueError(f"Expected 81 characters, got {len(raw)}: {raw!r}")
+    return _translate(raw).reshape((9, 9))
+
+
+def format_grid(grid: np.ndarray) -> str:
+    """Writes a (9, 9) grid on a single line"""
+    return _OUTPUT_SYMBOLS[np.asarray(grid).reshape(81)].tobytes().decode()
+
+
+def iter_grid_chunks(lines: Iterable[Line], chunk_size: int = 4096) \
+        -> Iterator[np.ndarray]:
+    """Lazily reads the lines into (n, 9, 9) uint8 arrays of at most
+    chunk_size sudokus, parsing each chunk at once"""
+    contents = (raw for raw in map(line_to_bytes, lines) if is_content(raw))
+    while True:
+        chunk = list(islice(contents, chunk_size))
+        if not chunk:
+            return
+        for raw in chunk:
+            if len(raw) != 81:
+                raise ValueError(
+                    f"Expected 81 characters, got {len(raw)}: {raw!r}")
+        yield _translate(b''.join(chunk)).reshape((len(chunk), 9, 9))
+
+
+def iter_grids(lines: Iterable[Line]) -> Iterator[np.ndarray]:
+    """Lazily reads the lines into (9, 9) uint8 grids"""
+    for chunk in iter_grid_chunks(lines):
+        yield from chunk
+
+
+def read_grids(path: str) -> Iterator[np.ndarray]:
+    """Lazily reads the sudokus of a file, '-' reads stdin"""
+    if path == "-":
+        yield from iter_grids(sys.stdin.buffer)
+        return
+    with open(path, "rb") as reader:
+        yield from iter_grids(reader)
+
+
+def open_or_std(path: str, mode: str):
+    """Opens the file, or wraps stdin/stdout (left open) for '-'"""
+    if path == "-":
+        return nullcontext(sys.stdin if "r" in mode else sys.stdout)
+    return open(path, mode)
+
+
+def write_grids(writer: TextIO, grids: Iterable[np.ndarray]):
+    """Writes the sudokus one per line, grids may also be (n, 9, 9) arrays"""
+    for grid in grids:
+        grid = np.asarray(grid)
+        if grid.ndim == 3:
+            writer.writelines(format_grid(g) + "\n" for g in grid)
+        else:
+            writer.write(format_grid(grid) + "\n")
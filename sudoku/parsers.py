@@ -1,4 +1,5 @@
-from argparse import ArgumentParser
+import os
+from argparse import ArgumentParser, Namespace
 
 def get_single_sudoku_file(description=None) -> str:
 
@@ -12,3 +13,73 @@ def get_single_sudoku_file(description=None) -> str:
 
     sudoku_file = args.sudoku_file
     return sudoku_file
+
+
+def get_bulk_arguments(description=None) -> Namespace:
+
+    parser = ArgumentParser(description=description)
+
+    parser.add_argument(
+        "puzzle_file",
+        help="one sudoku of 81 characters per line, '-' for stdin")
+    parser.add_argument(
+        "-o", "--output", default="-",
+        help="where to write the solutions, '-' for stdout")
+    parser.add_argument(
+        "-w", "--workers", type=int, default=os.cpu_count(),
+        help="number of processes, 0 to solve in the current process")
+    parser.add_argument(
+        "-c", "--chunk-size", type=int, default=256,
+        help="number of sudokus sent to a worker at once")
+    parser.add_argument(
+        "--unordered", action="store_true",
+        help="write the solutions as soon as they are available, "
+             "prefixed with the index of their line")
+    parser.add_argument(
+        "--max-nodes", type=int, default=None,
+        help="search budget per sudoku")
+    parser.add_argument(
+        "--job", action="store_true",
+        help="records the results to a results file, with checkpoints, "
+             "and resumes from it when it already exists")
+    parser.add_argument(
+        "--results", default=None,
+        help="results file of --job (default: the puzzle file + '.results')")
+
+    return parser.parse_args()
+
+
+def get_conversion_arguments(description=None) -> Namespace:
+
+    parser = ArgumentParser(description=description)
+
+    parser.add_argument(
+        "source", help="a .sudoku file, or one sudoku of 81 characters per line")
+    parser.add_argument("store", help="binary store to create")
+    parser.add_argument(
+        "--packed", action="store_true",
+        help="stores two cells per byte (no zero-copy access)")
+
+    return parser.parse_args()
+
+
+def get_generation_arguments(description=None) -> Namespace:
+
+    parser = ArgumentParser(description=description)
+
+    parser.add_argument("count", type=int, help="number of sudokus")
+    parser.add_argument(
+        "-o", "--output", default="-",
+        help="where to write the sudokus (one per line), '-' for stdout")
+    parser.add_argument("-s", "--seed", type=int, default=None)
+    parser.add_argument(
+        "-d", "--difficulty", default=None,
+        choices=["trivial", "easy", "medium", "hard"])
+    parser.add_argument(
+        "-w", "--workers", type=int, default=os.cpu_count(),
+        help="number of processes, 0 to generate in the current process")
+    parser.add_argument(
+        "-c", "--chunk-size", type=int, default=8,
+        help="number of sudokus generated by a worker at once")
+
+    return parser.parse_args()
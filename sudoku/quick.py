@@ -0,0 +1,75 @@
+"""Solving single sudokus without numpy
+
+For short-lived processes, where importing numpy costs more than solving
+one sudoku: the sudoku is read into flat cell values, solved on bitmask
+choices by DancingLinksSolver (the fastest single-sudoku solver, see the
+benchmarks), and written back on one line. Only the standard library
+is imported.
+
+Usage (from project's root):
+    python -m sudoku.quick [sudoku ...]
+solves the sudokus given on the command line, or one per line of stdin.
+"""
+import sys
+from typing import List, Optional, Sequence, Tuple
+
+from .io_sudoku import IOSudoku, SYMBOLS, EMPTY_CHARACTER
+from .choices import BitmaskSudokuChoices
+from .dlx_solver import DancingLinksSolver
+from .cell_indices import order_of_size
+
+
+EMPTY_CHARACTERS = f'.0{EMPTY_CHARACTER}'
+OUTPUT_EMPTY_CHARACTER = '.'
+
+
+def parse_values(txt: str) -> Tuple[List[int], int]:
+    """Reads a sudoku written on one line, or as in the sudoku files
+    (blanks are ignored, empty cells are any of EMPTY_CHARACTERS).
+
+    Returns the flat cell values and the order of the board.
+    """
+    characters = "".join(txt.split())
+    size = round(len(characters) ** 0.5)
+    if size * size != len(characters):
+        raise ValueError(f"Expected size * size characters, got {len(characters)}")
+    order = order_of_size(size)
+
+    symbols = {symbol: value + 1 for value, symbol in enumerate(SYMBOLS[:size])}
+    symbols.update((ch, IOSudoku.EMPTY_CELL) for ch in EMPTY_CHARACTERS)
+    try:
+        return [symbols[ch] for ch in characters], order
+    except KeyError as error:
+        raise ValueError(f"There are invalid characters: {error}") from None
+
+
+def format_values(values: Sequence[int]) -> str:
+    """Writes flat cell values on one line"""
+    symbols = OUTPUT_EMPTY_CHARACTER + SYMBOLS
+    return "".join(symbols[value] for value in values)
+
+
+def solve_values(values: Sequence[int], order: int = 3,
+                 max_nodes: Optional[int] = None) -> Optional[List[int]]:
+    """Returns the solved flat cell values, None if the sudoku is infeasible
+
+    :@param max_nodes: Search budget, see DancingLinksSolver
+    """
+    choices = BitmaskSudokuChoices.from_values(values, order)
+    solved, choices = DancingLinksSolver(choices, max_nodes=max_nodes).solve()
+    return choices.to_values() if solved else None
+
+
+def solve(txt: str, max_nodes: Optional[int] = None) -> Optional[str]:
+    """Returns the solution of the sudoku on one line,
+    None if the sudoku is infeasible (see parse_values for the input)"""
+    values, order = parse_values(txt)
+    solution = solve_values(values, order, max_nodes)
+    return format_values(solution) if solution is not None else None
+
+
+if __name__ == "__main__":
+    sudokus = sys.argv[1:] or (line for line in sys.stdin if line.strip())
+    for sudoku in sudokus:
+        solution = solve(sudoku)
+        print(solution if solution is not None else "infeasible")
@@ -0,0 +1,356 @@
+"""Additional direct rules, on top of naked and hidden singles
+
+Each rule is applied once over the whole board by ``apply`` and returns
+a DirectOutcome, like the clean/isolate steps of GroupBasedDirectSolver.
+Rules only forbid values, through the solver, so that observers and
+worklists see their changes.
+
+The unit-based rules work on the groups of the groupings of the solver
+(see ``GroupBasedDirectSolver``), so that they also apply to the groups
+of the variants.
+"""
+from functools import lru_cache
+from itertools import combinations
+from typing import List, Sequence, Tuple, Type, Optional, Union
+
+from .choices import SudokuChoices, ForbidOutcome, DirectOutcome
+from .direct_solver import DirectSolver, GroupBasedDirectSolver
+from .cell_groups import Grouping, RowGrouping, ColumnGrouping, \
+    GROUPINGS_CACHE_SIZE
+from .stats import SolverObserver
+from . import cell_indices
+
+
+def _cell_masks(sudoku: SudokuChoices) -> List[int]:
+    """Candidate mask of each cell, bit (cell_value - 1) set
+    iff cell_value is allowed"""
+    masks = list()
+    for row, col in cell_indices.board_indices(sudoku.order).COORDINATES:
+        mask = 0
+        for cell_value in sudoku.get_cell_value_choices(row, col):
+            mask |= 1 << (cell_value - 1)
+        masks.append(mask)
+    return masks
+
+
+def _values(mask: int) -> List[int]:
+    return [v for v in range(1, mask.bit_length() + 1) if mask & (1 << (v - 1))]
+
+
+def _units(solver: GroupBasedDirectSolver) -> Tuple[Tuple[int, ...], ...]:
+    """The groups of all the groupings of the solver, as flat cell indices"""
+    return _units_of(solver.groupings)
+
+
+@lru_cache(maxsize=GROUPINGS_CACHE_SIZE)
+def _units_of(groupings: Tuple[Type[Grouping], ...]) \
+        -> Tuple[Tuple[int, ...], ...]:
+    return tuple(unit for grouping in groupings for unit in grouping.UNITS)
+
+
+class Rule:
+
+    name = None
+
+    def apply(self, solver: DirectSolver) -> DirectOutcome:
+        raise NotImplementedError
+
+    @staticmethod
+    def forbid_all(solver: DirectSolver, cells: Sequence[int], mask: int) \
+            -> DirectOutcome:
+        """Forbids the values of mask in all the cells (flat indices)"""
+        outcome = DirectOutcome.NOTHING_CHANGED
+        coordinates = cell_indices.board_indices(solver.sudoku.order).COORDINATES
+        for k in cells:
+            row, col = coordinates[k]
+            for cell_value in _values(mask):
+                forbid_outcome = solver.forbid(row, col, cell_value)
+                if forbid_outcome == ForbidOutcome.LEFT_EMPTY_HANDED:
+                    return DirectOutcome.INCONSISTENT_CHANGE
+                if forbid_outcome == ForbidOutcome.USEFUL:
+                    outcome = DirectOutcome.HAS_CHANGED
+        return outcome
+
+
+class NakedSubsetRule(Rule):
+    """If n cells of a unit only allow n values altogether,
+    these values are forbidden in the other cells of the unit"""
+
+    NAMES = {2: "naked_pairs", 3: "naked_triples", 4: "naked_quads"}
+
+    def __init__(self, size: int):
+        self.size = size
+        self.name = self.NAMES[size]
+
+    def apply(self, solver: DirectSolver) -> DirectOutcome:
+        masks = _cell_masks(solver.sudoku)
+        outcome = DirectOutcome.NOTHING_CHANGED
+        for unit in _units(solver):
+            candidates = [
+                k for k in unit
+                if 2 <= bin(masks[k]).count('1') <= self.size
+            ]
+            for subset in combinations(candidates, self.size):
+                union = 0
+                for k in subset:
+                    union |= masks[k]
+                if bin(union).count('1') != self.size:
+                    continue
+                others = [k for k in unit if k not in subset]
+                sub_outcome = self.forbid_all(solver, others, union)
+                if sub_outcome == DirectOutcome.INCONSISTENT_CHANGE:
+                    return sub_outcome
+                if sub_outcome == DirectOutcome.HAS_CHANGED:
+                    outcome = sub_outcome
+        return outcome
+
+
+class HiddenSubsetRule(Rule):
+    """If n values of a unit can only be in n cells altogether,
+    the other values are forbidden in these cells"""
+
+    NAMES = {2: "hidden_pairs", 3: "hidden_triples", 4: "hidden_quads"}
+
+    def __init__(self, size: int):
+        self.size = size
+        self.name = self.NAMES[size]
+
+    def apply(self, solver: DirectSolver) -> DirectOutcome:
+        masks = _cell_masks(solver.sudoku)
+        size = solver.sudoku.size
+        outcome = DirectOutcome.NOTHING_CHANGED
+        for unit in _units(solver):
+            # places[v]: bit i set iff the value v can be in the cell unit[i]
+            places = dict()
+            for cell_value in range(1, size + 1):
+                bit = 1 << (cell_value - 1)
+                place = sum(1 << i for i, k in enumerate(unit) if masks[k] & bit)
+                if 2 <= bin(place).count('1') <= self.size:
+                    places[cell_value] = place
+            for subset in combinations(places, self.size):
+                union = 0
+                for cell_value in subset:
+                    union |= places[cell_value]
+                if bin(union).count('1') != self.size:
+                    continue
+                kept = sum(1 << (cell_value - 1) for cell_value in subset)
+                cells = [k for i, k in enumerate(unit) if union & (1 << i)]
+                full_mask = (1 << size) - 1
+                sub_outcome = self.forbid_all(solver, cells, full_mask & ~kept)
+                if sub_outcome == DirectOutcome.INCONSISTENT_CHANGE:
+                    return sub_outcome
+                if sub_outcome == DirectOutcome.HAS_CHANGED:
+                    outcome = sub_outcome
+        return outcome
+
+
+class _BoxLineRule(Rule):
+    """If the cells of a source unit allowing a value all lie in a
+    target unit, the value is forbidden in the rest of the target unit
+
+    The lines are the groups of the row and column groupings, the boxes
+    are the groups of the other groupings (boxes, jigsaw regions...).
+    Sources and targets sharing at least 2 cells are paired once
+    per set of groupings.
+    """
+
+    def __init__(self):
+        self._pairs = lru_cache(maxsize=GROUPINGS_CACHE_SIZE)(self._pairs_of)
+
+    def source_and_targets(self, lines: Sequence[Sequence[int]],
+                           boxes: Sequence[Sequence[int]]) \
+            -> List[Tuple[Sequence[int], List[Sequence[int]]]]:
+        raise NotImplementedError
+
+    @staticmethod
+    def _overlap(first: Sequence[int], second: Sequence[int]) -> bool:
+        return len(set(first) & set(second)) >= 2
+
+    def _pairs_of(self, groupings: Tuple[Type[Grouping], ...]) \
+            -> List[Tuple[Sequence[int], List[Sequence[int]]]]:
+        lines, boxes = list(), list()
+        for grouping in groupings:
+            is_line = issubclass(grouping, (RowGrouping, ColumnGrouping))
+            (lines if is_line else boxes).extend(grouping.UNITS)
+        return self.source_and_targets(lines, boxes)
+
+    def apply(self, solver: GroupBasedDirectSolver) -> DirectOutcome:
+        masks = _cell_masks(solver.sudoku)
+        outcome = DirectOutcome.NOTHING_CHANGED
+        for source, targets in self._pairs(solver.groupings):
+            for cell_value in range(1, solver.sudoku.size + 1):
+                bit = 1 << (cell_value - 1)
+                cells = [k for k in source if masks[k] & bit]
+                if len(cells) < 2:
+                    continue
+                for target in targets:
+                    if all(k in target for k in cells):
+                        others = [k for k in target if k not in source]
+                        sub_outcome = self.forbid_all(solver, others, bit)
+                        if sub_outcome == DirectOutcome.INCONSISTENT_CHANGE:
+                            return sub_outcome
+                        if sub_outcome == DirectOutcome.HAS_CHANGED:
+                            outcome = sub_outcome
+        return outcome
+
+
+class PointingRule(_BoxLineRule):
+    """Box to row/column: a value confined to one line within a box
+    is forbidden in the rest of that line"""
+
+    name = "pointing"
+
+    def source_and_targets(self, lines, boxes):
+        return [
+            (box, [line for line in lines if self._overlap(line, box)])
+            for box in boxes
+        ]
+
+
+class ClaimingRule(_BoxLineRule):
+    """Row/column to box: a value confined to one box within a line
+    is forbidden in the rest of that box"""
+
+    name = "claiming"
+
+    def source_and_targets(self, lines, boxes):
+        return [
+            (line, [box for box in boxes if self._overlap(line, box)])
+            for line in lines
+        ]
+
+
+class KillerCageRule(Rule):
+    """Killer sudoku cages: the cells of a cage hold distinct values,
+    which add up to the sum of the cage. The values which appear in no
+    such assignment of a cage, given the choices of its cells, are
+    forbidden.
+
+    Not part of ALL_RULES, as it depends on the cages of the sudoku.
+    """
+
+    name = "killer_cages"
+
+    def __init__(self, cages: Sequence[Tuple[int, Sequence[Tuple[int, int]]]]):
+        """:@param cages: (sum, cells coordinates) of each cage"""
+        self.cages = tuple((total, tuple(cells)) for total, cells in cages)
+        self._value_sets = dict()
+
+    def value_sets(self, size: int, nb_cells: int, total: int) -> frozenset:
+        """Masks of the sets of nb_cells distinct values among 1 to size
+        adding up to total, computed once per cage shape"""
+        key = size, nb_cells, total
+        if key not in self._value_sets:
+            self._value_sets[key] = frozenset(
+                sum(1 << (v - 1) for v in values)
+                for values in combinations(range(1, size + 1), nb_cells)
+                if sum(values) == total
+            )
+        return self._value_sets[key]
+
+    def apply(self, solver: DirectSolver) -> DirectOutcome:
+        sudoku = solver.sudoku
+        outcome = DirectOutcome.NOTHING_CHANGED
+        for total, cells in self.cages:
+            masks = list()
+            for row, col in cells:
+                mask = 0
+                for cell_value in sudoku.get_cell_value_choices(row, col):
+                    mask |= 1 << (cell_value - 1)
+                masks.append(mask)
+            allowed = self._allowed_values(
+                masks, self.value_sets(sudoku.size, len(cells), total))
+
+            for (row, col), mask, allowed_mask in zip(cells, masks, allowed):
+                if not allowed_mask:
+                    return DirectOutcome.INCONSISTENT_CHANGE
+                k = sudoku.size * row + col
+                sub_outcome = self.forbid_all(solver, [k], mask & ~allowed_mask)
+                if sub_outcome == DirectOutcome.INCONSISTENT_CHANGE:
+                    return sub_outcome
+                if sub_outcome == DirectOutcome.HAS_CHANGED:
+                    outcome = sub_outcome
+        return outcome
+
+    @staticmethod
+    def _allowed_values(masks: List[int], value_sets: frozenset) -> List[int]:
+        """Mask of the values of each cell appearing in a valid assignment.
+
+        reachable[i] holds the sets of values (as masks) which the first
+        i cells can take, then only the sets leading to one of the
+        value sets are kept, from the last cell to the first one.
+        """
+        union = 0
+        for value_set in value_sets:
+            union |= value_set
+        reachable = [{0}]
+        for mask in masks:
+            reachable.append({
+                used | bit
+                for used in reachable[-1]
+                for bit in _bits(mask & union & ~used)
+            })
+
+        allowed = [0] * len(masks)
+        leading = reachable[-1] & value_sets
+        for i in range(len(masks) - 1, -1, -1):
+            previous = set()
+            for used in reachable[i]:
+                for bit in _bits(masks[i] & union & ~used):
+                    if used | bit in leading:
+                        previous.add(used)
+                        allowed[i] |= bit
+            leading = previous
+        return allowed
+
+
+def _bits(mask: int) -> List[int]:
+    bits = list()
+    while mask:
+        bit = mask & -mask
+        bits.append(bit)
+        mask ^= bit
+    return bits
+
+
+ALL_RULES = (
+    PointingRule(),
+    ClaimingRule(),
+    NakedSubsetRule(2),
+    HiddenSubsetRule(2),
+    NakedSubsetRule(3),
+    HiddenSubsetRule(3),
+    NakedSubsetRule(4),
+    HiddenSubsetRule(4),
+)
+RULES = {rule.name: rule for rule in ALL_RULES}
+
+
+class RuleBasedDirectSolver(GroupBasedDirectSolver):
+
+    def __init__(self, initial_sudoku: SudokuChoices,
+                 observer: Optional[SolverObserver] = None,
+                 rules: Sequence[Union[str, Rule]] = ALL_RULES,
+                 groupings: Optional[Sequence[Type[Grouping]]] = None):
+        """Naked and hidden singles, then the additional rules in order:
+        as soon as one of them changes something, the singles are
+        propagated again before going back to the first rule.
+
+        :@param rules: Rules (or rule names, see RULES) to apply
+        :@param groupings: See GroupBasedDirectSolver
+        """
+        super().__init__(initial_sudoku, observer, groupings)
+        self.rules = tuple(RULES[rule] if isinstance(rule, str) else rule
+                           for rule in rules)
+
+    def propagate(self) -> DirectOutcome:
+        while True:
+            outcome = super().propagate()
+            if outcome == DirectOutcome.INCONSISTENT_CHANGE:
+                return outcome
+            for rule in self.rules:
+                outcome = self.run_rule(rule.name, rule.apply, self)
+                if outcome != DirectOutcome.NOTHING_CHANGED:
+                    break
+            if outcome != DirectOutcome.HAS_CHANGED:
+                return outcome
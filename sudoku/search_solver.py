@@ -0,0 +1,133 @@
+"""Backtracking search on top of the direct solvers"""
+from typing import Iterator, Tuple, Type, Optional
+
+from .io_sudoku import IOSudoku
+from .choices import SudokuChoices, BitmaskSudokuChoices, \
+    ForceSetOutcome, DirectOutcome
+from .direct_solver import DirectSolver, GroupBasedDirectSolver
+from .exceptions import MaxIterReachedException
+from .stats import SolverObserver
+
+
+class SearchSolver(DirectSolver):
+
+    def __init__(self, initial_sudoku: SudokuChoices,
+                 max_nodes: Optional[int] = None,
+                 direct_solver: Type[DirectSolver] = GroupBasedDirectSolver,
+                 observer: Optional[SolverObserver] = None):
+        """Depth-first search with propagation after each guess
+
+        The branching cell is the one with the minimum remaining values.
+        Guesses are undone with the snapshot/restore mechanism of the choices.
+
+        :@param max_nodes: Maximum number of explored search nodes,
+            MaxIterReachedException is raised beyond it (None: no limit)
+        :@param direct_solver: Direct solver used for the propagation
+        :@param observer: Observer of the search and of the propagation
+        """
+        super().__init__(initial_sudoku, observer)
+        self.max_nodes = max_nodes
+        self.propagator = direct_solver(initial_sudoku, observer)
+        self.nodes = 0
+
+    def solve(self) -> Tuple[bool, SudokuChoices]:
+        """
+        Returns:
+            - (True, solution) if a solution was found,
+            - (False, partial_solution) if the sudoku is infeasible.
+
+        The choices are restored when MaxIterReachedException is raised.
+        """
+        self.nodes = 0
+        token = self.sudoku.snapshot()
+        search = self._solutions(0)
+        try:
+            found = next(search, False) is None
+        except Exception:
+            self.sudoku.restore(token)
+            raise
+        if found:
+            search.close()  # The choices are left on the solution
+            self.sudoku.release(token)
+            return True, self.sudoku
+        self.sudoku.restore(token)
+        return False, self.sudoku
+
+    def count(self, limit: Optional[int] = None) -> int:
+        """Counts the solutions, up to limit (None: no limit),
+        the choices are left unchanged"""
+        self.nodes = 0
+        token = self.sudoku.snapshot()
+        count = 0
+        try:
+            for _ in self._solutions(0):
+                count += 1
+                if limit is not None and count >= limit:
+                    break
+        finally:
+            self.sudoku.restore(token)
+        return count
+
+    def _solutions(self, depth: int) -> Iterator[None]:
+        """Yields each time the choices describe a solution,
+        the search goes on only when the next one is requested"""
+        self.nodes += 1
+        if self.observer is not None:
+            self.observer.on_node(depth)
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise MaxIterReachedException(
+                f"Search stopped after {self.max_nodes} nodes")
+
+        if self.propagator.propagate() == DirectOutcome.INCONSISTENT_CHANGE:
+            return
+
+        cell = self.select_cell()
+        if cell is None:
+            if self.propagator.is_solved():
+                yield
+            return
+
+        row, col = cell
+        for cell_value in self.sudoku.get_cell_value_choices(row, col):
+            token = self.sudoku.snapshot()
+            if self.propagator.force_set(row, col, cell_value) != ForceSetOutcome.IMPOSSIBLE:
+                yield from self._solutions(depth + 1)
+            self.sudoku.restore(token)
+
+    def select_cell(self) -> Optional[Tuple[int, int]]:
+        """Returns the undecided cell with the fewest choices,
+        or None if all the cells are final"""
+        size = self.sudoku.size
+        best, best_count = None, size + 1
+        for row in range(size):
+            for col in range(size):
+                count = self.sudoku.number_of_choices(row, col)
+                if 1 < count < best_count:
+                    best, best_count = (row, col), count
+                    if count == 2:
+                        return best
+        return best
+
+
+def count_solutions(sudoku: IOSudoku, limit: Optional[int] = 2,
+                    max_nodes: Optional[int] = None,
+                    choices_class: Type[SudokuChoices] = BitmaskSudokuChoices,
+                    direct_solver: Optional[Type[DirectSolver]] = None) -> int:
+    """Counts the solutions of the sudoku, and stops as soon as
+    limit solutions are found (None: counts them all)
+
+    :@param direct_solver: Propagation of the search
+        (default: VectorizedDirectSolver)
+    """
+    if direct_solver is None:
+        from .vectorized_solver import VectorizedDirectSolver
+        direct_solver = VectorizedDirectSolver
+    solver = SearchSolver(choices_class(sudoku), max_nodes=max_nodes,
+                          direct_solver=direct_solver)
+    return solver.count(limit)
+
+
+def has_unique_solution(sudoku: IOSudoku, **kwargs) -> bool:
+    """States whether the sudoku has exactly one solution,
+    see count_solutions for the keyword arguments"""
+    return count_solutions(sudoku, limit=2, **kwargs) == 1
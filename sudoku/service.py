@@ -0,0 +1,285 @@
+"""Solving sudokus for asyncio applications
+
+``AsyncSolver`` queues the sudokus submitted by concurrent coroutines,
+coalesces them into micro-batches, and solves the batches in a pool of
+processes, so that the event loop is never blocked by a solve.
+
+Usage (from project's root):
+    python -m sudoku.service [port]
+serves the sudokus of a line protocol on localhost (see ``start_server``):
+one sudoku per line in, one "<status> <solution>" line out.
+"""
+import asyncio
+import sys
+from concurrent.futures import Executor, ProcessPoolExecutor, \
+    ThreadPoolExecutor
+from typing import Callable, List, Optional, Tuple, Type
+
+from .quick import parse_values, format_values
+from .choices import BitmaskSudokuChoices
+from .direct_solver import DirectSolver, GroupBasedDirectSolver
+from .search_solver import SearchSolver
+from .batch_solver import BoardStatus
+from .bulk import solve_chunk
+from .exceptions import SudokuException, MaxIterReachedException
+
+
+class SolverOverloadedException(SudokuException):
+    """Raised when a sudoku is submitted without waiting to a full queue"""
+    pass
+
+
+ChunkSolver = Callable[[List[str]], List[Tuple[int, str]]]
+
+
+def search_chunk(lines: List[str], max_nodes: Optional[int] = None,
+                 direct_solver: Type[DirectSolver] = GroupBasedDirectSolver) \
+        -> List[Tuple[int, str]]:
+    """Solves one-line sudokus one by one with a SearchSolver,
+    same results as ``bulk.solve_chunk``.
+
+    :@param direct_solver: Direct solver used for the propagation
+    """
+    results = list()
+    for line in lines:
+        try:
+            values, order = parse_values(line)
+        except ValueError:
+            results.append((int(BoardStatus.INCONSISTENT), ""))
+            continue
+        choices = BitmaskSudokuChoices.from_values(values, order)
+        try:
+            solved, choices = SearchSolver(
+                choices, max_nodes=max_nodes,
+                direct_solver=direct_solver).solve()
+        except MaxIterReachedException:
+            results.append((int(BoardStatus.STALLED), format_values(values)))
+            continue
+        status = BoardStatus.SOLVED if solved else BoardStatus.INCONSISTENT
+        results.append((int(status), format_values(choices.to_values())))
+    return results
+
+
+class AsyncSolver:
+
+    def __init__(self, workers: int = 1, max_batch: int = 64,
+                 max_delay: float = 0.002, max_queue: int = 1024,
+                 timeout: Optional[float] = None,
+                 solve_chunk: ChunkSolver = solve_chunk):
+        """Solves the sudokus of concurrent coroutines in micro-batches
+
+        A batch is sent to the pool as soon as it holds max_batch sudokus,
+        or max_delay seconds after its first sudoku. At most one batch per
+        worker is in flight: the others wait in the queue, and submitting
+        to a full queue waits for room (or fails, see ``solve``).
+
+        :@param workers: Number of processes, 0 solves the batches
+            in a thread of the current process
+        :@param max_batch: Maximum number of sudokus per batch
+        :@param max_delay: Maximum waiting time (s) for a batch to fill up
+        :@param max_queue: Maximum number of queued sudokus
+        :@param timeout: Default time limit (s) per sudoku, None: no limit
+        :@param solve_chunk: Picklable function solving a list of one-line
+            sudokus into (status, solution line) pairs, such as
+            ``bulk.solve_chunk`` (vectorized propagation, then search)
+            or ``search_chunk`` (bound to a direct solver with
+            ``functools.partial``)
+        """
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.solve_chunk = solve_chunk
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._executor: Optional[Executor] = None
+        self._batcher: Optional[asyncio.Task] = None
+        self._in_flight = set()
+
+    async def start(self):
+        """Starts the pool and the batching task, in the running loop"""
+        if self._batcher is not None:
+            return
+        self._queue = asyncio.Queue(self.max_queue)
+        if self.workers == 0:
+            self._executor = ThreadPoolExecutor(max_workers=1)
+        else:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        self._slots = asyncio.Semaphore(max(self.workers, 1))
+        self._batcher = asyncio.create_task(self._run())
+
+    async def close(self):
+        """Finishes the batches in flight, cancels the queued sudokus
+        and shuts the pool down"""
+        if self._batcher is None:
+            return
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+        if self._in_flight:
+            await asyncio.wait(self._in_flight)
+        while not self._queue.empty():
+            _, future = self._queue.get_nowait()
+            future.cancel()
+        self._executor.shutdown(wait=True)
+        self._batcher = None
+
+    async def __aenter__(self) -> "AsyncSolver":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def queued(self) -> int:
+        """Number of sudokus waiting for a batch"""
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def solve(self, line: str, timeout: Optional[float] = None,
+                    wait: bool = True) -> Tuple[int, str]:
+        """Solves a one-line sudoku, see ``quick.parse_values``
+
+        :@param timeout: Time limit (s) on queuing and solving,
+            defaults to the solver's, asyncio.TimeoutError is raised beyond
+            it. A sudoku whose batch is already sent is not interrupted:
+            bound the search with max_nodes instead.
+        :@param wait: Waits for room when the queue is full, otherwise
+            raises SolverOverloadedException
+
+        Returns the (BoardStatus, solution line) pair.
+        """
+        if self._batcher is None:
+            raise RuntimeError("The solver is not started")
+        timeout = self.timeout if timeout is None else timeout
+        future = asyncio.get_running_loop().create_future()
+        if not wait:
+            try:
+                self._queue.put_nowait((line, future))
+            except asyncio.QueueFull:
+                raise SolverOverloadedException(
+                    f"{self.max_queue} sudokus are already queued") from None
+            return await asyncio.wait_for(future, timeout)
+        return await asyncio.wait_for(
+            self._submit(line, future), timeout)
+
+    async def _submit(self, line: str, future: asyncio.Future):
+        try:
+            await self._queue.put((line, future))
+            return await future
+        finally:
+            future.cancel()  # No effect once the result is set
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = list()
+            try:
+                # Waiting for a free worker first lets the batch fill up
+                await self._slots.acquire()
+                batch.append(await self._queue.get())
+                deadline = loop.time() + self.max_delay
+                while len(batch) < self.max_batch:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(
+                            self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+            except asyncio.CancelledError:
+                # Closing: the sudokus already taken from the queue
+                # are cancelled, as the queued ones
+                for _, future in batch:
+                    future.cancel()
+                raise
+
+            # Timed out or cancelled sudokus are not worth solving
+            batch = [(line, future) for line, future in batch
+                     if not future.done()]
+            if not batch:
+                self._slots.release()
+                continue
+            task = asyncio.create_task(self._solve_batch(batch))
+            self._in_flight.add(task)
+            task.add_done_callback(self._in_flight.discard)
+
+    async def _solve_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                self._executor, self.solve_chunk, [line for line, _ in batch])
+        except Exception as error:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+        finally:
+            self._slots.release()
+
+
+async def start_server(solver: AsyncSolver, host: str = "127.0.0.1",
+                       port: int = 0) -> asyncio.AbstractServer:
+    """Serves a line protocol on top of a started solver (port 0: any free
+    port, see ``server.sockets``): each line holds a sudoku, and is
+    answered by a line "<status> <solution>", where the status is a
+    BoardStatus name, TIMEOUT, OVERLOADED or ERROR (the solver failed,
+    eg a worker crashed, or was closed). Answers follow the order of
+    the requests of a connection."""
+
+    async def answer(line: str) -> str:
+        try:
+            status, solution = await solver.solve(line, wait=False)
+        except asyncio.TimeoutError:
+            return "TIMEOUT"
+        except SolverOverloadedException:
+            return "OVERLOADED"
+        except (Exception, asyncio.CancelledError):
+            return "ERROR"  # Also cancelled by the closing of the solver
+        return f"{BoardStatus(status).name} {solution}".rstrip()
+
+    async def handle(reader: asyncio.StreamReader,
+                     writer: asyncio.StreamWriter):
+        answers = asyncio.Queue(solver.max_batch)  # Unread answers
+
+        async def write_answers():
+            while True:
+                answer_task = await answers.get()
+                if answer_task is None:
+                    return
+                line = await answer_task
+                try:
+                    writer.write((line + "\n").encode())
+                    await writer.drain()
+                except ConnectionError:
+                    pass  # The queue keeps being emptied until the end
+
+        writer_task = asyncio.create_task(write_answers())
+        try:
+            async for raw in reader:
+                line = raw.decode(errors="replace").strip()
+                if line:
+                    await answers.put(asyncio.create_task(answer(line)))
+        finally:
+            await answers.put(None)
+            await writer_task
+            writer.close()
+
+    return await asyncio.start_server(handle, host, port)
+
+
+async def _serve(port: int):
+    async with AsyncSolver(workers=2, timeout=10) as solver:
+        server = await start_server(solver, port=port)
+        print("Serving on", *(s.getsockname() for s in server.sockets))
+        async with server:
+            await server.serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(_serve(int(sys.argv[1]) if len(sys.argv) > 1 else 8421))
@@ -0,0 +1,124 @@
+"""Caching solutions by canonical form
+
+Sudokus which are the transform of each other (see ``canonical``) share
+the canonical form, so one solve answers all of them: the solution is
+stored in the canonical frame and mapped back with ``Transform.invert``.
+"""
+import dbm
+from collections import OrderedDict
+from typing import Callable, Optional, Tuple
+
+import numpy as np
+
+from .batch_solver import solve_batch, BoardStatus
+from .canonical import canonical_form
+
+# status byte followed by the 81 cells of the (partial) solution
+Entry = bytes
+
+
+class SolutionCache:
+
+    def __init__(self, maxsize: int = 10000, path: Optional[str] = None):
+        """LRU mapping from 81-byte grid keys to (status, solution) entries
+
+        :@param maxsize: Maximum number of entries kept in memory
+        :@param path: Optional dbm file, where all the entries are also
+            written, and where the entries missing in memory are looked for
+        """
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._disk = dbm.open(path, "c") if path is not None else None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: bytes) -> Optional[Tuple[int, np.ndarray]]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        elif self._disk is not None and key in self._disk:
+            entry = self._disk[key]
+            self._remember(key, entry)
+        if entry is None:
+            return None
+        return entry[0], np.frombuffer(entry, dtype=np.uint8, offset=1).reshape(9, 9)
+
+    def put(self, key: bytes, status: int, solution: np.ndarray):
+        entry = bytes([status]) + np.asarray(solution, dtype=np.uint8).tobytes()
+        self._remember(key, entry)
+        if self._disk is not None:
+            self._disk[key] = entry
+
+    def _remember(self, key: bytes, entry: Entry):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def close(self):
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def __enter__(self) -> "SolutionCache":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _solve_grid(grid: np.ndarray, max_nodes: Optional[int] = None) \
+        -> Tuple[int, np.ndarray]:
+    status, solutions = solve_batch(grid[None], search=True, max_nodes=max_nodes)
+    return int(status[0]), solutions[0]
+
+
+class CachedSolver:
+
+    def __init__(self, cache: Optional[SolutionCache] = None,
+                 solve: Callable[[np.ndarray], Tuple[int, np.ndarray]] = _solve_grid):
+        """Answers sudokus from the cache when one of their transforms was
+        already solved, and solves them otherwise
+
+        Exact repeats are found with the grid itself as key, before
+        computing the canonical form, which costs more than most solves.
+
+        :@param cache: Cache of the solutions (default: in memory)
+        :@param solve: Function from a (9, 9) grid to a (BoardStatus,
+            (9, 9) solution) pair, used on cache misses
+        """
+        self.cache = cache if cache is not None else SolutionCache()
+        self._solve = solve
+        self.hits = 0
+        self.misses = 0
+
+    def solve(self, grid: np.ndarray) -> Tuple[int, np.ndarray]:
+        """
+        Returns:
+            - the BoardStatus of the sudoku,
+            - its (9, 9) solution, where the cells which are not final
+              are left empty.
+        """
+        grid = np.asarray(grid, dtype=np.uint8)
+        exact_key = grid.tobytes()
+        cached = self.cache.get(exact_key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+
+        canonical, transform = canonical_form(grid)
+        key = canonical.tobytes()
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            status, solution = cached[0], transform.invert(cached[1])
+        else:
+            self.misses += 1
+            status, solution = self._solve(grid)
+            solution = np.asarray(solution, dtype=np.uint8)
+            if status != BoardStatus.STALLED:
+                self.cache.put(key, status, transform.apply(solution))
+        if status != BoardStatus.STALLED:
+            self.cache.put(exact_key, status, solution)
+        return status, solution
@@ -0,0 +1,110 @@
+"""Observers of the solvers: counters, timings and traces
+
+A solver calls the hooks of its observer (if any) on each forbid/force_set,
+on each application of a rule and on each pass or search node. Solvers
+built without an observer skip all of it.
+"""
+import json
+import sys
+from collections import Counter
+from typing import TextIO
+
+from .choices import ForbidOutcome, ForceSetOutcome, DirectOutcome
+
+
+class SolverObserver:
+    """Does nothing, override the hooks of interest"""
+
+    def on_forbid(self, arr_row: int, arr_col: int, cell_value: int,
+                  outcome: ForbidOutcome):
+        pass
+
+    def on_force_set(self, arr_row: int, arr_col: int, cell_value: int,
+                     outcome: ForceSetOutcome):
+        pass
+
+    def on_rule(self, rule: str, outcome: DirectOutcome, seconds: float):
+        """Called after each application of a rule (eg "clean", "isolate")"""
+        pass
+
+    def on_pass(self):
+        """Called at the beginning of each pass over all the groups"""
+        pass
+
+    def on_node(self, depth: int):
+        """Called on each node of a search"""
+        pass
+
+
+class SolverStats(SolverObserver):
+    """Counts what happens, and where the time goes"""
+
+    def __init__(self):
+        self.passes = 0
+        self.nodes = 0
+        self.max_depth = 0
+        self.forbid = Counter()
+        self.force_set = Counter()
+        self.rules = dict()
+
+    def on_forbid(self, arr_row: int, arr_col: int, cell_value: int,
+                  outcome: ForbidOutcome):
+        self.forbid[outcome] += 1
+
+    def on_force_set(self, arr_row: int, arr_col: int, cell_value: int,
+                     outcome: ForceSetOutcome):
+        self.force_set[outcome] += 1
+
+    def on_rule(self, rule: str, outcome: DirectOutcome, seconds: float):
+        if rule not in self.rules:
+            self.rules[rule] = {"calls": 0, "seconds": 0., "outcomes": Counter()}
+        stats = self.rules[rule]
+        stats["calls"] += 1
+        stats["seconds"] += seconds
+        stats["outcomes"][outcome] += 1
+
+    def on_pass(self):
+        self.passes += 1
+
+    def on_node(self, depth: int):
+        self.nodes += 1
+        self.max_depth = max(self.max_depth, depth)
+
+    def to_dict(self) -> dict:
+        return {
+            "passes": self.passes,
+            "nodes": self.nodes,
+            "max_depth": self.max_depth,
+            "forbid": {o.name: self.forbid[o] for o in ForbidOutcome},
+            "force_set": {o.name: self.force_set[o] for o in ForceSetOutcome},
+            "rules": {
+                rule: {
+                    "calls": stats["calls"],
+                    "seconds": stats["seconds"],
+                    "outcomes": {o.name: stats["outcomes"][o] for o in DirectOutcome},
+                }
+                for rule, stats in self.rules.items()
+            },
+        }
+
+    def to_json(self, **kwargs) -> str:
+        return json.dumps(self.to_dict(), **kwargs)
+
+
+class TraceObserver(SolverObserver):
+    """Writes the cells set by the solver and the inconsistencies"""
+
+    def __init__(self, writer: TextIO = None):
+        self.writer = writer if writer is not None else sys.stdout
+
+    def on_force_set(self, arr_row: int, arr_col: int, cell_value: int,
+                     outcome: ForceSetOutcome):
+        if outcome == ForceSetOutcome.OK:
+            self.writer.write(f"\tSetting ({arr_row}, {arr_col}) to {cell_value}\n")
+
+    def on_rule(self, rule: str, outcome: DirectOutcome, seconds: float):
+        if outcome == DirectOutcome.INCONSISTENT_CHANGE:
+            self.writer.write(f"Inconsistent {rule}\n")
+
+    def on_node(self, depth: int):
+        self.writer.write(f"Search node at depth {depth}\n")
@@ -0,0 +1,129 @@
+"""Checking grids and solutions, many boards at once
+
+The checks take an IOSudoku, a (size, size) grid or stacked (N, size, size)
+grids, and look at all the units (rows, columns, boxes) of all the boards
+with a few NumPy operations. They return a Problem flag per board, VALID
+(0) when nothing is wrong, so that the reasons of the failures can be told
+apart:
+
+    problems = check_solutions(solutions, givens)
+    bad = np.flatnonzero(problems)
+    Problem(problems[bad[0]])  # eg <Problem.DUPLICATE|INCOMPLETE: 6>
+"""
+from enum import IntFlag
+from typing import Optional, Union
+
+import numpy as np
+
+from .io_sudoku import IOSudoku
+from .cell_indices import order_of_size, index_arrays
+
+
+class Problem(IntFlag):
+
+    VALID = 0
+    INVALID_VALUE = 1  # A cell value is out of [0, size]
+    DUPLICATE = 2  # A unit holds the same cell value twice
+    INCOMPLETE = 4  # A solution has empty cells
+    GIVEN_CHANGED = 8  # A solution does not keep the given cells
+
+
+Grids = Union[IOSudoku, np.ndarray]
+
+
+def _as_grids(grids: Grids) -> np.ndarray:
+    if isinstance(grids, IOSudoku):
+        grids = grids.grid
+    grids = np.asarray(grids)
+    if grids.ndim not in (2, 3) or grids.shape[-1] != grids.shape[-2]:
+        raise ValueError(
+            f"Expected (size, size) or (N, size, size) grids, got {grids.shape}")
+    order_of_size(grids.shape[-1])
+    return grids
+
+
+def _result(problems: np.ndarray, grids: np.ndarray) -> Union[Problem, np.ndarray]:
+    return Problem(int(problems[0])) if grids.ndim == 2 else problems
+
+
+def _mask_dtype(size: int) -> Optional[np.dtype]:
+    """Smallest unsigned type whose sums of size unit masks cannot
+    overflow, None when there is none"""
+    for dtype in (np.uint16, np.uint32, np.uint64):
+        if size << (size - 1) < 1 << (8 * np.dtype(dtype).itemsize):
+            return np.dtype(dtype)
+    return None
+
+
+def _repeated(units: np.ndarray) -> np.ndarray:
+    """Whether each of the (N, units, size) units holds a value twice"""
+    size = units.shape[-1]
+    dtype = _mask_dtype(size)
+    if dtype is None:
+        # Sorted units hold a duplicate iff two neighbours are equal (and set)
+        units = np.sort(units, axis=-1)
+        repeated = (units[..., 1:] == units[..., :-1]) \
+            & (units[..., 1:] != IOSudoku.EMPTY_CELL)
+        return repeated.any(axis=-1)
+    # The masks of distinct values add up to their union, a value
+    # seen twice adds its bit twice (empty cells have no bit)
+    masks = (dtype.type(1) << units.astype(dtype)) >> dtype.type(1)
+    return masks.sum(axis=-1, dtype=dtype) != np.bitwise_or.reduce(masks, axis=-1)
+
+
+def _grid_problems(grids: np.ndarray) -> np.ndarray:
+    """Problems of the (N, size, size) grids, whatever their empty cells"""
+    size = grids.shape[-1]
+    flat = grids.reshape(len(grids), size * size)
+    problems = np.zeros(len(grids), dtype=np.uint8)
+
+    invalid = (flat < IOSudoku.EMPTY_CELL) | (flat > size)
+    problems[invalid.any(axis=1)] |= int(Problem.INVALID_VALUE)
+    if invalid.any():
+        flat = np.where(invalid, IOSudoku.EMPTY_CELL, flat)
+
+    units = flat[:, index_arrays(order_of_size(size)).units]
+    problems[_repeated(units).any(axis=1)] |= int(Problem.DUPLICATE)
+    return problems
+
+
+def check_givens(grids: Grids) -> Union[Problem, np.ndarray]:
+    """Checks that the grids (empty cells allowed) do not break the rules
+
+    Returns the Problem of a single grid, or the (N,) array of the
+    Problem flags of stacked grids.
+    """
+    grids = _as_grids(grids)
+    stacked = grids.reshape((-1,) + grids.shape[-2:])
+    return _result(_grid_problems(stacked), grids)
+
+
+def check_solutions(solutions: Grids, givens: Optional[Grids] = None) \
+        -> Union[Problem, np.ndarray]:
+    """Checks that the grids are complete, valid solutions
+
+    :@param givens: Grids of the same shape, whose non-empty cells
+        should be kept by the solutions
+
+    Returns the Problem of a single grid, or the (N,) array of the
+    Problem flags of stacked grids.
+    """
+    solutions = _as_grids(solutions)
+    stacked = solutions.reshape((-1,) + solutions.shape[-2:])
+    problems = _grid_problems(stacked)
+
+    incomplete = (stacked == IOSudoku.EMPTY_CELL).any(axis=(1, 2))
+    problems[incomplete] |= int(Problem.INCOMPLETE)
+
+    if givens is not None:
+        givens = _as_grids(givens)
+        if givens.shape != solutions.shape:
+            raise ValueError(
+                f"Givens of shape {givens.shape} for solutions "
+                f"of shape {solutions.shape}")
+        givens = givens.reshape(stacked.shape)
+        changed = ((givens != IOSudoku.EMPTY_CELL)
+                   & (givens != stacked)).any(axis=(1, 2))
+        problems[changed] |= int(Problem.GIVEN_CHANGED)
+
+    return _result(problems, solutions)
@@ -0,0 +1,182 @@
+"""Vectorized direct solving over a boolean candidate tensor
+
+The candidates of a board are described by a boolean array of shape (81, 9):
+candidates[k, arr_value] is True iff the cell value (arr_value + 1) is still
+allowed in the cell of flat index k (see ``cell_indices``).
+
+The functions below also accept stacked boards, ie arrays of shape
+(..., 81, 9), and then work on all the boards at once. Boards of other
+orders have (size * size, size) candidates, the order is deduced from
+the last dimension.
+"""
+import numpy as np
+from typing import Dict, NamedTuple, Tuple
+
+from .io_sudoku import IOSudoku, GRID_DTYPE
+from .choices import SudokuChoices, DirectOutcome, ForbidOutcome, \
+    ForceSetOutcome
+from .direct_solver import DirectSolver
+from . import cell_indices
+
+
+class _Tables(NamedTuple):
+    peers: np.ndarray  # (cells, peers)
+    units: np.ndarray  # (units, size)
+    # Position of each cell in the (units * size) flattened units,
+    # for its 3 units
+    unit_slots: np.ndarray  # (cells, 3)
+
+
+_TABLES: Dict[int, _Tables] = dict()
+
+
+def _tables(size: int) -> _Tables:
+    order = cell_indices.order_of_size(size)
+    if order not in _TABLES:
+        indices = cell_indices.board_indices(order)
+        arrays = cell_indices.index_arrays(order)
+        unit_slots = np.array([
+            [size * u + indices.UNITS[u].index(k) for u in indices.CELL_UNITS[k]]
+            for k in indices.CELLS
+        ], dtype=np.intp)
+        _TABLES[order] = _Tables(arrays.peers, arrays.units, unit_slots)
+    return _TABLES[order]
+
+
+def candidates_from_grid(grid: np.ndarray) -> np.ndarray:
+    """Builds the candidates of (..., size, size) grids, where empty cells
+    are IOSudoku.EMPTY_CELL"""
+    size = grid.shape[-1]
+    grid = np.asarray(grid).reshape(grid.shape[:-2] + (size * size,))
+    values = np.arange(1, size + 1)
+    empty = grid == IOSudoku.EMPTY_CELL
+    return empty[..., None] | (grid[..., None] == values)
+
+
+def candidates_from_choices(choices: SudokuChoices) -> np.ndarray:
+    size = choices.size
+    candidates = np.zeros((size * size, size), dtype=bool)
+    coordinates = cell_indices.board_indices(choices.order).COORDINATES
+    for k, (row, col) in enumerate(coordinates):
+        for cell_value in choices.get_cell_value_choices(row, col):
+            candidates[k, cell_value - 1] = True
+    return candidates
+
+
+def grid_from_candidates(candidates: np.ndarray) -> np.ndarray:
+    """Builds the (..., size, size) grids of the candidates,
+    cells which are not final are left empty"""
+    size = candidates.shape[-1]
+    final = candidates.sum(axis=-1) == 1
+    grid = np.where(final, candidates.argmax(axis=-1) + 1, IOSudoku.EMPTY_CELL)
+    grid = grid.astype(GRID_DTYPE)
+    return grid.reshape(grid.shape[:-1] + (size, size))
+
+
+def propagation_step(candidates: np.ndarray, hidden_singles: bool = True) \
+        -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Applies once, on all the units at once:
+        - the elimination of the final values from their peers,
+        - the hidden singles (a value with a single place in a unit),
+          unless hidden_singles is False.
+
+    Returns:
+        - the new candidates,
+        - a boolean array of the boards which became inconsistent,
+        - a boolean array of the boards which changed.
+    """
+    size = candidates.shape[-1]
+    tables = _tables(size)
+    final = candidates.sum(axis=-1) == 1
+    final_values = candidates & final[..., None]
+    taken = final_values[..., tables.peers, :].any(axis=-2)
+    new = candidates & ~taken
+
+    if not hidden_singles:
+        inconsistent = (~new.any(axis=-1)).any(axis=-1)
+        changed = (new != candidates).any(axis=(-2, -1))
+        return new, inconsistent, changed
+
+    in_units = new[..., tables.units, :]  # (..., 27, 9 cells, 9 values)
+    places = in_units.sum(axis=-2)  # (..., 27, 9 values)
+    missing = (places == 0).any(axis=(-2, -1))
+
+    hidden = in_units & (places == 1)[..., None, :]
+    hidden = hidden.reshape(hidden.shape[:-3] + (3 * size * size, size))
+    forced = hidden[..., tables.unit_slots, :].any(axis=-2)  # (..., 81, 9)
+    nb_forced = forced.sum(axis=-1)
+    new = np.where((nb_forced == 1)[..., None], forced, new)
+
+    inconsistent = missing \
+        | (nb_forced > 1).any(axis=-1) \
+        | (~new.any(axis=-1)).any(axis=-1)
+    changed = (new != candidates).any(axis=(-2, -1))
+    return new, inconsistent, changed
+
+
+def propagate(candidates: np.ndarray, hidden_singles: bool = True) \
+        -> Tuple[DirectOutcome, np.ndarray]:
+    """Applies propagation steps on a single board until nothing changes.
+
+    Returns:
+        - INCONSISTENT_CHANGE or NOTHING_CHANGED,
+        - the last candidates.
+    """
+    while True:
+        candidates, inconsistent, changed = propagation_step(
+            candidates, hidden_singles)
+        if inconsistent:
+            return DirectOutcome.INCONSISTENT_CHANGE, candidates
+        if not changed:
+            return DirectOutcome.NOTHING_CHANGED, candidates
+
+
+class VectorizedDirectSolver(DirectSolver):
+    """Same rules as GroupBasedDirectSolver (naked and hidden singles),
+    applied with NumPy on a candidate tensor, and written back to
+    the choices at the end of the propagation"""
+
+    def solve(self) -> Tuple[bool, SudokuChoices]:
+        outcome = self.propagate()
+        if outcome == DirectOutcome.INCONSISTENT_CHANGE:
+            return False, self.sudoku
+        return self.is_solved(), self.sudoku
+
+    def is_solved(self) -> bool:
+        return self.sudoku.all_final()
+
+    def propagate(self) -> DirectOutcome:
+        """
+        Returns:
+            - INCONSISTENT_CHANGE if a contradiction was met (the choices
+              are left untouched when it is met by the propagation),
+            - NOTHING_CHANGED once a fixed point is reached.
+        """
+        before = candidates_from_choices(self.sudoku)
+        self._candidates = before
+        outcome = self.run_rule("vectorized", self._propagate_candidates)
+        if outcome == DirectOutcome.INCONSISTENT_CHANGE:
+            return outcome
+
+        after = self._candidates
+        coordinates = cell_indices.board_indices(self.sudoku.order).COORDINATES
+        for k in np.flatnonzero((before != after).any(axis=-1)):
+            row, col = coordinates[k]
+            values = np.flatnonzero(after[k]) + 1
+            if len(values) == 0:
+                return DirectOutcome.INCONSISTENT_CHANGE
+            if len(values) == 1:
+                if self.force_set(row, col, int(values[0])) \
+                        == ForceSetOutcome.IMPOSSIBLE:
+                    return DirectOutcome.INCONSISTENT_CHANGE
+                continue
+            for arr_value in np.flatnonzero(before[k] & ~after[k]):
+                if self.forbid(row, col, int(arr_value) + 1) \
+                        == ForbidOutcome.LEFT_EMPTY_HANDED:
+                    return DirectOutcome.INCONSISTENT_CHANGE
+        return outcome
+
+    def _propagate_candidates(self) -> DirectOutcome:
+        outcome, self._candidates = propagate(self._candidates)
+        return outcome
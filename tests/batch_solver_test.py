@@ -0,0 +1,47 @@
+import unittest
+import numpy as np
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.batch_solver import solve_batch, BoardStatus
+
+from tests.text_samples import *
+
+
+class TestSolveBatch(unittest.TestCase):
+
+    def setUp(self):
+        inconsistent = IOSudoku(EASY_TXT)
+        inconsistent.set_cell(0, 2, 2)  # 2 is already on the first row
+        self.grids = np.stack([
+            IOSudoku(TRIVIAL_TXT).grid,
+            IOSudoku(EASY_TXT).grid,
+            IOSudoku(HARD_TXT).grid,
+            inconsistent.grid,
+        ])
+
+    def test_direct(self):
+        status, solutions = solve_batch(self.grids)
+        self.assertEqual(list(status), [
+            BoardStatus.SOLVED, BoardStatus.SOLVED,
+            BoardStatus.STALLED, BoardStatus.INCONSISTENT])
+        self.assertEqual(solutions.shape, (4, 9, 9))
+        self.assertTrue((solutions[0] != IOSudoku.EMPTY_CELL).all())
+        given = self.grids[1] != IOSudoku.EMPTY_CELL
+        np.testing.assert_array_equal(solutions[1][given], self.grids[1][given])
+
+    def test_search(self):
+        status, solutions = solve_batch(self.grids, search=True)
+        self.assertEqual(status[2], BoardStatus.SOLVED)
+        self.assertTrue((solutions[2] != IOSudoku.EMPTY_CELL).all())
+        self.assertEqual(status[3], BoardStatus.INCONSISTENT)
+
+    def test_cell_without_candidate(self):
+        grids = np.stack([IOSudoku(EMPTY_CELL_TXT).grid, self.grids[1]])
+        for search in (False, True):
+            status, _ = solve_batch(grids, search=search)
+            self.assertEqual(list(status), [
+                BoardStatus.INCONSISTENT, BoardStatus.SOLVED])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.line_io import write_grids
+from sudoku.binary_store import PuzzleStore, write_store, convert_to_store
+
+from tests.text_samples import *
+
+
+class TestPuzzleStore(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.grids = np.stack([
+            IOSudoku(txt).grid
+            for txt in (TRIVIAL_TXT, EASY_TXT, MEDIUM_TXT, HARD_TXT)
+        ])
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory.name, name)
+
+    def test_round_trip(self):
+        for packed in (False, True):
+            path = self.path(f"store_{packed}.sdku")
+            self.assertEqual(write_store(path, self.grids, packed), 4)
+            store = PuzzleStore(path)
+            self.assertEqual(len(store), 4)
+            np.testing.assert_array_equal(store.grids(), self.grids)
+            np.testing.assert_array_equal(store[1].grid, self.grids[1])
+            np.testing.assert_array_equal(store[-1].grid, self.grids[3])
+            sudokus = store[1:4:2]
+            self.assertEqual(len(sudokus), 2)
+            np.testing.assert_array_equal(sudokus[1].grid, self.grids[3])
+            with self.assertRaises(IndexError):
+                store[4]
+
+    def test_zero_copy(self):
+        path = self.path("store.sdku")
+        write_store(path, self.grids)
+        sudoku = PuzzleStore(path)[2]
+        self.assertIsInstance(sudoku.grid.base, np.memmap)
+        self.assertFalse(sudoku.grid.flags.writeable)
+
+    def test_convert(self):
+        source = self.path("puzzles.txt")
+        with open(source, "w") as writer:
+            write_grids(writer, self.grids)
+        path = self.path("store.sdku")
+        self.assertEqual(convert_to_store(source, path, packed=True), 4)
+        np.testing.assert_array_equal(PuzzleStore(path).grids(), self.grids)
+
+    def test_invalid_file(self):
+        path = self.path("not_a_store")
+        with open(path, "wb") as writer:
+            writer.write(b"x" * 100)
+        with self.assertRaises(ValueError):
+            PuzzleStore(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.line_io import format_grid
+from sudoku.bulk import solve_bulk
+from sudoku.batch_solver import BoardStatus
+
+from tests.text_samples import *
+
+
+class TestSolveBulk(unittest.TestCase):
+
+    def setUp(self):
+        self.lines = [
+            format_grid(IOSudoku(txt).grid)
+            for txt in (TRIVIAL_TXT, EASY_TXT, MEDIUM_TXT, HARD_TXT)
+        ] + ["not a sudoku"]
+
+    def check_results(self, results):
+        self.assertEqual(sorted(index for index, _, _ in results), list(range(5)))
+        for index, status, solution in results:
+            if index < 4:
+                self.assertEqual(status, BoardStatus.SOLVED)
+                self.assertNotIn('.', solution)
+            else:
+                self.assertEqual(status, BoardStatus.INCONSISTENT)
+
+    def test_in_process(self):
+        results = list(solve_bulk(self.lines, workers=0, chunk_size=2))
+        self.assertEqual([index for index, _, _ in results], list(range(5)))
+        self.check_results(results)
+
+    def test_process_pool(self):
+        ordered = list(solve_bulk(self.lines, workers=2, chunk_size=2))
+        self.assertEqual([index for index, _, _ in ordered], list(range(5)))
+        self.check_results(ordered)
+        unordered = list(solve_bulk(
+            self.lines, workers=2, chunk_size=1, ordered=False))
+        self.check_results(unordered)
+
+    def test_comments_and_blank_lines(self):
+        results = list(solve_bulk(
+            ["# comment", "", self.lines[0]], workers=0))
+        self.assertEqual(len(results), 1)
+        self.assertEqual(results[0][:2], (2, BoardStatus.SOLVED))
+        unordered = list(solve_bulk(
+            ["", self.lines[0], "# comment", self.lines[1]], workers=2,
+            chunk_size=1, ordered=False))
+        self.assertEqual(sorted(index for index, _, _ in unordered), [1, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
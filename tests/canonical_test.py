@@ -0,0 +1,105 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.canonical import canonical_form, canonical_key, \
+    COLUMN_PERMUTATIONS
+from sudoku.solution_cache import SolutionCache, CachedSolver
+from sudoku.batch_solver import BoardStatus
+
+from tests.text_samples import *
+
+
+def random_transform(grid: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    rows = COLUMN_PERMUTATIONS[rng.integers(len(COLUMN_PERMUTATIONS))]
+    columns = COLUMN_PERMUTATIONS[rng.integers(len(COLUMN_PERMUTATIONS))]
+    relabel = np.concatenate([[0], rng.permutation(9) + 1])
+    transformed = relabel[grid[rows][:, columns]]
+    return transformed.T if rng.integers(2) else transformed
+
+
+def is_solution_of(solution: np.ndarray, grid: np.ndarray) -> bool:
+    given = grid != IOSudoku.EMPTY_CELL
+    if (solution[given] != grid[given]).any():
+        return False
+    expected = set(range(1, 10))
+    boxes = solution.reshape(3, 3, 3, 3).swapaxes(1, 2).reshape(9, 9)
+    return all(set(lines[k]) == expected
+               for lines in (solution, solution.T, boxes) for k in range(9))
+
+
+class TestCanonicalForm(unittest.TestCase):
+
+    def setUp(self):
+        self.rng = np.random.default_rng(0)
+        self.grids = [IOSudoku(txt).grid
+                      for txt in (TRIVIAL_TXT, EASY_TXT, MEDIUM_TXT, HARD_TXT)]
+
+    def test_invariant_under_transforms(self):
+        for grid in self.grids:
+            key = canonical_key(grid)
+            for _ in range(5):
+                self.assertEqual(canonical_key(random_transform(grid, self.rng)), key)
+
+    def test_distinguishes_sudokus(self):
+        keys = {canonical_key(grid) for grid in self.grids}
+        self.assertEqual(len(keys), len(self.grids))
+
+    def test_transform_round_trip(self):
+        for grid in self.grids:
+            canonical, transform = canonical_form(grid)
+            self.assertTrue((transform.apply(grid) == canonical).all())
+            self.assertTrue((transform.invert(canonical) == grid).all())
+
+    def test_empty_grid(self):
+        canonical, _ = canonical_form(np.zeros((9, 9), dtype=int))
+        self.assertFalse(canonical.any())
+
+
+class TestSolutionCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = SolutionCache(maxsize=2)
+        solution = np.zeros((9, 9), dtype=np.uint8)
+        for key in (b"a", b"b", b"c"):
+            cache.put(key, BoardStatus.SOLVED, solution)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(cache.get(b"a"))
+        self.assertEqual(cache.get(b"c")[0], BoardStatus.SOLVED)
+
+    def test_disk_backing(self):
+        solution = np.arange(81, dtype=np.uint8).reshape(9, 9)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "solutions")
+            with SolutionCache(path=path) as cache:
+                cache.put(b"key", BoardStatus.SOLVED, solution)
+            with SolutionCache(path=path) as cache:
+                status, cached = cache.get(b"key")
+        self.assertEqual(status, BoardStatus.SOLVED)
+        self.assertTrue((cached == solution).all())
+
+
+class TestCachedSolver(unittest.TestCase):
+
+    def test_transformed_sudokus_hit_the_cache(self):
+        rng = np.random.default_rng(1)
+        grid = IOSudoku(HARD_TXT).grid
+        solver = CachedSolver()
+        status, solution = solver.solve(grid)
+        self.assertEqual(status, BoardStatus.SOLVED)
+        self.assertTrue(is_solution_of(solution, grid))
+
+        for _ in range(3):
+            transformed = random_transform(grid, rng)
+            status, solution = solver.solve(transformed)
+            self.assertEqual(status, BoardStatus.SOLVED)
+            self.assertTrue(is_solution_of(solution, transformed))
+        solver.solve(grid)
+        self.assertEqual((solver.hits, solver.misses), (4, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
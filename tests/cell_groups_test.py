@@ -4,7 +4,9 @@ from typing import Tuple
 from sudoku.cell_groups import Grouping, \
     RowGrouping, \
     ColumnGrouping, \
-    BoxGrouping
+    BoxGrouping, \
+    groupings_of_order
+from sudoku import cell_indices
 
 
 def check_if_full_partition(grouping):
@@ -20,7 +22,7 @@ def check_if_full_partition(grouping):
                 return False, "found duplicate boxes"
             else:
                 recorded_boxes.append(box)
-    if len(recorded_boxes) == 81:
+    if len(recorded_boxes) == grouping.ORDER ** 4:
         return True, "partition is ok"
     else:
         return False, "partition is missing some boxes"
@@ -40,6 +42,63 @@ class TestCellGroups(unittest.TestCase):
         status, msg = check_if_full_partition(BoxGrouping)
         self.assertTrue(status, msg=msg)
 
+    def test_precomputed_sub_groups(self):
+        for grouping in (RowGrouping, ColumnGrouping, BoxGrouping):
+            for parent, sub_group in zip(grouping.PARENTS, grouping.SUB_GROUPS):
+                self.assertEqual(
+                    list(sub_group), grouping._offset_sub_group(parent))
+
+    def test_groupings_of_order(self):
+        for grouping in groupings_of_order(4):
+            self.assertEqual(grouping.ORDER, 4)
+            self.assertIs(grouping.of_order(3).ORDER, 3)
+            status, msg = check_if_full_partition(grouping)
+            self.assertTrue(status, msg=msg)
+            for parent, sub_group in zip(grouping.PARENTS, grouping.SUB_GROUPS):
+                self.assertEqual(
+                    list(sub_group), grouping._offset_sub_group(parent))
+
+
+class TestCellIndices(unittest.TestCase):
+
+    def test_units(self):
+        self.assertEqual(len(cell_indices.UNITS), 27)
+        for unit in cell_indices.UNITS:
+            self.assertEqual(len(set(unit)), 9)
+
+    def test_peers(self):
+        for k in cell_indices.CELLS:
+            peers = cell_indices.PEERS[k]
+            self.assertEqual(len(set(peers)), 20)
+            self.assertNotIn(k, peers)
+            row, col = cell_indices.COORDINATES[k]
+            for p in peers:
+                p_row, p_col = cell_indices.COORDINATES[p]
+                self.assertTrue(
+                    p_row == row or p_col == col
+                    or (p_row // 3, p_col // 3) == (row // 3, col // 3))
+
+    def test_cell_units(self):
+        for k in cell_indices.CELLS:
+            for u in cell_indices.CELL_UNITS[k]:
+                self.assertIn(k, cell_indices.UNITS[u])
+
+    def test_index_arrays(self):
+        arrays = cell_indices.index_arrays()
+        self.assertEqual(arrays.units.shape, (27, 9))
+        self.assertEqual(arrays.peers.shape, (81, 20))
+        self.assertEqual(arrays.cell_units.shape, (81, 3))
+
+    def test_larger_orders(self):
+        for order, nb_peers in ((2, 7), (4, 39), (5, 64)):
+            indices = cell_indices.board_indices(order)
+            size = order * order
+            self.assertEqual(len(indices.CELLS), size * size)
+            self.assertEqual(len(indices.UNITS), 3 * size)
+            self.assertTrue(all(len(peers) == nb_peers for peers in indices.PEERS))
+            self.assertEqual(
+                cell_indices.index_arrays(order).peers.shape, (size * size, nb_peers))
+
 
 if __name__ == "__main__":
     unittest.main()
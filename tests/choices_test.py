@@ -7,7 +7,8 @@ from sudoku.exceptions import \
     InfeasibleSudokuException, \
     MaxIterReachedException, \
     NoChoiceException
-from sudoku.choices import SudokuChoices, StaticSudokuChoices
+from sudoku.choices import SudokuChoices, StaticSudokuChoices, \
+    BitmaskSudokuChoices, ForbidOutcome, ForceSetOutcome
 
 from tests.text_samples import *
 
@@ -45,6 +46,68 @@ class SudokuChoicesTest:
             val = self.choices.get_cell_value(box[0], box[1])
             self.assertTrue(val == ground_val)
 
+    def test_forbid(self):
+        row, col = self.unknown_boxes[0]
+        nb = self.choices.number_of_choices(row, col)
+        self.assertEqual(
+            self.choices.forbid(row, col, 3), ForbidOutcome.USEFUL)
+        self.assertEqual(
+            self.choices.forbid(row, col, 3), ForbidOutcome.USELESS)
+        self.assertEqual(self.choices.number_of_choices(row, col), nb - 1)
+        self.assertNotIn(3, self.choices.get_cell_value_choices(row, col))
+
+        row, col = self.known_boxes[0]
+        self.assertEqual(
+            self.choices.forbid(row, col, self.known_values[0]),
+            ForbidOutcome.LEFT_EMPTY_HANDED)
+
+    def test_force_set(self):
+        row, col = self.unknown_boxes[0]
+        self.assertEqual(
+            self.choices.force_set(row, col, 3), ForceSetOutcome.OK)
+        self.assertTrue(self.choices.is_final(row, col))
+        self.assertEqual(self.choices.get_cell_value(row, col), 3)
+        self.assertEqual(
+            self.choices.force_set(row, col, 3), ForceSetOutcome.USELESS)
+        self.assertEqual(
+            self.choices.force_set(row, col, 4), ForceSetOutcome.IMPOSSIBLE)
+
+    def test_snapshot_restore(self):
+        (row, col), (other_row, other_col) = self.unknown_boxes[:2]
+        before = self.choices.get_cell_value_choices(row, col)
+        outer = self.choices.snapshot()
+        self.choices.forbid(row, col, 3)
+
+        inner = self.choices.snapshot()
+        self.choices.force_set(other_row, other_col, 5)
+        self.choices.restore(inner)
+        self.assertFalse(self.choices.is_final(other_row, other_col))
+        self.assertNotIn(3, self.choices.get_cell_value_choices(row, col))
+
+        self.choices.restore(outer)
+        self.assertEqual(self.choices.get_cell_value_choices(row, col), before)
+        self.assertEqual(self.choices.snapshot(), outer)
+
+    def test_useless_mutations_are_not_recorded(self):
+        row, col = self.known_boxes[0]
+        self.choices.snapshot()
+        self.choices.forbid(row, col, self.known_values[0] % 9 + 1)
+        self.choices.force_set(row, col, self.known_values[0])
+        self.assertEqual(len(self.choices._trail), 0)
+
+    def test_trail_only_kept_under_snapshot(self):
+        (row, col), (other_row, other_col) = self.unknown_boxes[:2]
+        self.choices.forbid(row, col, 3)
+        self.assertEqual(len(self.choices._trail), 0)
+
+        token = self.choices.snapshot()
+        self.choices.forbid(other_row, other_col, 3)
+        self.assertEqual(len(self.choices._trail), 1)
+        self.choices.release(token)
+        self.assertEqual(len(self.choices._trail), 0)
+        self.assertNotIn(
+            3, self.choices.get_cell_value_choices(other_row, other_col))
+
 
 class TestStaticSudokuChoices(SudokuChoicesTest, unittest.TestCase):
 
@@ -53,6 +116,32 @@ class TestStaticSudokuChoices(SudokuChoicesTest, unittest.TestCase):
         SudokuChoicesTest.__init__(self, StaticSudokuChoices)
 
 
+class TestBitmaskSudokuChoices(SudokuChoicesTest, unittest.TestCase):
+
+    def __init__(self, *args, **kwargs):
+        unittest.TestCase.__init__(self, *args, **kwargs)
+        SudokuChoicesTest.__init__(self, BitmaskSudokuChoices)
+
+
+class TestLargeBoards(unittest.TestCase):
+
+    def test_25x25_masks(self):
+        sudoku = IOSudoku(order=5)
+        sudoku.set_cell(0, 0, 25)
+        for choices_class in (StaticSudokuChoices, BitmaskSudokuChoices):
+            choices = choices_class(sudoku)
+            self.assertEqual(choices.get_cell_value(0, 0), 25)
+            self.assertEqual(choices.number_of_choices(24, 24), 25)
+            self.assertEqual(
+                choices.forbid(24, 24, 25), ForbidOutcome.USEFUL)
+            self.assertEqual(
+                choices.get_cell_value_choices(24, 24), list(range(1, 25)))
+            self.assertEqual(
+                choices.force_set(24, 24, 24), ForceSetOutcome.OK)
+            self.assertEqual(choices.to_IOSudoku().get_cell(24, 24), 24)
+        self.assertEqual(BitmaskSudokuChoices(sudoku)._masks.itemsize, 4)
+
+
 
 if __name__ == "__main__":
     unittest.main()
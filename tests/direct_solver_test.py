@@ -0,0 +1,97 @@
+import threading
+import unittest
+from functools import partial
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.choices import StaticSudokuChoices, BitmaskSudokuChoices
+from sudoku.direct_solver import GroupBasedDirectSolver, IncrementalDirectSolver
+from sudoku.search_solver import SearchSolver
+from sudoku.cell_groups import RowGrouping, ColumnGrouping, BoxGrouping, \
+    DiagonalGrouping, WindokuGrouping, jigsaw_grouping
+
+from tests.text_samples import *
+
+
+class TestIncrementalDirectSolver(unittest.TestCase):
+
+    def test_same_outcome_as_group_based(self):
+        for txt in (TRIVIAL_TXT, EASY_TXT, MEDIUM_TXT, HARD_TXT):
+            for choices_class in (StaticSudokuChoices, BitmaskSudokuChoices):
+                solved, reference = GroupBasedDirectSolver(
+                    choices_class(IOSudoku(txt))).solve()
+                inc_solved, choices = IncrementalDirectSolver(
+                    choices_class(IOSudoku(txt))).solve()
+                self.assertEqual(solved, inc_solved)
+                for row in range(9):
+                    for col in range(9):
+                        self.assertEqual(
+                            reference.get_cell_value_choices(row, col),
+                            choices.get_cell_value_choices(row, col))
+
+    def test_inconsistent(self):
+        sudoku = IOSudoku(EASY_TXT)
+        sudoku.set_cell(0, 2, 2)  # 2 is already on the first row
+        solved, _ = IncrementalDirectSolver(
+            BitmaskSudokuChoices(sudoku)).solve()
+        self.assertFalse(solved)
+
+    def test_isolate_buffers_shared_by_thread(self):
+        def usage(txt):
+            return GroupBasedDirectSolver(
+                BitmaskSudokuChoices(IOSudoku(txt)))._usage
+
+        self.assertIs(usage(EASY_TXT), usage(HARD_TXT))
+        other = list()
+        thread = threading.Thread(target=lambda: other.append(usage(EASY_TXT)))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other[0], usage(EASY_TXT))
+
+
+class TestVariantGroupings(unittest.TestCase):
+
+    def solve_empty_board(self, groupings):
+        """Fills an empty board with the given groupings,
+        and checks each group of the solution"""
+        for direct_solver in (GroupBasedDirectSolver, IncrementalDirectSolver):
+            solver = SearchSolver(
+                BitmaskSudokuChoices(IOSudoku()),
+                direct_solver=partial(direct_solver, groupings=groupings))
+            solved, choices = solver.solve()
+            self.assertTrue(solved)
+            grid = choices.to_IOSudoku().grid
+            for grouping in groupings:
+                for sub_group in grouping.SUB_GROUPS:
+                    values = {grid[row, col] for row, col in sub_group}
+                    self.assertEqual(values, set(range(1, 10)))
+
+    def test_diagonals(self):
+        self.solve_empty_board(
+            (RowGrouping, ColumnGrouping, BoxGrouping, DiagonalGrouping))
+
+    def test_windoku(self):
+        self.solve_empty_board(
+            (RowGrouping, ColumnGrouping, BoxGrouping, WindokuGrouping))
+
+    def test_jigsaw(self):
+        regions = [
+            [3 * (row // 3) + (col + row % 3) // 3 % 3 for col in range(9)]
+            for row in range(9)
+        ]
+        jigsaw = jigsaw_grouping(regions)
+        self.assertEqual(len(jigsaw.SUB_GROUPS), 9)
+        self.solve_empty_board((RowGrouping, ColumnGrouping, jigsaw))
+
+    def test_jigsaw_cached(self):
+        regions = [[3 * (row // 3) + col // 3 for col in range(9)]
+                   for row in range(9)]
+        renumbered = [[8 - region for region in row] for row in regions]
+        self.assertIs(jigsaw_grouping(regions), jigsaw_grouping(renumbered))
+
+    def test_invalid_jigsaw(self):
+        with self.assertRaises(ValueError):
+            jigsaw_grouping([[col // 3 for col in range(9)] for row in range(9)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.choices import StaticSudokuChoices
+from sudoku.dlx_solver import DancingLinks, DancingLinksSolver
+from sudoku.exceptions import MaxIterReachedException
+
+from tests.text_samples import *
+from tests.search_solver_test import is_valid_solution
+
+
+class TestDancingLinks(unittest.TestCase):
+
+    def test_knuth_example(self):
+        links = DancingLinks(7)
+        rows = {
+            "A": (2, 4, 5), "B": (0, 3, 6), "C": (1, 2, 5),
+            "D": (0, 3), "E": (1, 6), "F": (3, 4, 6),
+        }
+        for row_id, columns in rows.items():
+            links.add_row(row_id, columns)
+        self.assertEqual([sorted(s) for s in links.solutions()], [["A", "D", "E"]])
+
+
+class TestDancingLinksSolver(unittest.TestCase):
+
+    def test_solves_all_samples(self):
+        for txt in (TRIVIAL_TXT, EASY_TXT, MEDIUM_TXT, HARD_TXT):
+            sudoku = IOSudoku(txt)
+            solved, choices = DancingLinksSolver.from_IOSudoku(sudoku).solve()
+            self.assertTrue(solved)
+            self.assertTrue(is_valid_solution(choices, sudoku))
+
+        sudoku = IOSudoku(HARD_TXT)
+        solved, choices = DancingLinksSolver(StaticSudokuChoices(sudoku)).solve()
+        self.assertTrue(is_valid_solution(choices, sudoku))
+
+    def test_solves_16x16(self):
+        sudoku = IOSudoku(LARGE_16_TXT)
+        solved, choices = DancingLinksSolver.from_IOSudoku(sudoku).solve()
+        self.assertTrue(solved)
+        self.assertTrue(is_valid_solution(choices, sudoku))
+
+    def test_infeasible(self):
+        sudoku = IOSudoku(HARD_TXT)
+        sudoku.set_cell(0, 0, 3)  # 3 is already on the first row
+        solved, _ = DancingLinksSolver.from_IOSudoku(sudoku).solve()
+        self.assertFalse(solved)
+
+    def test_max_nodes(self):
+        solver = DancingLinksSolver.from_IOSudoku(IOSudoku(HARD_TXT), max_nodes=5)
+        with self.assertRaises(MaxIterReachedException):
+            solver.solve()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.generator import Difficulty, generate_sudokus, grade, \
+    random_full_grid, remove_clues
+from sudoku.search_solver import has_unique_solution
+
+from tests.text_samples import *
+
+
+class TestGenerator(unittest.TestCase):
+
+    def test_random_full_grid(self):
+        grid = random_full_grid(np.random.default_rng(0))
+        expected = list(range(1, 10))
+        for k in range(9):
+            i, j = 3 * (k // 3), 3 * (k % 3)
+            self.assertEqual(sorted(grid[k, :]), expected)
+            self.assertEqual(sorted(grid[:, k]), expected)
+            self.assertEqual(sorted(grid[i:i + 3, j:j + 3].flatten()), expected)
+
+    def test_remove_clues(self):
+        rng = np.random.default_rng(0)
+        full = random_full_grid(rng)
+        grid = remove_clues(full.copy(), rng, Difficulty.EASY, min_clues=40)
+        self.assertEqual((grid != IOSudoku.EMPTY_CELL).sum(), 40)
+        kept = grid != IOSudoku.EMPTY_CELL
+        np.testing.assert_array_equal(grid[kept], full[kept])
+        self.assertLessEqual(grade(grid).difficulty, Difficulty.EASY)
+
+    def test_difficulties(self):
+        for difficulty in Difficulty:
+            for grid, sudoku_grade in generate_sudokus(2, seed=0, difficulty=difficulty):
+                self.assertEqual(sudoku_grade.difficulty, difficulty)
+                self.assertEqual(grade(grid), sudoku_grade)
+                self.assertTrue(has_unique_solution(IOSudoku(grid.copy())))
+
+    def test_seeded(self):
+        first = list(generate_sudokus(3, seed=42, workers=0, chunk_size=2))
+        second = list(generate_sudokus(3, seed=42, workers=2, chunk_size=1))
+        for (grid, sudoku_grade), (other, other_grade) in zip(first, second):
+            np.testing.assert_array_equal(grid, other)
+            self.assertEqual(sudoku_grade, other_grade)
+
+    def test_grade_samples(self):
+        self.assertEqual(grade(IOSudoku(TRIVIAL_TXT).grid).difficulty,
+                         Difficulty.TRIVIAL)
+        # The additional rules are enough for the hard sample
+        hard_grade = grade(IOSudoku(HARD_TXT).grid)
+        self.assertEqual(hard_grade.difficulty, Difficulty.MEDIUM)
+        self.assertIn("pointing", hard_grade.rules)
+
+
+if __name__ == "__main__":
+    unittest.main()
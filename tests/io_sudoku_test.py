@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.choices import StaticSudokuChoices
+
+from tests.text_samples import *
+
+
+class TestIOSudoku(unittest.TestCase):
+
+    def test_text_and_bytes(self):
+        sudoku = IOSudoku(EASY_TXT)
+        self.assertEqual(sudoku.get_cell(0, 0), 2)
+        self.assertEqual(sudoku.get_cell(0, 2), IOSudoku.EMPTY_CELL)
+        self.assertTrue((IOSudoku(EASY_TXT.encode()).grid == sudoku.grid).all())
+        self.assertTrue((IOSudoku("easy_01").grid == sudoku.grid).all())
+        self.assertTrue((IOSudoku(str(sudoku).replace('.', 'x')).grid
+                         == sudoku.grid).all())
+
+    def test_16x16(self):
+        sudoku = IOSudoku(LARGE_16_TXT)
+        self.assertEqual(sudoku.order, 4)
+        self.assertEqual(sudoku.grid.max(), 16)
+
+    def test_malformed(self):
+        lines = EASY_TXT.strip().splitlines()
+        wrong_length = "\n".join(lines[:1] + ["29x 46x 15"] + lines[2:])
+        invalid = EASY_TXT.replace("841", "8A1")
+        for txt in (wrong_length, invalid, "\n".join(lines[:6]), "1234\n123\n"):
+            with self.assertRaises(RuntimeError, msg=txt):
+                IOSudoku(txt)
+
+    def test_compact_grids(self):
+        for sudoku in (IOSudoku(EASY_TXT), IOSudoku(order=4)):
+            self.assertEqual(sudoku.grid.dtype, np.uint8)
+        choices = StaticSudokuChoices(IOSudoku(EASY_TXT))
+        self.assertIs(type(choices.get_cell_value(0, 0)), int)
+        self.assertEqual(choices.to_IOSudoku().grid.dtype, np.uint8)
+
+    def test_static_choices(self):
+        sudoku = IOSudoku(EASY_TXT)
+        choices = StaticSudokuChoices(sudoku)
+        for row in range(9):
+            for col in range(9):
+                value = sudoku.get_cell(row, col)
+                expected = list(range(1, 10)) \
+                    if value == IOSudoku.EMPTY_CELL else [value]
+                self.assertEqual(
+                    choices.get_cell_value_choices(row, col), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import io
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.line_io import format_grid
+from sudoku.batch_solver import BoardStatus
+from sudoku.jobs import solve_job, read_results, export_results, \
+    results_path, RESULT_DTYPE
+
+from tests.text_samples import *
+
+
+class TestSolveJob(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.puzzles = os.path.join(self.directory.name, "puzzles.txt")
+        lines = [
+            format_grid(IOSudoku(txt).grid)
+            for txt in (TRIVIAL_TXT, EASY_TXT, MEDIUM_TXT, HARD_TXT)
+        ]
+        with open(self.puzzles, "w") as writer:
+            writer.write("# Comment\n" + "\n".join(lines[:2]) + "\n\n")
+            writer.write("not a sudoku\n" + "\n".join(lines[2:]))
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def check_results(self, path):
+        offsets, status, solutions = read_results(path)
+        self.assertEqual(status.tolist(), [
+            BoardStatus.SOLVED, BoardStatus.SOLVED, BoardStatus.INCONSISTENT,
+            BoardStatus.SOLVED, BoardStatus.SOLVED])
+        self.assertTrue((np.diff(offsets) > 0).all())
+        self.assertEqual(offsets[-1], os.path.getsize(self.puzzles))
+        self.assertTrue(solutions[[0, 1, 3, 4]].all())
+        return solutions
+
+    def test_job(self):
+        progress = solve_job(self.puzzles, workers=0, chunk_size=2)
+        self.assertEqual(progress, (0, 5))
+        solutions = self.check_results(results_path(self.puzzles))
+
+        writer = io.StringIO()
+        export_results(results_path(self.puzzles), writer)
+        lines = writer.getvalue().splitlines()
+        self.assertEqual(lines[0], format_grid(solutions[0]))
+        self.assertEqual(len(lines), 5)
+
+        # Nothing left to do
+        self.assertEqual(solve_job(self.puzzles, workers=0), (5, 0))
+
+    def test_resume(self):
+        results = os.path.join(self.directory.name, "job.results")
+        solve_job(self.puzzles, results, workers=2, chunk_size=2)
+        expected = self.check_results(results)
+
+        # Interrupted after 2 sudokus, in the middle of the third record
+        with open(results, "r+b") as file:
+            file.truncate(os.path.getsize(results)
+                          - 2 * RESULT_DTYPE.itemsize - 10)
+        progress = solve_job(self.puzzles, results, workers=0, chunk_size=2)
+        self.assertEqual(progress, (2, 3))
+        np.testing.assert_array_equal(self.check_results(results), expected)
+
+    def test_not_a_results_file(self):
+        with self.assertRaises(ValueError):
+            solve_job(self.puzzles, self.puzzles)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import io
+import unittest
+import numpy as np
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.line_io import parse_line, format_grid, iter_grids, \
+    iter_grid_chunks, write_grids
+
+from tests.text_samples import *
+
+
+EASY_LINE = "29.46.15784172..39...13.8..6....1......2...96.89...2.5...9..5..93.8.7....16..2.7."
+
+
+class TestLineIO(unittest.TestCase):
+
+    def test_parse_line(self):
+        grid = parse_line(EASY_LINE)
+        self.assertEqual(grid.dtype, np.uint8)
+        np.testing.assert_array_equal(grid, IOSudoku(EASY_TXT).grid)
+        np.testing.assert_array_equal(
+            parse_line(EASY_LINE.replace('.', '0').encode()), grid)
+        np.testing.assert_array_equal(
+            parse_line(EASY_LINE.replace('.', 'x')), grid)
+
+    def test_invalid_lines(self):
+        with self.assertRaises(ValueError):
+            parse_line(EASY_LINE[:-1])
+        with self.assertRaises(ValueError):
+            parse_line(EASY_LINE[:-1] + 'a')
+
+    def test_round_trip(self):
+        self.assertEqual(format_grid(parse_line(EASY_LINE)), EASY_LINE)
+
+        grids = [IOSudoku(txt).grid for txt in (EASY_TXT, HARD_TXT)]
+        writer = io.StringIO()
+        write_grids(writer, grids)
+        reader = io.StringIO("# comment\n\n" + writer.getvalue())
+        for grid, read in zip(grids, iter_grids(reader)):
+            np.testing.assert_array_equal(grid, read)
+
+    def test_chunks(self):
+        lines = [EASY_LINE] * 5
+        shapes = [chunk.shape for chunk in iter_grid_chunks(lines, 2)]
+        self.assertEqual(shapes, [(2, 9, 9), (2, 9, 9), (1, 9, 9)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,70 @@
+import os
+import subprocess
+import sys
+import unittest
+
+import sudoku
+from sudoku.io_sudoku import IOSudoku
+from sudoku.line_io import format_grid, parse_line
+from sudoku.quick import parse_values, solve
+
+from tests.text_samples import *
+
+
+ROOT = os.path.join(os.path.dirname(__file__), "..")
+
+
+class TestQuickSolve(unittest.TestCase):
+
+    def test_solves_samples(self):
+        for txt in (TRIVIAL_TXT, EASY_TXT, MEDIUM_TXT, HARD_TXT):
+            grid = IOSudoku(txt).grid
+            for puzzle in (txt, format_grid(grid)):
+                solution = parse_line(solve(puzzle))
+                given = grid != IOSudoku.EMPTY_CELL
+                self.assertTrue((solution[given] == grid[given]).all())
+                for k in range(9):
+                    self.assertEqual(set(solution[k]), set(range(1, 10)))
+                    self.assertEqual(set(solution[:, k]), set(range(1, 10)))
+
+    def test_solves_16x16(self):
+        solution = solve(LARGE_16_TXT)
+        self.assertEqual(len(solution), 256)
+        self.assertNotIn('.', solution)
+
+    def test_infeasible(self):
+        line = format_grid(IOSudoku(HARD_TXT).grid)
+        self.assertIsNone(solve('3' + line[1:]))
+
+    def test_invalid_input(self):
+        with self.assertRaises(ValueError):
+            parse_values('1' * 80)
+        with self.assertRaises(ValueError):
+            parse_values('a' * 81)
+
+    def test_parse_values(self):
+        values, order = parse_values('.0x' + '1' * 78)
+        self.assertEqual(order, 3)
+        self.assertEqual(values[:4], [0, 0, 0, 1])
+
+
+class TestLazyPackage(unittest.TestCase):
+
+    def test_lazy_exports(self):
+        self.assertIs(sudoku.IOSudoku, IOSudoku)
+        self.assertIn("SearchSolver", dir(sudoku))
+        with self.assertRaises(AttributeError):
+            sudoku.not_a_name
+
+    def test_solve_without_numpy(self):
+        line = format_grid(IOSudoku(EASY_TXT).grid)
+        statement = (
+            "import sys, sudoku; "
+            f"assert sudoku.solve({line!r}) is not None; "
+            "assert 'numpy' not in sys.modules"
+        )
+        subprocess.run([sys.executable, "-c", statement], cwd=ROOT, check=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
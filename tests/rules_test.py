@@ -0,0 +1,105 @@
+import os
+import unittest
+from functools import partial
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.choices import BitmaskSudokuChoices
+from sudoku.direct_solver import GroupBasedDirectSolver
+from sudoku.search_solver import SearchSolver
+from sudoku.rules import RuleBasedDirectSolver, KillerCageRule, ALL_RULES
+from sudoku.line_io import read_grids
+from sudoku.stats import SolverStats
+
+from tests.text_samples import *
+
+
+CORPORA = os.path.join(os.path.dirname(__file__), "..", "benchmarks", "corpora")
+
+
+class TestRuleBasedDirectSolver(unittest.TestCase):
+
+    def setUp(self):
+        # The medium sudokus need the rules, the hard ones need search
+        self.grids = [IOSudoku(HARD_TXT).grid] \
+            + list(read_grids(os.path.join(CORPORA, "medium.txt")))[:5] \
+            + list(read_grids(os.path.join(CORPORA, "hard.txt")))[:5]
+        self.solutions = list()
+        for grid in self.grids:
+            solved, choices = SearchSolver(BitmaskSudokuChoices(IOSudoku(grid.copy()))).solve()
+            self.assertTrue(solved)
+            self.solutions.append(choices.to_IOSudoku().grid)
+
+    def check_sound(self, choices, solution):
+        """The solution should still be allowed by the choices"""
+        for row in range(9):
+            for col in range(9):
+                self.assertIn(solution[row, col],
+                              choices.get_cell_value_choices(row, col))
+
+    def test_each_rule_is_sound(self):
+        for rule in ALL_RULES:
+            for grid, solution in zip(self.grids, self.solutions):
+                stats = SolverStats()
+                choices = BitmaskSudokuChoices(IOSudoku(grid.copy()))
+                RuleBasedDirectSolver(choices, stats, rules=[rule]).solve()
+                self.check_sound(choices, solution)
+                self.assertIn(rule.name, stats.rules)
+
+    def test_stronger_than_singles(self):
+        direct, rule_based = 0, 0
+        for grid, solution in zip(self.grids, self.solutions):
+            direct += GroupBasedDirectSolver(
+                BitmaskSudokuChoices(IOSudoku(grid.copy()))).solve()[0]
+            solved, choices = RuleBasedDirectSolver(
+                BitmaskSudokuChoices(IOSudoku(grid.copy()))).solve()
+            self.check_sound(choices, solution)
+            rule_based += solved
+        self.assertEqual(direct, 0)
+        self.assertEqual(rule_based, 6)
+
+    def test_rule_names(self):
+        choices = BitmaskSudokuChoices(IOSudoku(HARD_TXT))
+        solver = RuleBasedDirectSolver(choices, rules=["pointing", "naked_pairs"])
+        self.assertEqual([rule.name for rule in solver.rules],
+                         ["pointing", "naked_pairs"])
+
+
+class TestKillerCageRule(unittest.TestCase):
+
+    def setUp(self):
+        _, choices = SearchSolver(BitmaskSudokuChoices(IOSudoku(EASY_TXT))).solve()
+        self.solution = choices.to_IOSudoku().grid
+        # Cages of 2 and 3 cells along the rows
+        self.cages = list()
+        for row in range(9):
+            for start, end in ((0, 2), (2, 5), (5, 7), (7, 9)):
+                cells = [(row, col) for col in range(start, end)]
+                total = sum(int(self.solution[cell]) for cell in cells)
+                self.cages.append((total, cells))
+
+    def test_cage_value_sets(self):
+        rule = KillerCageRule(self.cages)
+        self.assertEqual(rule.value_sets(9, 2, 3), {0b11})
+        self.assertEqual(rule.value_sets(9, 3, 24), {0b111000000})
+
+    def test_narrows_cage_cells(self):
+        choices = BitmaskSudokuChoices(IOSudoku())
+        RuleBasedDirectSolver(choices, rules=[KillerCageRule([(3, [(0, 0), (0, 1)])])]).solve()
+        self.assertEqual(choices.get_cell_value_choices(0, 0), [1, 2])
+        self.assertEqual(choices.get_cell_value_choices(0, 1), [1, 2])
+
+    def test_solves_killer_sudoku(self):
+        solver = SearchSolver(
+            BitmaskSudokuChoices(IOSudoku()),
+            direct_solver=partial(RuleBasedDirectSolver,
+                                  rules=[KillerCageRule(self.cages)]))
+        solved, choices = solver.solve()
+        self.assertTrue(solved)
+        grid = choices.to_IOSudoku().grid
+        for total, cells in self.cages:
+            self.assertEqual(sum(grid[cell] for cell in cells), total)
+            self.assertEqual(len({grid[cell] for cell in cells}), len(cells))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+import unittest
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.choices import StaticSudokuChoices, BitmaskSudokuChoices
+from sudoku.search_solver import SearchSolver, count_solutions, \
+    has_unique_solution
+from sudoku.direct_solver import IncrementalDirectSolver
+from sudoku.vectorized_solver import VectorizedDirectSolver
+from sudoku.exceptions import MaxIterReachedException
+
+from tests.text_samples import *
+
+
+def is_valid_solution(choices, sudoku: IOSudoku) -> bool:
+    """States whether the choices describe a full and valid solution
+    which is compatible with the initial sudoku"""
+    grid = choices.to_IOSudoku().grid
+    order, size = sudoku.order, sudoku.size
+    for row in range(size):
+        for col in range(size):
+            given = sudoku.get_cell(row, col)
+            if given != IOSudoku.EMPTY_CELL and given != grid[row, col]:
+                return False
+    expected = set(range(1, size + 1))
+    for k in range(size):
+        i, j = order * (k // order), order * (k % order)
+        if set(grid[k, :]) != expected \
+                or set(grid[:, k]) != expected \
+                or set(grid[i:i + order, j:j + order].flatten()) != expected:
+            return False
+    return True
+
+
+class TestSearchSolver(unittest.TestCase):
+
+    def test_solves_all_samples(self):
+        for txt in (TRIVIAL_TXT, EASY_TXT, MEDIUM_TXT, HARD_TXT):
+            for choices_class in (StaticSudokuChoices, BitmaskSudokuChoices):
+                sudoku = IOSudoku(txt)
+                solved, choices = SearchSolver(choices_class(sudoku)).solve()
+                self.assertTrue(solved)
+                self.assertTrue(is_valid_solution(choices, sudoku))
+
+    def test_infeasible(self):
+        sudoku = IOSudoku(HARD_TXT)
+        sudoku.set_cell(0, 0, 3)  # 3 is already on the first row
+        solved, _ = SearchSolver(BitmaskSudokuChoices(sudoku)).solve()
+        self.assertFalse(solved)
+
+    def test_solves_16x16(self):
+        sudoku = IOSudoku(LARGE_16_TXT)
+        self.assertEqual((sudoku.order, sudoku.get_cell(0, 7)), (4, 15))
+        for choices_class in (StaticSudokuChoices, BitmaskSudokuChoices):
+            for direct_solver in (IncrementalDirectSolver, VectorizedDirectSolver):
+                solved, choices = SearchSolver(
+                    choices_class(sudoku), direct_solver=direct_solver).solve()
+                self.assertTrue(solved)
+                self.assertTrue(is_valid_solution(choices, sudoku))
+
+    def test_max_nodes(self):
+        choices = BitmaskSudokuChoices(IOSudoku(HARD_TXT))
+        with self.assertRaises(MaxIterReachedException):
+            SearchSolver(choices, max_nodes=1).solve()
+
+    def test_max_nodes_restores_choices(self):
+        choices = BitmaskSudokuChoices(IOSudoku(HARD_TXT))
+        with self.assertRaises(MaxIterReachedException):
+            SearchSolver(choices, max_nodes=1).solve()
+        self.assertEqual(str(choices), str(BitmaskSudokuChoices(IOSudoku(HARD_TXT))))
+        self.assertEqual((choices._snapshots, choices._trail), ([], []))
+
+
+class TestCountSolutions(unittest.TestCase):
+
+    def test_unique(self):
+        for txt in (TRIVIAL_TXT, EASY_TXT, MEDIUM_TXT, HARD_TXT):
+            self.assertEqual(count_solutions(IOSudoku(txt)), 1)
+            self.assertTrue(has_unique_solution(IOSudoku(txt)))
+
+    def test_several_solutions(self):
+        sudoku = IOSudoku(TRIVIAL_TXT)
+        # Swapping 2 and 5 in the emptied cells gives another solution
+        for row, col in ((3, 3), (4, 3), (3, 1), (4, 1)):
+            sudoku.set_cell(row, col, IOSudoku.EMPTY_CELL)
+        self.assertEqual(count_solutions(sudoku, limit=None), 2)
+        self.assertFalse(has_unique_solution(sudoku))
+
+    def test_limit(self):
+        empty = IOSudoku()
+        self.assertEqual(count_solutions(empty, limit=2), 2)
+        self.assertEqual(count_solutions(empty, limit=5), 5)
+
+    def test_infeasible(self):
+        sudoku = IOSudoku(HARD_TXT)
+        sudoku.set_cell(0, 0, 3)  # 3 is already on the first row
+        self.assertEqual(count_solutions(sudoku), 0)
+
+    def test_cell_without_candidate(self):
+        # A cell empties while every unit still allows all the values
+        self.assertEqual(count_solutions(IOSudoku(EMPTY_CELL_TXT)), 0)
+        self.assertFalse(has_unique_solution(IOSudoku(EMPTY_CELL_TXT)))
+
+    def test_choices_left_unchanged(self):
+        choices = BitmaskSudokuChoices(IOSudoku(HARD_TXT))
+        SearchSolver(choices).count()
+        self.assertEqual(str(choices), str(BitmaskSudokuChoices(IOSudoku(HARD_TXT))))
+
+    def test_max_nodes_leaves_choices_unchanged(self):
+        choices = BitmaskSudokuChoices(IOSudoku(HARD_TXT))
+        with self.assertRaises(MaxIterReachedException):
+            SearchSolver(choices, max_nodes=1).count()
+        self.assertEqual(str(choices), str(BitmaskSudokuChoices(IOSudoku(HARD_TXT))))
+        self.assertEqual((choices._snapshots, choices._trail), ([], []))
+
+
+if __name__ == "__main__":
+    unittest.main()
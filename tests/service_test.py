@@ -0,0 +1,192 @@
+import asyncio
+import threading
+import unittest
+from functools import partial
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.line_io import format_grid
+from sudoku.batch_solver import BoardStatus
+from sudoku.direct_solver import IncrementalDirectSolver
+from sudoku.service import AsyncSolver, SolverOverloadedException, \
+    search_chunk, start_server
+
+from tests.text_samples import *
+
+
+LINES = [
+    format_grid(IOSudoku(txt).grid)
+    for txt in (TRIVIAL_TXT, EASY_TXT, MEDIUM_TXT, HARD_TXT)
+]
+
+
+class TestAsyncSolver(unittest.TestCase):
+
+    def check_results(self, results):
+        for status, solution in results:
+            self.assertEqual(status, BoardStatus.SOLVED)
+            self.assertNotIn('.', solution)
+
+    def test_micro_batches(self):
+        batches = list()
+
+        def record(lines):
+            batches.append(len(lines))
+            return search_chunk(lines)
+
+        async def main():
+            async with AsyncSolver(workers=0, max_batch=3, max_delay=0.05,
+                                   solve_chunk=record) as solver:
+                return await asyncio.gather(
+                    *(solver.solve(line) for line in LINES + LINES))
+
+        results = asyncio.run(main())
+        self.check_results(results)
+        self.assertEqual(sum(batches), 8)
+        self.assertLessEqual(max(batches), 3)
+        self.assertLess(len(batches), 8)
+
+    def test_process_pool(self):
+        async def main():
+            async with AsyncSolver(
+                    workers=2, max_batch=2, solve_chunk=partial(
+                        search_chunk,
+                        direct_solver=IncrementalDirectSolver)) as solver:
+                return await asyncio.gather(
+                    *(solver.solve(line) for line in LINES + ["invalid"]))
+
+        results = asyncio.run(main())
+        self.check_results(results[:-1])
+        self.assertEqual(results[-1], (BoardStatus.INCONSISTENT, ""))
+
+    def test_timeout_and_backpressure(self):
+        release = threading.Event()
+        solved = list()
+
+        def blocking(lines):
+            release.wait()
+            solved.extend(lines)
+            return search_chunk(lines)
+
+        async def main():
+            async with AsyncSolver(workers=0, max_batch=1, max_queue=1,
+                                   solve_chunk=blocking) as solver:
+                first = asyncio.create_task(solver.solve(LINES[0]))
+                await asyncio.sleep(0.05)  # Sent, blocks the only worker
+                with self.assertRaises(asyncio.TimeoutError):
+                    await solver.solve(LINES[1], timeout=0.05)
+                queued = asyncio.create_task(solver.solve(LINES[2]))
+                await asyncio.sleep(0.05)
+                self.assertEqual(solver.queued(), 1)
+                with self.assertRaises(SolverOverloadedException):
+                    await solver.solve(LINES[3], wait=False)
+                release.set()
+                return await first, await queued
+
+        self.check_results(asyncio.run(main()))
+        self.assertEqual(solved, [LINES[0], LINES[2]])  # Timed out: skipped
+
+    def test_close_cancels_pending_batch(self):
+        async def main():
+            solver = AsyncSolver(workers=0, max_delay=1.0)
+            await solver.start()
+            pending = asyncio.create_task(solver.solve(LINES[0]))
+            await asyncio.sleep(0.1)  # Taken by the batch still filling up
+            await solver.close()
+            with self.assertRaises(asyncio.CancelledError):
+                await asyncio.wait_for(pending, 1.0)
+
+        asyncio.run(main())
+
+    def test_server(self):
+        async def main():
+            async with AsyncSolver(workers=0) as solver:
+                server = await start_server(solver)
+                port = server.sockets[0].getsockname()[1]
+                async with server:
+                    reader, writer = await asyncio.open_connection(
+                        "127.0.0.1", port)
+                    writer.write(("\n".join(LINES[:2] + ["x"]) + "\n").encode())
+                    answers = [(await reader.readline()).decode().split()
+                               for _ in range(3)]
+                    writer.close()
+                    await writer.wait_closed()
+                return answers
+
+        answers = asyncio.run(main())
+        self.assertEqual([answer[0] for answer in answers],
+                         ["SOLVED", "SOLVED", "INCONSISTENT"])
+        self.assertNotIn('.', answers[1][1])
+
+    def test_server_error(self):
+        def failing(lines):
+            raise RuntimeError("The worker crashed")
+
+        async def main():
+            async with AsyncSolver(workers=0, max_batch=1,
+                                   solve_chunk=failing) as solver:
+                server = await start_server(solver)
+                port = server.sockets[0].getsockname()[1]
+                async with server:
+                    reader, writer = await asyncio.open_connection(
+                        "127.0.0.1", port)
+                    writer.write(("\n".join(LINES) + "\n").encode())
+                    answers = [(await reader.readline()).decode().strip()
+                               for _ in LINES]
+                    writer.close()
+                    await writer.wait_closed()
+                return answers
+
+        answers = asyncio.run(asyncio.wait_for(main(), 10))
+        self.assertEqual(answers, ["ERROR"] * len(LINES))
+
+    def test_server_solver_closed(self):
+        release = threading.Event()
+
+        def blocking(lines):
+            release.wait()
+            return search_chunk(lines)
+
+        async def main():
+            solver = AsyncSolver(workers=0, max_batch=1, solve_chunk=blocking)
+            await solver.start()
+            server = await start_server(solver)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection(
+                    "127.0.0.1", port)
+                writer.write(("\n".join(LINES[:3]) + "\n").encode())
+                await asyncio.sleep(0.1)  # The first one blocks the worker
+                closing = asyncio.create_task(solver.close())
+                await asyncio.sleep(0.05)  # The queued ones are cancelled
+                release.set()
+                await closing
+                answers = [(await reader.readline()).decode().split()[0]
+                           for _ in range(3)]
+                writer.close()
+                await writer.wait_closed()
+            return answers
+
+        answers = asyncio.run(asyncio.wait_for(main(), 10))
+        self.assertEqual(answers, ["SOLVED", "ERROR", "ERROR"])
+
+    def test_server_invalid_utf8(self):
+        async def main():
+            async with AsyncSolver(workers=0) as solver:
+                server = await start_server(solver)
+                port = server.sockets[0].getsockname()[1]
+                async with server:
+                    reader, writer = await asyncio.open_connection(
+                        "127.0.0.1", port)
+                    writer.write(b"\xff\xfe\n" + LINES[0].encode() + b"\n")
+                    answers = [(await reader.readline()).decode().split()[0]
+                               for _ in range(2)]
+                    writer.close()
+                    await writer.wait_closed()
+                return answers
+
+        answers = asyncio.run(asyncio.wait_for(main(), 10))
+        self.assertEqual(answers, ["INCONSISTENT", "SOLVED"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+import io
+import json
+import unittest
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.choices import BitmaskSudokuChoices
+from sudoku.direct_solver import GroupBasedDirectSolver, IncrementalDirectSolver
+from sudoku.search_solver import SearchSolver
+from sudoku.stats import SolverStats, TraceObserver
+
+from tests.text_samples import *
+
+
+class TestSolverStats(unittest.TestCase):
+
+    def test_direct_solver(self):
+        for solver_class in (GroupBasedDirectSolver, IncrementalDirectSolver):
+            stats = SolverStats()
+            solver_class(BitmaskSudokuChoices(IOSudoku(EASY_TXT)), stats).solve()
+            report = json.loads(stats.to_json())
+            self.assertGreater(report["forbid"]["USEFUL"], 0)
+            self.assertGreater(report["force_set"]["OK"], 0)
+            self.assertEqual(set(report["rules"]), {"clean", "isolate"})
+            self.assertGreater(report["rules"]["clean"]["seconds"], 0)
+            if solver_class is GroupBasedDirectSolver:
+                self.assertGreater(report["passes"], 1)
+
+    def test_search_solver(self):
+        stats = SolverStats()
+        solver = SearchSolver(
+            BitmaskSudokuChoices(IOSudoku(HARD_TXT)), observer=stats)
+        solver.solve()
+        self.assertEqual(stats.nodes, solver.nodes)
+        self.assertGreater(stats.max_depth, 0)
+
+    def test_trace(self):
+        writer = io.StringIO()
+        GroupBasedDirectSolver(
+            BitmaskSudokuChoices(IOSudoku(EASY_TXT)),
+            TraceObserver(writer)).solve()
+        self.assertIn("Setting (", writer.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -64,3 +64,41 @@ x6x x1x x3x
 xx1 xxx 2xx
 4xx x2x xxx
 """
+
+LARGE_16_TXT = """
+x3xx 56xF xGEx 8ABC
+xG1x Cxxx 2x4x 9x6x
+xF69 Ex7x 8ACB 23xx
+xxx8 xxx3 9Fxx 7x1x
+
+D83x 6xxx xx1x xxxB
+xxGx xxxx x8D3 52F6
+6xxx xGx9 Cxxx 4xxx
+x7xx Dxxx xxxF xxG1
+
+Gxx1 x7xE Dxxx x4xF
+xx2x x9x5 xxx7 DCxx
+AE7B 38xC 6xF2 1xxx
+3C8x x2x4 15xx Bxxx
+
+8xx3 2xFx x6x5 xxx7
+2DxF 9xx6 Ax7E xBC8
+xxxA xxxB Fxxx Gx5x
+9x5G 7xA1 xx8C xDxx
+"""
+
+# No unit misses a value, but the upper-left cell has no candidate left
+# (1 to 3 on its row, 4 to 6 on its column, 7 to 9 in its box)
+EMPTY_CELL_TXT = """
+xxx 123 xxx
+x78 xxx xxx
+x9x xxx xxx
+
+4xx xxx xxx
+5xx xxx xxx
+6xx xxx xxx
+
+xxx xxx xxx
+xxx xxx xxx
+xxx xxx xxx
+"""
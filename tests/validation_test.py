@@ -0,0 +1,68 @@
+import unittest
+
+import numpy as np
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.line_io import parse_line
+from sudoku.quick import solve, parse_values
+from sudoku.choices import BitmaskSudokuChoices
+from sudoku.direct_solver import GroupBasedDirectSolver
+from sudoku.validation import Problem, check_givens, check_solutions
+
+from tests.text_samples import *
+
+
+class TestValidation(unittest.TestCase):
+
+    def setUp(self):
+        self.givens = np.stack([
+            IOSudoku(txt).grid for txt in (EASY_TXT, MEDIUM_TXT, HARD_TXT)])
+        self.solutions = np.stack([
+            parse_line(solve(txt)) for txt in (EASY_TXT, MEDIUM_TXT, HARD_TXT)])
+
+    def test_givens(self):
+        self.assertEqual(check_givens(IOSudoku(EASY_TXT)), Problem.VALID)
+        givens = self.givens.copy()
+        givens[1, 0, 2] = 10
+        givens[2, 0, :2] = 7
+        problems = check_givens(givens)
+        self.assertEqual(problems.tolist(), [
+            Problem.VALID, Problem.INVALID_VALUE, Problem.DUPLICATE])
+
+    def test_solutions(self):
+        problems = check_solutions(self.solutions, self.givens)
+        self.assertFalse(problems.any())
+
+        solutions = self.solutions.copy()
+        solutions[0, 0, 2] = IOSudoku.EMPTY_CELL  # Not a given
+        # Swapping two cells of a row keeps the row valid, but not the columns
+        solutions[1, 4, [0, 1]] = solutions[1, 4, [1, 0]]
+        solutions[2] = self.solutions[1]
+        problems = check_solutions(solutions, self.givens)
+        self.assertEqual(problems[0], Problem.INCOMPLETE)
+        self.assertEqual(problems[1], Problem.DUPLICATE)
+        self.assertEqual(problems[2], Problem.GIVEN_CHANGED)
+        self.assertEqual(
+            check_solutions(solutions[1]), Problem.DUPLICATE)
+
+    def test_16x16(self):
+        values, _ = parse_values(solve(LARGE_16_TXT))
+        solution = np.array(values).reshape(16, 16)
+        self.assertEqual(
+            check_solutions(solution, IOSudoku(LARGE_16_TXT)), Problem.VALID)
+
+    def test_invalid_shape(self):
+        with self.assertRaises(ValueError):
+            check_givens(np.zeros((2, 9, 8), dtype=int))
+
+    def test_is_solved_checks_consistency(self):
+        grid = self.solutions[0].copy()
+        solver = GroupBasedDirectSolver(BitmaskSudokuChoices(IOSudoku(grid)))
+        self.assertTrue(solver.is_solved())
+        grid[4, [0, 1]] = grid[4, [1, 0]]
+        solver = GroupBasedDirectSolver(BitmaskSudokuChoices(IOSudoku(grid)))
+        self.assertFalse(solver.is_solved())
+
+
+if __name__ == "__main__":
+    unittest.main()
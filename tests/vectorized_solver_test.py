@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+
+from sudoku.io_sudoku import IOSudoku
+from sudoku.choices import BitmaskSudokuChoices, DirectOutcome
+from sudoku.direct_solver import GroupBasedDirectSolver
+from sudoku.vectorized_solver import VectorizedDirectSolver, \
+    candidates_from_grid, candidates_from_choices, propagation_step
+
+from tests.text_samples import *
+
+
+class TestVectorizedDirectSolver(unittest.TestCase):
+
+    def test_same_outcome_as_group_based(self):
+        for txt in (TRIVIAL_TXT, EASY_TXT, MEDIUM_TXT, HARD_TXT):
+            solved, reference = GroupBasedDirectSolver(
+                BitmaskSudokuChoices(IOSudoku(txt))).solve()
+            vec_solved, choices = VectorizedDirectSolver(
+                BitmaskSudokuChoices(IOSudoku(txt))).solve()
+            self.assertEqual(solved, vec_solved)
+            np.testing.assert_array_equal(
+                candidates_from_choices(reference),
+                candidates_from_choices(choices))
+
+    def test_inconsistent(self):
+        sudoku = IOSudoku(EASY_TXT)
+        sudoku.set_cell(0, 2, 2)  # 2 is already on the first row
+        solved, _ = VectorizedDirectSolver(
+            BitmaskSudokuChoices(sudoku)).solve()
+        self.assertFalse(solved)
+
+    def test_cell_without_candidate(self):
+        candidates = candidates_from_grid(IOSudoku(EMPTY_CELL_TXT).grid)
+        _, inconsistent, _ = propagation_step(candidates)
+        self.assertTrue(inconsistent)
+        _, inconsistent, _ = propagation_step(candidates, hidden_singles=False)
+        self.assertTrue(inconsistent)
+        solver = VectorizedDirectSolver(
+            BitmaskSudokuChoices(IOSudoku(EMPTY_CELL_TXT)))
+        self.assertEqual(solver.propagate(), DirectOutcome.INCONSISTENT_CHANGE)
+
+    def test_stacked_boards(self):
+        grids = np.stack([IOSudoku(EASY_TXT).grid, IOSudoku(HARD_TXT).grid])
+        candidates = candidates_from_grid(grids)
+        self.assertEqual(candidates.shape, (2, 81, 9))
+        new, inconsistent, changed = propagation_step(candidates)
+        self.assertEqual(new.shape, (2, 81, 9))
+        self.assertFalse(inconsistent.any())
+        self.assertTrue(changed.all())
+
+
+if __name__ == "__main__":
+    unittest.main()